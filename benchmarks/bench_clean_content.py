@@ -0,0 +1,89 @@
+"""clean_content_for_ai 性能基准
+
+对比当前实现与旧版逐条正则替换在大页面上的耗时，并校验两者输出一致。
+
+用法:
+    python benchmarks/bench_clean_content.py [--size KB] [--file PAGE.md] [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mkdocs_ai_summary.content_processor import ContentProcessor, PROMPT_CONTENT_LENGTH  # noqa: E402
+
+
+SECTION = '''## `Client.request(method, url, **kwargs)`
+
+发送一个HTTP请求并返回 [`Response`](#response) 对象，参见 [请求参数](params.md#request)。
+
+<div class="admonition note">
+<p>连接会在 <code>Session</code> 关闭时释放。</p>
+</div>
+
+```python
+client = Client(base_url="https://api.example.com")
+response = client.request("GET", "/items", params={"page": 1})
+print(response.json()["items"][0])
+```
+
+| 参数 | 类型 | 说明 |
+| --- | --- | --- |
+| `method` | `str` | HTTP方法 |
+| `timeout` | `float` | 超时时间，默认 `30` 秒 |
+
+![调用流程](images/request-flow.png)
+
+[![PyPI](https://img.shields.io/pypi/v/example.svg)](https://pypi.org/project/example/)
+
+'''
+
+
+def build_page(size_kb: int) -> str:
+    """生成指定大小的API参考页面"""
+    header = '---\ntitle: API Reference\ndescription: 自动生成的接口文档\n---\n\n# API Reference\n\n'
+    repeat = max(1, size_kb * 1024 // len(SECTION.encode('utf-8')))
+    return header + SECTION * repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200, help='页面大小（KB），默认200')
+    parser.add_argument('--file', help='使用指定的markdown文件代替生成的页面')
+    parser.add_argument('--repeat', type=int, default=20, help='每种实现的运行次数，默认20')
+    args = parser.parse_args()
+    
+    processor = ContentProcessor(
+        enabled_folders=[], exclude_patterns=[], exclude_files=[], summary_language='zh'
+    )
+    if args.file:
+        page = Path(args.file).read_text(encoding='utf-8')
+    else:
+        page = build_page(args.size)
+    
+    cleaned = processor.clean_content_for_ai(page)
+    if cleaned != processor._clean_content_legacy(page):
+        print("❌ 当前实现与旧实现的输出不一致")
+        return 1
+    
+    results = {}
+    budget = PROMPT_CONTENT_LENGTH
+    for name, func in (('旧实现', processor._clean_content_legacy),
+                       ('当前实现', processor.clean_content_for_ai),
+                       (f'按预算清理({budget})', lambda text: processor.clean_content_for_ai(text, budget=budget))):
+        timer = timeit.Timer(lambda: func(page))
+        results[name] = min(timer.repeat(repeat=args.repeat, number=1))
+    
+    print(f"📄 页面大小: {len(page.encode('utf-8')) / 1024:.0f} KB，清理后 {len(cleaned)} 字符")
+    for name, seconds in results.items():
+        print(f"   {name}: {seconds * 1000:.2f} ms")
+    print(f"⚡ 加速比: {results['旧实现'] / results['当前实现']:.2f}x，"
+          f"按预算清理 {results['旧实现'] / results[f'按预算清理({budget})']:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,12 +3,23 @@
 负责管理多种AI服务的调用和降级处理。
 """
 
+import json
 import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import ContextVar
 import requests
-from typing import Dict, Optional, Any
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Any, Tuple
 from dotenv import load_dotenv
 from pathlib import Path
 
+from .circuit_breaker import CircuitBreaker
+from .routing import LatencyRouter
+from .rate_limiter import RateLimiter, backoff_delay, estimate_tokens, parse_retry_after
+
 # 改进的环境变量加载逻辑
 def load_env_files():
     """从多个位置加载.env文件"""
@@ -31,12 +42,85 @@ def load_env_files():
 # 加载环境变量
 load_env_files()
 
+# 触发限流重试的HTTP状态码
+RETRYABLE_STATUS_CODES = (429, 503)
+
+# Retry-After 超过该秒数时不再等待，直接降级到下一个服务
+MAX_RETRY_AFTER = 60
+
+# 提示词模板版本，修改 _build_prompt 时递增，按内容复用的摘要随之失效
+PROMPT_VERSION = 1
+
+# 批量请求中单个页面的最大输入token估计，超过时单独请求
+BATCH_PAGE_SHARE = 0.5
+
+# 批量请求中为每个页面摘要预留的输出token数
+BATCH_SUMMARY_TOKENS = 300
+
+# 离线批处理请求的接口路径（OpenAI Batch API）
+BATCH_ENDPOINT = '/v1/chat/completions'
+
+# 批量响应中的 JSON 对象数组（允许模型在数组外添加说明文字或代码块标记）
+_JSON_ARRAY_PATTERN = re.compile(r'\[\s*\{.*\}\s*\]', re.DOTALL)
+
+# 当前线程或协程最近一次成功请求的HTTP往返耗时（秒），不含限流等待和重试间隔
+_round_trip_time = ContextVar('ai_summary_round_trip_time', default=None)
+
+
+def parse_batch_response(text: str) -> Dict[int, str]:
+    """解析批量请求返回的 JSON 数组
+    
+    Args:
+        text: 模型输出，应为 [{"id": 0, "summary": "..."}, ...]
+    
+    Returns:
+        dict: id -> 摘要，无法解析的项被忽略
+    
+    Raises:
+        ValueError: 输出中没有可解析的 JSON 数组
+    """
+    match = _JSON_ARRAY_PATTERN.search(text)
+    if not match:
+        raise ValueError("批量响应中没有 JSON 数组")
+    items = json.loads(match.group(0))
+    if not isinstance(items, list):
+        raise ValueError("批量响应不是 JSON 数组")
+    
+    summaries = {}
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('summary'), str):
+            continue
+        try:
+            summaries[int(item.get('id'))] = item['summary'].strip()
+        except (TypeError, ValueError):
+            continue
+    return summaries
+
+
+def is_client_error(error: Exception) -> bool:
+    """判断异常是否来自 4xx 响应（requests 和 httpx 的 HTTP 错误都带有 response）
+    
+    Args:
+        error: 请求抛出的异常
+    
+    Returns:
+        bool: 是否为 4xx 响应
+    """
+    status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return isinstance(status_code, int) and 400 <= status_code < 500
+
 
 class AIServiceManager:
     """AI服务管理器"""
     
     def __init__(self, default_service: str, model: str, max_tokens: int, temperature: float, 
-                 fallback_services: list = None, custom_services: dict = None):
+                 fallback_services: list = None, custom_services: dict = None,
+                 pool_size: int = 10, keep_alive: bool = True, rate_limits: dict = None,
+                 max_retries: int = 3, retry_backoff: float = 1.0,
+                 breaker_threshold: int = 3, breaker_cooldown: float = 60.0,
+                 routing_mode: str = 'fixed', routing_latency_threshold: float = 2.0,
+                 hedging_enabled: bool = False, hedge_percentile: float = 95.0,
+                 hedge_delay: float = 5.0, batch_max_output_tokens: int = 4096):
         """初始化AI服务管理器
         
         Args:
@@ -46,11 +130,56 @@ class AIServiceManager:
             temperature: 温度参数
             fallback_services: 备用服务列表
             custom_services: 自定义服务配置字典
+            pool_size: 每个服务的HTTP连接池大小
+            keep_alive: 是否复用连接（keep-alive）
+            rate_limits: 按服务名配置的限流 {'glm': {'rpm': 60, 'tpm': 100000}}
+            max_retries: 遇到限流响应（429/503）时的最大重试次数
+            retry_backoff: 指数退避的基础等待秒数
+            breaker_threshold: 服务连续失败多少次后熔断，0表示不熔断
+            breaker_cooldown: 熔断持续秒数，之后放行一个探测请求
+            routing_mode: 服务选择方式，'fixed' 按配置顺序，'adaptive' 按延迟和错误率
+            routing_latency_threshold: 自适应路由时默认服务允许比最快服务慢的秒数
+            hedging_enabled: 首选服务响应过慢时是否同时请求下一个服务
+            hedge_percentile: 以首选服务耗时的该百分位作为对冲等待时间
+            hedge_delay: 尚无延迟统计时的对冲等待秒数
+            batch_max_output_tokens: 批量请求的最大输出token数（服务商允许的上限）
         """
         self.default_service = default_service
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.pool_size = max(1, pool_size)
+        self.keep_alive = keep_alive
+        self.timeout = 30
+        
+        # 限流与重试
+        self.rate_limits = rate_limits or {}
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self._rate_limiters: Dict[str, Optional[RateLimiter]] = {}
+        
+        # 熔断：服务持续故障时直接跳过，避免每个页面都等待超时
+        self.breaker_threshold = max(0, breaker_threshold)
+        self.breaker_cooldown = breaker_cooldown
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        
+        # 路由：始终记录各服务的延迟和错误率，adaptive 模式下据此排序
+        self.routing_mode = routing_mode
+        self.routing_latency_threshold = routing_latency_threshold
+        self.router = LatencyRouter()
+        
+        # 对冲请求：首选服务超过延迟百分位仍未响应时，同时请求下一个服务
+        self.hedging_enabled = hedging_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        
+        # 批量请求：每页预留 BATCH_SUMMARY_TOKENS 输出，总量不超过服务商上限
+        self.batch_max_output_tokens = max(1, batch_max_output_tokens)
+        
+        # 每个服务一个长连接会话，避免每次请求重新握手
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
         
         # AI服务配置（内置服务）
         self.ai_services = {
@@ -131,6 +260,169 @@ class AIServiceManager:
             # 如果配置中指定了 headers，也保存下来
             if 'headers' in config:
                 self.ai_services[service_name]['headers'] = config['headers']
+            
+            # 服务级别的限流配置
+            for limit_key in ('rpm', 'tpm'):
+                if limit_key in config:
+                    self.ai_services[service_name][limit_key] = config[limit_key]
+    
+    def _get_session(self, service_name: str) -> requests.Session:
+        """获取指定服务的HTTP会话（按需创建）
+        
+        Args:
+            service_name: 服务名称
+            
+        Returns:
+            requests.Session: 带连接池的会话对象
+        """
+        session = self._sessions.get(service_name)
+        if session is not None:
+            return session
+        
+        with self._sessions_lock:
+            session = self._sessions.get(service_name)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers['Connection'] = 'keep-alive' if self.keep_alive else 'close'
+                self._sessions[service_name] = session
+            return session
+    
+    def _get_rate_limiter(self, service_name: str) -> Optional[RateLimiter]:
+        """获取指定服务的限流器（按需创建）
+        
+        rate_limits 中的配置优先于服务配置中的 rpm/tpm。
+        
+        Args:
+            service_name: 服务名称
+            
+        Returns:
+            RateLimiter|None: 限流器，未配置限流时返回None
+        """
+        if service_name in self._rate_limiters:
+            return self._rate_limiters[service_name]
+        
+        with self._sessions_lock:
+            if service_name not in self._rate_limiters:
+                service_config = self.ai_services.get(service_name, {})
+                limits = self.rate_limits.get(service_name, {})
+                rpm = limits.get('rpm', service_config.get('rpm'))
+                tpm = limits.get('tpm', service_config.get('tpm'))
+                self._rate_limiters[service_name] = RateLimiter(rpm, tpm) if (rpm or tpm) else None
+            return self._rate_limiters[service_name]
+    
+    def _get_breaker(self, service_name: str) -> Optional[CircuitBreaker]:
+        """获取指定服务的熔断器（按需创建）
+        
+        Args:
+            service_name: 服务名称
+            
+        Returns:
+            CircuitBreaker|None: 熔断器，未启用熔断时返回None
+        """
+        if not self.breaker_threshold:
+            return None
+        
+        breaker = self._breakers.get(service_name)
+        if breaker is None:
+            with self._sessions_lock:
+                breaker = self._breakers.setdefault(
+                    service_name, CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+                )
+        return breaker
+    
+    def _record_outcome(self, service_name: str, success: bool, latency: float = 0.0,
+                        route: bool = True) -> None:
+        """记录一次服务调用结果，更新路由统计，熔断时输出警告
+        
+        Args:
+            service_name: 服务名称
+            success: 调用是否成功
+            latency: 调用耗时（秒）
+            route: 是否计入路由统计（批量请求的耗时与单页请求不可比，不计入）
+        """
+        if route:
+            self.router.record(service_name, latency, success)
+        
+        breaker = self._get_breaker(service_name)
+        if breaker is None:
+            return
+        
+        if success:
+            breaker.record_success()
+        elif breaker.record_failure():
+            print(f"⚡ {service_name} 连续失败 {breaker.consecutive_failures} 次，"
+                  f"熔断 {breaker.cooldown:g} 秒")
+    
+    def _mark_round_trip(self, seconds: Optional[float]) -> None:
+        """记录成功请求的HTTP往返耗时，None表示清除
+        
+        Args:
+            seconds: 耗时秒数
+        """
+        _round_trip_time.set(seconds)
+    
+    def _routing_latency(self, started_at: float) -> float:
+        """获取计入路由统计的耗时
+        
+        Args:
+            started_at: 开始调用服务的时间（time.monotonic）
+        
+        Returns:
+            float: 成功请求的HTTP往返耗时；请求方法未记录时为调用总耗时
+        """
+        round_trip = _round_trip_time.get()
+        return round_trip if round_trip is not None else time.monotonic() - started_at
+    
+    def get_breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """获取各服务熔断器的状态
+        
+        Returns:
+            dict: 服务名 -> 状态快照，只包含本次构建中调用过的服务
+        """
+        return {name: breaker.snapshot() for name, breaker in list(self._breakers.items())}
+    
+    def _retry_delay(self, response, attempt: int) -> Optional[float]:
+        """计算限流响应后的重试等待时间
+        
+        Args:
+            response: HTTP响应对象（requests 或 httpx）
+            attempt: 已重试次数（从0开始）
+            
+        Returns:
+            float|None: 等待秒数，不应重试时返回None
+        """
+        if response is None or response.status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        if attempt >= self.max_retries:
+            return None
+        
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        if retry_after is None:
+            return backoff_delay(attempt, self.retry_backoff)
+        # 要求等待过久时直接降级到下一个服务
+        if retry_after > MAX_RETRY_AFTER:
+            return None
+        return retry_after
+    
+    def close(self) -> None:
+        """关闭所有HTTP会话，释放连接池"""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            hedge_executor, self._hedge_executor = self._hedge_executor, None
+        
+        if hedge_executor is not None:
+            # 不等待被放弃的对冲请求，它们会在超时后自行结束
+            hedge_executor.shutdown(wait=False)
+        
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
     
     def generate_summary(self, content: str, title: str, language: str = 'zh', debug: bool = False) -> Optional[Dict[str, Any]]:
         """生成AI摘要
@@ -144,23 +436,311 @@ class AIServiceManager:
         Returns:
             dict|None: 包含摘要和服务信息的字典，失败时返回None
         """
-        # 首先尝试默认服务
+        order = self._service_order()
+        if self.hedging_enabled and len(order) > 1:
+            result, order = self._try_hedged(order, content, title, language, debug)
+            if result:
+                return result
+        
+        for service_name in order:
+            self._log_attempt(service_name, debug)
+            result = self._try_service(service_name, content, title, language, debug)
+            if result:
+                return result
+        
+        return None
+    
+    def plan_batches(self, requests_batch: List[Dict[str, Any]], token_budget: int,
+                     max_pages: int) -> List[List[int]]:
+        """把页面按语言分组并装入不超过 token 预算的批次
+        
+        Args:
+            requests_batch: 请求列表，每项包含 content、title、language
+            token_budget: 每个批次的输入token预算
+            max_pages: 每个批次最多的页面数
+        
+        Returns:
+            list: 批次列表，每个批次是请求下标列表；较长的页面单独成批
+        """
+        batches: List[List[int]] = []
+        open_batches: Dict[str, Tuple[List[int], int]] = {}
+        for index, request in enumerate(requests_batch):
+            tokens = estimate_tokens(request['title']) + estimate_tokens(request['content'])
+            if tokens > token_budget * BATCH_PAGE_SHARE or max_pages <= 1:
+                batches.append([index])
+                continue
+            
+            language = request.get('language', 'zh')
+            batch, used = open_batches.get(language, (None, 0))
+            if batch is None or used + tokens > token_budget or len(batch) >= max_pages:
+                batch, used = [], 0
+                batches.append(batch)
+            batch.append(index)
+            open_batches[language] = (batch, used + tokens)
+        return batches
+    
+    def generate_summaries_batched(self, requests_batch: List[Dict[str, Any]], token_budget: int = 4000,
+                                   max_pages: int = 10, validate=None, max_workers: int = 1,
+                                   debug: bool = False) -> List[Optional[Dict[str, Any]]]:
+        """把多个短页面合并为一个请求批量生成摘要
+        
+        每个批次以 JSON 数组提交页面，要求模型返回同样顺序的 JSON 数组；
+        批次输出无法解析或某个摘要未通过校验时，对应页面改为单独请求。
+        
+        Args:
+            requests_batch: 请求列表，每项包含 content、title、language
+            token_budget: 每个批次的输入token预算
+            max_pages: 每个批次最多的页面数
+            validate: 校验单个摘要的函数（如 ContentProcessor.validate_summary_content），None表示不校验
+            max_workers: 同时发送的批次数
+            debug: 是否显示调试信息
+        
+        Returns:
+            list: 与 requests_batch 顺序一致的结果，失败的页面为None
+        """
+        validate = validate or (lambda summary: bool(summary and summary.strip()))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests_batch)
+        # 每个批次的页面数不超过输出上限能容纳的摘要数
+        max_pages = min(max_pages, self.batch_max_output_tokens // self._batch_page_tokens())
+        batches = self.plan_batches(requests_batch, token_budget, max_pages)
         if debug:
-            print(f"🔄 尝试默认服务: {self.default_service}")
-        result = self._try_service(self.default_service, content, title, language, debug)
-        if result:
-            return result
-        
-        # 如果默认服务失败，按照 fallback_order 顺序尝试备用服务
-        for service_name in self.fallback_order:
-            if service_name != self.default_service:
+            print(f"📦 批量生成: {len(requests_batch)} 个页面合并为 {len(batches)} 个请求")
+        
+        def run(batch: List[int]) -> None:
+            if len(batch) > 1:
+                for index, result in self._generate_batch(requests_batch, batch, debug).items():
+                    if validate(result['summary']):
+                        results[index] = result
+            
+            # 单页批次以及批量输出中缺失或无效的页面逐个请求
+            for index in batch:
+                if results[index] is None:
+                    request = requests_batch[index]
+                    result = self.generate_summary(
+                        request['content'], request['title'], request.get('language', 'zh'), debug
+                    )
+                    if result and validate(result['summary']):
+                        results[index] = result
+        
+        if max_workers <= 1 or len(batches) <= 1:
+            for batch in batches:
+                run(batch)
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches)),
+                                    thread_name_prefix='ai-summary-batch') as executor:
+                list(executor.map(run, batches))
+        return results
+    
+    def _generate_batch(self, requests_batch: List[Dict[str, Any]], batch: List[int],
+                        debug: bool = False) -> Dict[int, Dict[str, Any]]:
+        """发送一个批次，按服务顺序降级
+        
+        Args:
+            requests_batch: 请求列表
+            batch: 本批次的请求下标
+            debug: 是否显示调试信息
+        
+        Returns:
+            dict: 请求下标 -> 结果，只包含成功解析的页面
+        """
+        pages = [requests_batch[index] for index in batch]
+        prompt = self._build_batch_prompt(pages, pages[0].get('language', 'zh'))
+        max_tokens = min(self._batch_page_tokens() * len(batch), self.batch_max_output_tokens)
+        
+        for service_name in self._service_order():
+            self._log_attempt(service_name, debug)
+            text = self._try_prompt(service_name, prompt, debug, max_tokens=max_tokens, batch=True)
+            if text is None:
+                continue
+            try:
+                summaries = parse_batch_response(text)
+            except ValueError as e:
+                # 服务本身可用，只是输出格式不符合要求；这些页面改为单独请求
                 if debug:
-                    print(f"🔄 尝试备用服务: {service_name}")
-                result = self._try_service(service_name, content, title, language, debug)
+                    print(f"⚠️ {service_name} 批量输出无法解析: {str(e)[:50]}")
+                return {}
+            return {
+                batch[position]: {'summary': summaries[position], 'service': service_name}
+                for position in range(len(batch)) if position in summaries
+            }
+        return {}
+    
+    def _batch_page_tokens(self) -> int:
+        """批量请求中为每个页面摘要预留的输出token数"""
+        return max(1, min(self.max_tokens, BATCH_SUMMARY_TOKENS))
+    
+    def _build_batch_prompt(self, pages: List[Dict[str, Any]], language: str = 'zh') -> str:
+        """构建多页面批量提示词
+        
+        Args:
+            pages: 页面列表，每项包含 content、title
+            language: 摘要语言
+        
+        Returns:
+            str: 构建好的提示词
+        """
+        documents = json.dumps(
+            [{'id': i, 'title': page['title'], 'content': page['content'][:2000]} for i, page in enumerate(pages)],
+            ensure_ascii=False
+        )
+        if language == 'en':
+            return f"""Please generate a concise summary (100-150 words) for each of the following {len(pages)} documents.
+
+The documents are given as a JSON array; each item has an id, a title and the content:
+{documents}
+
+Requirements:
+1. Answer in English
+2. Highlight the core points of each document
+3. Use clear and concise language
+4. Do not include irrelevant information
+5. Output only a JSON array with one item per document: {{"id": <document id>, "summary": "<summary>"}}"""
+        elif language == 'both':
+            return f"""请为以下 {len(pages)} 篇文档分别生成简洁的双语摘要（中文100-150字，英文100-150字）。
+
+文档以 JSON 数组给出，每项包含 id、title 和 content：
+{documents}
+
+要求：
+1. 先用中文生成摘要，然后用英文生成摘要
+2. 突出每篇文档的核心要点
+3. 语言简洁明了
+4. 不要包含无关信息
+5. 每篇摘要的格式：**中文摘要：**\n[中文内容]\n\n**English Summary:**\n[English content]
+6. 只输出一个 JSON 数组，每篇文档一项：{{"id": 文档id, "summary": "摘要"}}"""
+        else:  # 默认中文
+            return f"""请为以下 {len(pages)} 篇文档分别生成简洁的摘要（每篇100-150字）。
+
+文档以 JSON 数组给出，每项包含 id、title 和 content：
+{documents}
+
+要求：
+1. 用中文回答
+2. 突出每篇文档的核心要点
+3. 语言简洁明了
+4. 不要包含无关信息
+5. 只输出一个 JSON 数组，每篇文档一项：{{"id": 文档id, "summary": "摘要"}}"""
+    
+    def build_batch_request(self, custom_id: str, content: str, title: str, language: str = 'zh') -> Dict[str, Any]:
+        """构建离线批处理请求（OpenAI Batch API 的 JSONL 行格式）
+        
+        Args:
+            custom_id: 请求标识，结果按此标识对应回页面
+            content: 页面内容
+            title: 页面标题
+            language: 摘要语言
+            
+        Returns:
+            dict: 批处理请求
+        """
+        config = self.ai_services.get(self.default_service, {})
+        return {
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': BATCH_ENDPOINT,
+            'body': {
+                'model': config.get('model', self.model),
+                'messages': [{'role': 'user', 'content': self._build_prompt(content, title, language)}],
+                'max_tokens': self.max_tokens,
+                'temperature': self.temperature
+            }
+        }
+    
+    def _log_attempt(self, service_name: str, debug: bool) -> None:
+        """输出正在尝试的服务
+        
+        Args:
+            service_name: 服务名称
+            debug: 是否显示调试信息
+        """
+        if debug:
+            role = '默认服务' if service_name == self.default_service else '备用服务'
+            print(f"🔄 尝试{role}: {service_name}")
+    
+    def _get_hedge_delay(self, service_name: str) -> float:
+        """计算发出对冲请求前的等待时间
+        
+        Args:
+            service_name: 首选服务名称
+            
+        Returns:
+            float: 等待秒数，取该服务耗时的 hedge_percentile 百分位，无统计时使用 hedge_delay
+        """
+        delay = self.router.percentile(service_name, self.hedge_percentile)
+        return delay if delay is not None else self.hedge_delay
+    
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """获取执行对冲请求的线程池（按需创建）
+        
+        Returns:
+            ThreadPoolExecutor: 线程池
+        """
+        with self._sessions_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size * 2, thread_name_prefix='ai-summary-hedge'
+                )
+            return self._hedge_executor
+    
+    def _try_hedged(self, order: List[str], content: str, title: str, language: str = 'zh',
+                    debug: bool = False) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """对前两个服务发起对冲请求
+        
+        先请求首选服务，超过对冲等待时间仍未响应时再请求下一个服务，
+        采用先返回的有效结果。同步请求无法中途中断，落后的请求会在后台
+        完成（或超时）后被丢弃。
+        
+        Args:
+            order: 服务尝试顺序
+            content: 页面内容
+            title: 页面标题
+            language: 摘要语言
+            debug: 是否显示调试信息
+            
+        Returns:
+            tuple: (结果, 仍需依次尝试的服务列表)
+        """
+        primary, secondary = order[0], order[1]
+        executor = self._get_hedge_executor()
+        
+        self._log_attempt(primary, debug)
+        futures = [executor.submit(self._try_service, primary, content, title, language, debug)]
+        delay = self._get_hedge_delay(primary)
+        done, _ = wait(futures, timeout=delay)
+        if done:
+            return futures[0].result(), order[1:]
+        
+        if debug:
+            print(f"🏁 {primary} 超过 {delay:.1f} 秒未响应，同时请求 {secondary}")
+        futures.append(executor.submit(self._try_service, secondary, content, title, language, debug))
+        
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
                 if result:
-                    return result
+                    for straggler in pending:
+                        straggler.cancel()
+                    return result, []
         
-        return None
+        return None, order[2:]
+    
+    def _service_order(self) -> list:
+        """获取本次请求尝试服务的顺序
+        
+        fixed 模式下先尝试默认服务，再按 fallback_order 依次降级；
+        adaptive 模式下按最近的延迟和错误率重新排序。
+        
+        Returns:
+            list: 服务名称列表
+        """
+        order = [self.default_service] + [
+            name for name in self.fallback_order if name != self.default_service
+        ]
+        if self.routing_mode == 'adaptive':
+            order = self.router.order(self.default_service, order, self.routing_latency_threshold)
+        return order
     
     def _try_service(self, service_name: str, content: str, title: str, language: str = 'zh', debug: bool = False) -> Optional[Dict[str, Any]]:
         """尝试调用指定的AI服务
@@ -175,41 +755,134 @@ class AIServiceManager:
         Returns:
             dict|None: 包含摘要和服务信息的字典，失败时返回None
         """
+        summary = self._try_prompt(service_name, self._build_prompt(content, title, language), debug)
+        if summary is None:
+            return None
+        return {
+            'summary': summary,
+            'service': service_name
+        }
+    
+    def _try_prompt(self, service_name: str, prompt: str, debug: bool = False,
+                    max_tokens: Optional[int] = None, batch: bool = False) -> Optional[str]:
+        """向指定的AI服务发送提示词
+        
+        Args:
+            service_name: 服务名称
+            prompt: 提示词
+            debug: 是否显示调试信息
+            max_tokens: 本次请求的最大输出token数，None表示使用全局设置
+            batch: 是否为多页面批量请求；批量请求不计入路由统计，
+                其 4xx 响应（如超出上下文或输出上限）也不计入熔断
+        
+        Returns:
+            str|None: 生成的文本，服务不可用或请求失败时返回None
+        """
         service_config = self.ai_services.get(service_name)
         if not service_config or not service_config.get('api_key'):
             if debug:
                 print(f"⚠️ {service_name} 不可用: 缺少API密钥")
             return None
         
+        breaker = self._get_breaker(service_name)
+        if breaker and not breaker.allow_request():
+            if debug:
+                print(f"⛔ {service_name} 熔断中，跳过")
+            return None
+        
+        started_at = time.monotonic()
+        self._mark_round_trip(None)
         try:
-            # 根据服务类型选择调用方法
-            service_type = service_config.get('type', 'openai_compatible')
-            
-            if service_type == 'gemini':
-                return self._call_gemini_api(service_config, content, title, language)
-            else:  # openai_compatible
-                return self._call_openai_compatible_api(service_config, content, title, service_name, language)
+            if max_tokens is None:
+                text = self._request_completion(service_name, service_config, prompt)
+            else:
+                text = self._request_completion(service_name, service_config, prompt, max_tokens=max_tokens)
+            self._record_outcome(service_name, True, self._routing_latency(started_at), route=not batch)
+            return text
         except Exception as e:
+            # 批量请求被拒绝说明请求本身不合适，服务仍然可用，页面会改为单独请求
+            if not (batch and is_client_error(e)):
+                self._record_outcome(service_name, False, time.monotonic() - started_at, route=not batch)
+            elif breaker:
+                breaker.release_probe()
             # 简化错误信息输出
             error_msg = str(e)[:50] + "..." if len(str(e)) > 50 else str(e)
             if debug:
                 print(f"⚠️ {service_name} 失败: {error_msg}")
             return None
     
-    def _call_openai_compatible_api(self, config: Dict, content: str, title: str, service_name: str, language: str = 'zh') -> Dict[str, Any]:
-        """调用OpenAI兼容的API
+    def _request_completion(self, service_name: str, config: Dict, prompt: str,
+                            max_tokens: Optional[int] = None) -> str:
+        """通过服务的HTTP会话发送提示词并返回生成的文本
         
         Args:
-            config: 服务配置
-            content: 页面内容
-            title: 页面标题
             service_name: 服务名称
-            language: 摘要语言
+            config: 服务配置
+            prompt: 提示词
+            max_tokens: 最大输出token数，None表示使用全局设置
+            
+        Returns:
+            str: 生成的文本
+        """
+        max_tokens = max_tokens or self.max_tokens
+        url, headers, data = self._prepare_request(config, prompt, max_tokens)
+        session = self._get_session(service_name)
+        limiter = self._get_rate_limiter(service_name)
+        estimated_tokens = estimate_tokens(prompt) + max_tokens
+        
+        attempt = 0
+        while True:
+            if limiter:
+                limiter.acquire(estimated_tokens)
+            
+            try:
+                sent_at = time.monotonic()
+                response = session.post(url, headers=headers, json=data, timeout=self.timeout)
+                round_trip = time.monotonic() - sent_at
+                response.raise_for_status()
+                text = self._extract_text(config, response.json())
+                self._mark_round_trip(round_trip)
+                return text
+            except requests.HTTPError as e:
+                delay = self._retry_delay(e.response, attempt)
+                if delay is None:
+                    raise
+            
+            # 限流响应：暂停该服务的所有请求后重试，而不是立即降级
+            if limiter:
+                limiter.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+    
+    def _prepare_request(self, config: Dict, prompt: str,
+                         max_tokens: Optional[int] = None) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """根据服务类型构建请求
+        
+        Args:
+            config: 服务配置
+            prompt: 提示词
+            max_tokens: 最大输出token数，None表示使用全局设置
             
         Returns:
-            dict: 包含摘要和服务信息的字典
+            tuple: (url, headers, data)
         """
-        # 基础 headers
+        max_tokens = max_tokens or self.max_tokens
+        if config.get('type', 'openai_compatible') == 'gemini':
+            url = f"{config['url']}?key={config['api_key']}"
+            headers = {'Content-Type': 'application/json'}
+            data = {
+                'contents': [{
+                    'parts': [{'text': prompt}]
+                }],
+                'generationConfig': {
+                    'maxOutputTokens': max_tokens,
+                    'temperature': self.temperature
+                }
+            }
+            return url, headers, data
+        
+        # OpenAI 兼容服务的基础 headers
         headers = {
             'Authorization': f'Bearer {config["api_key"]}',
             'Content-Type': 'application/json'
@@ -219,64 +892,27 @@ class AIServiceManager:
         if 'headers' in config:
             headers.update(config['headers'])
         
-        prompt = self._build_prompt(content, title, language)
-        
         data = {
             'model': config['model'],
             'messages': [{'role': 'user', 'content': prompt}],
-            'max_tokens': self.max_tokens,
+            'max_tokens': max_tokens,
             'temperature': self.temperature
         }
-        
-        response = requests.post(config['url'], headers=headers, json=data, timeout=30)
-        response.raise_for_status()
-        
-        result = response.json()
-        summary = result['choices'][0]['message']['content'].strip()
-        
-        return {
-            'summary': summary,
-            'service': service_name
-        }
+        return config['url'], headers, data
     
-    def _call_gemini_api(self, config: Dict, content: str, title: str, language: str = 'zh') -> Dict[str, Any]:
-        """调用Gemini API
+    def _extract_text(self, config: Dict, result: Dict[str, Any]) -> str:
+        """从服务响应中提取生成的文本
         
         Args:
             config: 服务配置
-            content: 页面内容
-            title: 页面标题
-            language: 摘要语言
+            result: 响应JSON
             
         Returns:
-            dict: 包含摘要和服务信息的字典
+            str: 生成的文本
         """
-        url = f"{config['url']}?key={config['api_key']}"
-        
-        headers = {'Content-Type': 'application/json'}
-        
-        prompt = self._build_prompt(content, title, language)
-        
-        data = {
-            'contents': [{
-                'parts': [{'text': prompt}]
-            }],
-            'generationConfig': {
-                'maxOutputTokens': self.max_tokens,
-                'temperature': self.temperature
-            }
-        }
-        
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        response.raise_for_status()
-        
-        result = response.json()
-        summary = result['candidates'][0]['content']['parts'][0]['text'].strip()
-        
-        return {
-            'summary': summary,
-            'service': 'gemini'
-        }
+        if config.get('type', 'openai_compatible') == 'gemini':
+            return result['candidates'][0]['content']['parts'][0]['text'].strip()
+        return result['choices'][0]['message']['content'].strip()
     
     def _build_prompt(self, content: str, title: str, language: str = 'zh') -> str:
         """构建AI提示词
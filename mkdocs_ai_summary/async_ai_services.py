@@ -0,0 +1,312 @@
+"""异步AI服务管理器模块
+
+基于 asyncio 和 httpx 的AI服务调用，用于批量预取时在少量线程内并发大量请求。
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    import httpx
+except ImportError:  # 可选依赖，仅异步引擎需要
+    httpx = None
+
+from .ai_services import AIServiceManager
+from .rate_limiter import estimate_tokens
+
+
+class AsyncAIServiceManager(AIServiceManager):
+    """异步AI服务管理器
+    
+    与 AIServiceManager 使用相同的服务配置、提示词和降级顺序，
+    generate_summary 为协程版本；每个服务使用一个 httpx.AsyncClient
+    和一个信号量限制并发数。
+    """
+    
+    def __init__(self, *args, max_concurrency: int = 64, **kwargs):
+        """初始化异步AI服务管理器
+        
+        Args:
+            *args: 传递给 AIServiceManager 的参数
+            max_concurrency: 每个服务同时进行的最大请求数
+            **kwargs: 传递给 AIServiceManager 的关键字参数
+        
+        Raises:
+            ImportError: 未安装 httpx
+        """
+        if httpx is None:
+            raise ImportError(
+                "异步引擎需要 httpx，请运行: pip install \"mkdocs_ai_summary_wcowin[async]\""
+            )
+        
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max(1, max_concurrency)
+        self._clients: Dict[str, Any] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    @classmethod
+    def from_manager(cls, manager: AIServiceManager, max_concurrency: int = 64) -> 'AsyncAIServiceManager':
+        """基于已验证的同步管理器创建异步管理器，共享服务配置
+        
+        Args:
+            manager: 同步AI服务管理器
+            max_concurrency: 每个服务同时进行的最大请求数
+        
+        Returns:
+            AsyncAIServiceManager: 异步AI服务管理器
+        """
+        async_manager = cls(
+            default_service=manager.default_service,
+            model=manager.model,
+            max_tokens=manager.max_tokens,
+            temperature=manager.temperature,
+            pool_size=manager.pool_size,
+            keep_alive=manager.keep_alive,
+            max_concurrency=max_concurrency
+        )
+        async_manager.ai_services = manager.ai_services
+        async_manager.fallback_order = manager.fallback_order
+        async_manager.timeout = manager.timeout
+        # 与同步管理器共享限流状态，两个引擎合计不超过服务配额
+        async_manager.rate_limits = manager.rate_limits
+        async_manager.max_retries = manager.max_retries
+        async_manager.retry_backoff = manager.retry_backoff
+        async_manager._rate_limiters = manager._rate_limiters
+        # 共享熔断状态，同步路径已熔断的服务在异步路径中同样跳过
+        async_manager.breaker_threshold = manager.breaker_threshold
+        async_manager.breaker_cooldown = manager.breaker_cooldown
+        async_manager._breakers = manager._breakers
+        async_manager.routing_mode = manager.routing_mode
+        async_manager.routing_latency_threshold = manager.routing_latency_threshold
+        async_manager.router = manager.router
+        async_manager.hedging_enabled = manager.hedging_enabled
+        async_manager.hedge_percentile = manager.hedge_percentile
+        async_manager.hedge_delay = manager.hedge_delay
+        return async_manager
+    
+    def _get_client(self, service_name: str):
+        """获取指定服务的异步HTTP客户端（按需创建）
+        
+        Args:
+            service_name: 服务名称
+        
+        Returns:
+            httpx.AsyncClient: 异步客户端
+        """
+        client = self._clients.get(service_name)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.pool_size if self.keep_alive else 0
+            )
+            client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+            self._clients[service_name] = client
+        return client
+    
+    def _get_semaphore(self, service_name: str) -> asyncio.Semaphore:
+        """获取指定服务的并发信号量
+        
+        Args:
+            service_name: 服务名称
+        
+        Returns:
+            asyncio.Semaphore: 信号量
+        """
+        semaphore = self._semaphores.get(service_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[service_name] = semaphore
+        return semaphore
+    
+    async def generate_summary(self, content: str, title: str, language: str = 'zh', debug: bool = False) -> Optional[Dict[str, Any]]:
+        """生成AI摘要（协程）
+        
+        Args:
+            content: 页面内容
+            title: 页面标题
+            language: 摘要语言 ('zh', 'en', 'both')
+            debug: 是否显示调试信息
+        
+        Returns:
+            dict|None: 包含摘要和服务信息的字典，失败时返回None
+        """
+        order = self._service_order()
+        if self.hedging_enabled and len(order) > 1:
+            result, order = await self._try_hedged(order, content, title, language, debug)
+            if result:
+                return result
+        
+        for service_name in order:
+            self._log_attempt(service_name, debug)
+            result = await self._try_service(service_name, content, title, language, debug)
+            if result:
+                return result
+        
+        return None
+    
+    async def _try_hedged(self, order: List[str], content: str, title: str, language: str = 'zh',
+                          debug: bool = False) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """对前两个服务发起对冲请求（协程）
+        
+        与同步版本相同，但得到有效结果后会取消落后的请求。
+        
+        Args:
+            order: 服务尝试顺序
+            content: 页面内容
+            title: 页面标题
+            language: 摘要语言
+            debug: 是否显示调试信息
+        
+        Returns:
+            tuple: (结果, 仍需依次尝试的服务列表)
+        """
+        primary, secondary = order[0], order[1]
+        
+        self._log_attempt(primary, debug)
+        primary_task = asyncio.ensure_future(self._try_service(primary, content, title, language, debug))
+        delay = self._get_hedge_delay(primary)
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done:
+            return primary_task.result(), order[1:]
+        
+        if debug:
+            print(f"🏁 {primary} 超过 {delay:.1f} 秒未响应，同时请求 {secondary}")
+        secondary_task = asyncio.ensure_future(self._try_service(secondary, content, title, language, debug))
+        
+        pending = {primary_task, secondary_task}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result:
+                        return result, []
+            return None, order[2:]
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def generate_summaries(self, jobs: List[Dict[str, str]], debug: bool = False) -> List[Optional[Dict[str, Any]]]:
+        """并发生成多个摘要，完成后关闭所有客户端
+        
+        Args:
+            jobs: 任务列表，每项包含 content、title、language
+            debug: 是否显示调试信息
+        
+        Returns:
+            list: 与 jobs 顺序一致的结果列表，失败项为None
+        """
+        try:
+            return await asyncio.gather(*[
+                self.generate_summary(job['content'], job['title'], job.get('language', 'zh'), debug)
+                for job in jobs
+            ])
+        finally:
+            await self.aclose()
+    
+    async def _try_service(self, service_name: str, content: str, title: str, language: str = 'zh', debug: bool = False) -> Optional[Dict[str, Any]]:
+        """尝试调用指定的AI服务（协程）
+        
+        Args:
+            service_name: 服务名称
+            content: 页面内容
+            title: 页面标题
+            language: 摘要语言
+            debug: 是否显示调试信息
+        
+        Returns:
+            dict|None: 包含摘要和服务信息的字典，失败时返回None
+        """
+        service_config = self.ai_services.get(service_name)
+        if not service_config or not service_config.get('api_key'):
+            if debug:
+                print(f"⚠️ {service_name} 不可用: 缺少API密钥")
+            return None
+        
+        breaker = self._get_breaker(service_name)
+        if breaker and not breaker.allow_request():
+            if debug:
+                print(f"⛔ {service_name} 熔断中，跳过")
+            return None
+        
+        started_at = time.monotonic()
+        self._mark_round_trip(None)
+        try:
+            prompt = self._build_prompt(content, title, language)
+            summary = await self._request_completion(service_name, service_config, prompt)
+            self._record_outcome(service_name, True, self._routing_latency(started_at))
+            return {
+                'summary': summary,
+                'service': service_name
+            }
+        except asyncio.CancelledError:
+            # 落后的对冲请求被取消，不能说明服务状态；释放探测名额后继续取消
+            if breaker:
+                breaker.release_probe()
+            raise
+        except Exception as e:
+            self._record_outcome(service_name, False, time.monotonic() - started_at)
+            error_msg = str(e)[:50] + "..." if len(str(e)) > 50 else str(e)
+            if debug:
+                print(f"⚠️ {service_name} 失败: {error_msg}")
+            return None
+    
+    async def _request_completion(self, service_name: str, config: Dict, prompt: str) -> str:
+        """发送提示词并返回生成的文本（协程）
+        
+        Args:
+            service_name: 服务名称
+            config: 服务配置
+            prompt: 提示词
+        
+        Returns:
+            str: 生成的文本
+        """
+        url, headers, data = self._prepare_request(config, prompt)
+        limiter = self._get_rate_limiter(service_name)
+        estimated_tokens = estimate_tokens(prompt) + self.max_tokens
+        
+        attempt = 0
+        while True:
+            if limiter:
+                wait = limiter.reserve(estimated_tokens)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            
+            # 往返耗时从获得信号量后开始计算，不含排队、限流等待和重试间隔
+            async with self._get_semaphore(service_name):
+                sent_at = time.monotonic()
+                response = await self._get_client(service_name).post(url, headers=headers, json=data)
+                round_trip = time.monotonic() - sent_at
+            
+            if response.is_success:
+                text = self._extract_text(config, response.json())
+                self._mark_round_trip(round_trip)
+                return text
+            
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                response.raise_for_status()
+            
+            # 限流响应：暂停该服务的所有请求后重试，而不是立即降级
+            if limiter:
+                limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def aclose(self) -> None:
+        """关闭所有异步客户端
+        
+        客户端和信号量绑定在当前事件循环上，关闭后会在下次使用时重新创建。
+        """
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._semaphores.clear()
+        
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
@@ -0,0 +1,213 @@
+"""离线批处理模块
+
+首次为大量页面生成摘要时，逐页交互式请求既慢又容易触发限流。离线批处理分为两个阶段：
+    1. 导出：构建时把所有缓存未命中页面的提示词写入 JSONL 请求文件（OpenAI Batch API 格式），
+       不调用AI服务
+    2. 导入：把服务返回的结果 JSONL 按 custom_id（file_hash:content_hash）写回缓存
+
+没有批处理服务时，可以用本地替代实现离线生成结果文件（抽取页面开头作为摘要，用于测试流程）:
+    python -m mkdocs_ai_summary.batch_jobs requests.jsonl results.jsonl
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .storage import atomic_write_bytes
+
+
+# custom_id 由文件哈希和内容哈希组成，页面内容在导出后变化时结果不会被导入
+CUSTOM_ID_SEPARATOR = ':'
+
+# 本地替代实现从提示词中提取页面内容
+_PROMPT_CONTENT_PATTERN = re.compile(r'^(?:内容：|Content:)\n(.*?)\n\n(?:要求：|Requirements:)', re.DOTALL | re.MULTILINE)
+_SENTENCE_END_PATTERN = re.compile(r'(?<=[。！？.!?])\s*')
+
+# 本地替代实现生成的摘要长度（字符）
+LOCAL_SUMMARY_LENGTH = 150
+
+
+def batch_custom_id(file_hash: str, content_hash: str) -> str:
+    """生成批处理请求的 custom_id
+    
+    Args:
+        file_hash: 文件哈希
+        content_hash: 内容哈希
+    
+    Returns:
+        str: custom_id
+    """
+    return f"{file_hash}{CUSTOM_ID_SEPARATOR}{content_hash}"
+
+
+def split_custom_id(custom_id: str) -> Optional[Tuple[str, str]]:
+    """解析 custom_id
+    
+    Args:
+        custom_id: batch_custom_id 生成的标识
+    
+    Returns:
+        tuple|None: (file_hash, content_hash)，格式无效时返回None
+    """
+    file_hash, separator, content_hash = str(custom_id).partition(CUSTOM_ID_SEPARATOR)
+    if not separator or not file_hash or not content_hash:
+        return None
+    return file_hash, content_hash
+
+
+def _read_jsonl(path: Path) -> List[dict]:
+    """读取 JSONL 文件，跳过空行和无效行"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+    return records
+
+
+def _write_jsonl(path: Path, records: Iterable[dict]) -> int:
+    """原子写入 JSONL 文件，返回写入的行数"""
+    lines = [json.dumps(record, ensure_ascii=False) for record in records]
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, ''.join(line + '\n' for line in lines).encode('utf-8'))
+    return len(lines)
+
+
+def write_batch_requests(path: Path, batch_requests: Iterable[dict]) -> int:
+    """写入批处理请求文件
+    
+    Args:
+        path: 请求文件路径
+        batch_requests: AIServiceManager.build_batch_request 生成的请求
+    
+    Returns:
+        int: 写入的请求数量
+    """
+    return _write_jsonl(path, batch_requests)
+
+
+def read_batch_requests(path: Path) -> List[dict]:
+    """读取批处理请求文件
+    
+    Args:
+        path: 请求文件路径
+    
+    Returns:
+        list: 请求列表
+    """
+    return [record for record in _read_jsonl(path) if 'custom_id' in record and 'body' in record]
+
+
+def read_batch_results(path: Path) -> Dict[str, str]:
+    """读取批处理结果文件
+    
+    Args:
+        path: 结果文件路径（OpenAI Batch API 输出格式）
+    
+    Returns:
+        dict: custom_id -> 生成的文本，失败的请求不包含在内
+    """
+    results = {}
+    for record in _read_jsonl(path):
+        response = record.get('response') or {}
+        if record.get('error') or response.get('status_code') != 200:
+            continue
+        try:
+            text = response['body']['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            continue
+        if isinstance(text, str) and text.strip() and 'custom_id' in record:
+            results[str(record['custom_id'])] = text.strip()
+    return results
+
+
+def local_completion(batch_request: dict) -> str:
+    """本地替代实现：从提示词中抽取页面开头的句子作为摘要
+    
+    Args:
+        batch_request: 批处理请求
+    
+    Returns:
+        str: 摘要文本
+    """
+    prompt = batch_request['body']['messages'][-1]['content']
+    match = _PROMPT_CONTENT_PATTERN.search(prompt)
+    content = ' '.join((match.group(1) if match else prompt).split())
+    
+    summary = ''
+    for sentence in _SENTENCE_END_PATTERN.split(content):
+        if summary and len(summary) + len(sentence) > LOCAL_SUMMARY_LENGTH:
+            break
+        summary = f"{summary} {sentence}".strip() if summary else sentence
+    return summary[:LOCAL_SUMMARY_LENGTH * 2]
+
+
+def run_local_batch(requests_path: Path, results_path: Path,
+                    complete: Optional[Callable[[dict], str]] = None) -> int:
+    """把请求文件转换为结果文件，代替批处理服务
+    
+    Args:
+        requests_path: 请求文件路径
+        results_path: 结果文件路径
+        complete: 根据请求生成文本的函数，默认使用 local_completion（不访问网络）
+    
+    Returns:
+        int: 写入的结果数量
+    """
+    complete = complete or local_completion
+    results = []
+    for index, batch_request in enumerate(read_batch_requests(requests_path)):
+        request_id = f"local-{index}"
+        try:
+            text = complete(batch_request)
+        except Exception as e:
+            results.append({
+                'id': request_id, 'custom_id': batch_request['custom_id'], 'response': None,
+                'error': {'code': 'local_error', 'message': str(e)}
+            })
+            continue
+        
+        results.append({
+            'id': request_id,
+            'custom_id': batch_request['custom_id'],
+            'response': {
+                'status_code': 200,
+                'request_id': request_id,
+                'body': {
+                    'object': 'chat.completion',
+                    'model': batch_request['body'].get('model'),
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': text},
+                        'finish_reason': 'stop'
+                    }]
+                }
+            },
+            'error': None
+        })
+    return _write_jsonl(results_path, results)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='离线批处理本地替代实现：把请求文件转换为结果文件')
+    parser.add_argument('requests', help='导出的批处理请求文件（JSONL）')
+    parser.add_argument('results', help='生成的结果文件（JSONL）')
+    args = parser.parse_args(argv)
+    
+    count = run_local_batch(Path(args.requests), Path(args.results))
+    print(f"📦 已生成 {count} 条批处理结果: {args.results}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
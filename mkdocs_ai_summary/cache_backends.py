@@ -0,0 +1,501 @@
+"""缓存后端模块
+
+提供摘要缓存的存储后端：每页一个 JSON 文件的默认后端，以及单文件 SQLite 后端。
+两种后端都可以把条目压缩保存（cache_compression），读取时自动识别条目格式。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+
+from .storage import atomic_write_bytes
+
+
+# 可选的条目压缩格式
+CACHE_COMPRESSIONS = ('none', 'zlib')
+
+# 压缩条目的文件头，区分压缩格式和预设字典版本；字典变化时必须使用新的文件头
+ZLIB_ENTRY_MAGIC = b'AIS1'
+
+# zlib 预设字典：每个条目都会重复的字段名和常见取值。
+# 出现越频繁的内容越靠后，压缩时可以用更短的距离引用
+_ZLIB_ENTRY_DICTIONARY = (
+    '"service":"openai","service":"gemini","service":"siliconflow","service":"deepseek",'
+    '"hash_algorithm":"xxhash","hash_algorithm":"md5","cache_version":"1.2.2",'
+    '{"summary":"This document ","summary":"本文","summary":"本文介绍了",'
+    '","service":"glm","page_title":"","timestamp":"2026-01-01T00:00:00.000000",'
+    '"cache_version":"1.4.0","hash_algorithm":"blake2b","content_hash":"'
+).encode('utf-8')
+
+
+def encode_entry(data: Dict[str, Any], compression: str = 'none') -> bytes:
+    """序列化缓存条目
+    
+    Args:
+        data: 缓存数据
+        compression: 压缩格式 ('none', 'zlib')
+    
+    Returns:
+        bytes: 序列化后的条目
+    """
+    if compression == 'zlib':
+        raw = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        compressor = zlib.compressobj(9, zdict=_ZLIB_ENTRY_DICTIONARY)
+        return ZLIB_ENTRY_MAGIC + compressor.compress(raw) + compressor.flush()
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def decode_entry(raw) -> Dict[str, Any]:
+    """反序列化缓存条目，自动识别压缩格式
+    
+    Args:
+        raw: 序列化后的条目（bytes 或 JSON 字符串）
+    
+    Returns:
+        dict: 缓存数据
+    
+    Raises:
+        ValueError: 条目已损坏
+    """
+    if isinstance(raw, (bytes, memoryview)) and bytes(raw[:len(ZLIB_ENTRY_MAGIC)]) == ZLIB_ENTRY_MAGIC:
+        try:
+            decompressor = zlib.decompressobj(zdict=_ZLIB_ENTRY_DICTIONARY)
+            raw = decompressor.decompress(bytes(raw[len(ZLIB_ENTRY_MAGIC):])) + decompressor.flush()
+        except zlib.error as e:
+            raise ValueError(f"压缩缓存条目已损坏: {e}") from e
+    return json.loads(raw)
+
+
+class JsonCacheBackend:
+    """每个页面一个文件的缓存后端
+    
+    未压缩的条目保存为 <key>.json，压缩条目保存为 <key>.jsonz；
+    两种文件都可以读取，写入时使用配置的格式并删除另一种格式的旧文件。
+    """
+    
+    # 缓存目录中不属于摘要条目的文件
+    RESERVED_FILES = ('service_config.json', 'routing_stats.json', 'manifest.json')
+    
+    # 压缩格式 -> 条目文件后缀
+    ENTRY_SUFFIXES = {'none': '.json', 'zlib': '.jsonz'}
+    
+    def __init__(self, cache_dir: Path, compression: str = 'none'):
+        """初始化JSON缓存后端
+        
+        Args:
+            cache_dir: 缓存目录
+            compression: 新写入条目的压缩格式 ('none', 'zlib')
+        """
+        self.cache_dir = cache_dir
+        self.compression = compression
+        self._suffix = self.ENTRY_SUFFIXES[compression]
+        # 读取时先查找配置格式的文件，再查找另一种格式
+        self._suffixes = (self._suffix,) + tuple(
+            suffix for suffix in self.ENTRY_SUFFIXES.values() if suffix != self._suffix
+        )
+    
+    def _entry_path(self, key: str, suffix: Optional[str] = None) -> Path:
+        return self.cache_dir / f"{key}{suffix or self._suffix}"
+    
+    def _split_entry_name(self, name: str) -> Optional[str]:
+        """从文件名解析条目键，不是条目文件时返回None"""
+        if name in self.RESERVED_FILES:
+            return None
+        for suffix in self._suffixes:
+            if name.endswith(suffix):
+                return name[:-len(suffix)]
+        return None
+    
+    def _entry_files(self) -> List[Path]:
+        return [
+            f for suffix in self._suffixes for f in self.cache_dir.glob(f"*{suffix}")
+            if f.name not in self.RESERVED_FILES
+        ]
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存条目
+        
+        Args:
+            key: 条目键（文件哈希）
+        
+        Returns:
+            dict|None: 缓存数据，不存在时返回None
+        
+        Raises:
+            ValueError: 缓存文件已损坏
+        """
+        for suffix in self._suffixes:
+            try:
+                with open(self._entry_path(key, suffix), 'rb') as f:
+                    return decode_entry(f.read())
+            except FileNotFoundError:
+                continue
+        return None
+    
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """写入缓存条目
+        
+        Args:
+            key: 条目键（文件哈希）
+            data: 缓存数据
+        """
+        # 先写临时文件再重命名，构建中断时不会留下不完整的条目
+        atomic_write_bytes(self._entry_path(key), encode_entry(data, self.compression))
+        # 删除另一种格式的旧文件，避免同一条目存在两个版本
+        for suffix in self._suffixes[1:]:
+            self._entry_path(key, suffix).unlink(missing_ok=True)
+    
+    def delete(self, key: str) -> None:
+        """删除缓存条目
+        
+        Args:
+            key: 条目键（文件哈希）
+        """
+        for suffix in self._suffixes:
+            self._entry_path(key, suffix).unlink(missing_ok=True)
+    
+    def keys(self) -> List[str]:
+        """获取所有条目键
+        
+        Returns:
+            list: 条目键列表
+        """
+        return list(dict.fromkeys(self._split_entry_name(f.name) for f in self._entry_files()))
+    
+    def items(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """遍历所有条目
+        
+        Yields:
+            tuple: (key, data)，损坏的条目 data 为None
+        """
+        for cache_file in self._entry_files():
+            key = self._split_entry_name(cache_file.name)
+            try:
+                with open(cache_file, 'rb') as f:
+                    yield key, decode_entry(f.read())
+            except Exception:
+                yield key, None
+    
+    def count(self) -> int:
+        """获取条目数量
+        
+        Returns:
+            int: 条目数量
+        """
+        return len(self.keys())
+    
+    def expired_keys(self, cutoff: datetime, limit: Optional[int] = None) -> List[str]:
+        """根据文件修改时间找出过期条目，不解析文件内容
+        
+        文件修改时间不早于写入时间，因此这里只会漏判不会误删；
+        漏掉的过期条目会在读取时被识别。
+        
+        Args:
+            cutoff: 早于该时间的条目视为过期
+            limit: 最多返回的条目数量，None表示不限制
+            
+        Returns:
+            list: 过期条目键列表
+        """
+        cutoff_ts = cutoff.timestamp()
+        expired = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                key = self._split_entry_name(entry.name)
+                if key is None:
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff_ts:
+                        expired.append(key)
+                except OSError:
+                    continue
+                if limit and len(expired) >= limit:
+                    break
+        return expired
+    
+    def clear(self) -> int:
+        """删除所有条目
+        
+        Returns:
+            int: 删除的条目数量
+        """
+        cleared_keys = set()
+        for cache_file in self._entry_files():
+            cache_file.unlink(missing_ok=True)
+            cleared_keys.add(self._split_entry_name(cache_file.name))
+        return len(cleared_keys)
+    
+    def flush(self) -> None:
+        """JSON后端逐条写入，无需批量提交"""
+    
+    def close(self) -> None:
+        """JSON后端没有需要释放的资源"""
+
+
+class SQLiteCacheBackend:
+    """单文件 SQLite 缓存后端
+    
+    只保持一个数据库连接，按文件哈希做点查询；写入先缓冲在内存中，
+    在 flush() 时批量提交。压缩的条目以 BLOB 保存在同一列中。
+    """
+    
+    DB_NAME = 'cache.sqlite3'
+    
+    # 缓冲的写入超过该数量时提前提交，避免构建中断丢失过多摘要
+    AUTO_FLUSH_SIZE = 200
+    
+    def __init__(self, cache_dir: Path, migrate_json: bool = True, compression: str = 'none'):
+        """初始化SQLite缓存后端
+        
+        Args:
+            cache_dir: 缓存目录
+            migrate_json: 首次打开时是否导入已有的JSON缓存文件
+            compression: 新写入条目的压缩格式 ('none', 'zlib')
+        """
+        self.cache_dir = cache_dir
+        self.compression = compression
+        self.db_path = cache_dir / self.DB_NAME
+        
+        self._lock = threading.RLock()
+        # 待提交的写入: key -> data（None 表示删除）
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        # WAL 模式下多个构建可以同时读取，写入互不破坏；NORMAL 在 WAL 下仍然保证崩溃后一致
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "file_hash TEXT PRIMARY KEY, content_hash TEXT, timestamp TEXT, data TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries (timestamp)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.commit()
+        
+        if migrate_json and self._get_meta('json_migrated') is None:
+            self.migrate_from_json(JsonCacheBackend(cache_dir))
+    
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+            self._conn.commit()
+    
+    def migrate_from_json(self, json_backend: JsonCacheBackend) -> int:
+        """从每页一个JSON文件的缓存迁移到SQLite
+        
+        原有JSON文件保留不动，方便切换回JSON后端。
+        
+        Args:
+            json_backend: 源JSON缓存后端
+        
+        Returns:
+            int: 导入的条目数量
+        """
+        migrated_count = 0
+        with self._lock:
+            for key, data in json_backend.items():
+                if data is None:
+                    continue
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO entries (file_hash, content_hash, timestamp, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, data.get('content_hash'), data.get('timestamp'), self._encode(data))
+                )
+                migrated_count += 1
+            self._conn.commit()
+        
+        self._set_meta('json_migrated', '1')
+        if migrated_count > 0:
+            print(f"📦 已将 {migrated_count} 个JSON缓存导入SQLite")
+        return migrated_count
+    
+    def _encode(self, data: Dict[str, Any]):
+        """未压缩时保存为 TEXT，与旧版本数据库保持一致"""
+        if self.compression == 'none':
+            return json.dumps(data, ensure_ascii=False)
+        return encode_entry(data, self.compression)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存条目
+        
+        Args:
+            key: 条目键（文件哈希）
+        
+        Returns:
+            dict|None: 缓存数据，不存在时返回None
+        
+        Raises:
+            ValueError: 缓存数据已损坏
+        """
+        with self._lock:
+            if key in self._pending:
+                data = self._pending[key]
+                return dict(data) if data is not None else None
+            row = self._conn.execute(
+                "SELECT data FROM entries WHERE file_hash = ?", (key,)
+            ).fetchone()
+        return decode_entry(row[0]) if row else None
+    
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """缓冲一次写入，flush() 时提交
+        
+        Args:
+            key: 条目键（文件哈希）
+            data: 缓存数据
+        """
+        with self._lock:
+            self._pending[key] = dict(data)
+            if len(self._pending) >= self.AUTO_FLUSH_SIZE:
+                self.flush()
+    
+    def delete(self, key: str) -> None:
+        """缓冲一次删除，flush() 时提交
+        
+        Args:
+            key: 条目键（文件哈希）
+        """
+        with self._lock:
+            self._pending[key] = None
+    
+    def keys(self) -> List[str]:
+        """获取所有条目键
+        
+        Returns:
+            list: 条目键列表
+        """
+        self.flush()
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT file_hash FROM entries")]
+    
+    def items(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """遍历所有条目
+        
+        Yields:
+            tuple: (key, data)，损坏的条目 data 为None
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute("SELECT file_hash, data FROM entries").fetchall()
+        for key, raw in rows:
+            try:
+                yield key, decode_entry(raw)
+            except ValueError:
+                yield key, None
+    
+    def count(self) -> int:
+        """获取条目数量
+        
+        Returns:
+            int: 条目数量
+        """
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    
+    def expired_keys(self, cutoff: datetime, limit: Optional[int] = None) -> List[str]:
+        """通过时间戳索引找出过期条目，不解析条目内容
+        
+        Args:
+            cutoff: 早于该时间的条目视为过期
+            limit: 最多返回的条目数量，None表示不限制
+            
+        Returns:
+            list: 过期条目键列表
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_hash FROM entries WHERE timestamp IS NULL OR timestamp < ? LIMIT ?",
+                (cutoff.isoformat(), limit or -1)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def clear(self) -> int:
+        """删除所有条目
+        
+        Returns:
+            int: 删除的条目数量
+        """
+        with self._lock:
+            self._pending.clear()
+            cleared_count = self._conn.execute("DELETE FROM entries").rowcount
+            self._conn.commit()
+        return cleared_count
+    
+    def flush(self) -> None:
+        """批量提交缓冲的写入"""
+        with self._lock:
+            if not self._pending:
+                return
+            
+            upserts = []
+            deletes = []
+            for key, data in self._pending.items():
+                if data is None:
+                    deletes.append((key,))
+                else:
+                    upserts.append((
+                        key, data.get('content_hash'), data.get('timestamp'), self._encode(data)
+                    ))
+            
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (file_hash, content_hash, timestamp, data) "
+                "VALUES (?, ?, ?, ?)",
+                upserts
+            )
+            self._conn.executemany("DELETE FROM entries WHERE file_hash = ?", deletes)
+            self._conn.commit()
+            self._pending.clear()
+    
+    def close(self) -> None:
+        """提交缓冲的写入并关闭数据库连接"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+
+CACHE_BACKENDS = {
+    'json': JsonCacheBackend,
+    'sqlite': SQLiteCacheBackend,
+}
+
+
+def create_cache_backend(name: str, cache_dir: Path, compression: str = 'none'):
+    """根据名称创建缓存后端
+    
+    Args:
+        name: 后端名称 ('json', 'sqlite')
+        cache_dir: 缓存目录
+        compression: 新写入条目的压缩格式 ('none', 'zlib')
+    
+    Returns:
+        缓存后端实例
+    
+    Raises:
+        ValueError: 未知的后端名称
+    """
+    backend_class = CACHE_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"未知的缓存后端: {name}（可选: {', '.join(CACHE_BACKENDS)}）")
+    if compression not in CACHE_COMPRESSIONS:
+        raise ValueError(f"未知的缓存压缩格式: {compression}（可选: {', '.join(CACHE_COMPRESSIONS)}）")
+    return backend_class(cache_dir, compression=compression)
@@ -4,36 +4,591 @@
 """
 
 import json
-import hashlib
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Optional, Any
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+
+from .cache_backends import create_cache_backend
+from .hashing import DEFAULT_HASH_ALGORITHM, hash_text
+from .remote_cache import RemoteCache
+from .storage import FileLock, atomic_write_json, remove_stale_temp_files
+
+# lookup() 的结果状态
+CACHE_HIT = 'hit'      # 缓存有效且内容未变化
+CACHE_STALE = 'stale'  # 缓存存在但内容已变化
+CACHE_MISS = 'miss'    # 没有可用的缓存
+
+# 缓存条目格式版本，与包版本（__version__）相互独立，只在条目格式变化时递增；
+# 1.4.0 起条目记录 hash_algorithm，之前的条目（1.2.2）均为 md5。
+# 压缩字典 cache_backends._ZLIB_ENTRY_DICTIONARY 中包含该取值，修改时一并更新
+CACHE_VERSION = '1.4.0'
+
+# 构建清单：记录本次构建用到的缓存条目（只保存指向条目的精简记录，不复制摘要）和源文件状态，
+# 下次构建启动时一次读取；按 docs 目录分区，共享 .ai_cache 的多个站点互不覆盖。
+# 分区名和源文件路径均为相对路径，清单随 .ai_cache 提交时不包含本机路径；
+# 版本 3 起使用相对路径，之前的清单（绝对路径）整体失效
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 3
+
+# 缓存目录的进程间锁文件，多个构建共享 .ai_cache 时串行化写入
+LOCK_FILE = '.lock'
+
+
+class MemoryCache:
+    """进程内 LRU 摘要缓存
+    
+    以 (file_hash, content_hash) 为键，位于磁盘缓存之前；插件对象在
+    mkdocs serve 的多次重建之间保持存活，未变化的页面无需再读磁盘。
+    """
+    
+    def __init__(self, max_entries: int = 1000):
+        """初始化内存缓存
+        
+        Args:
+            max_entries: 最多保留的条目数
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, file_hash: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """读取条目并标记为最近使用
+        
+        Args:
+            file_hash: 文件哈希
+            content_hash: 内容哈希
+            
+        Returns:
+            dict|None: 缓存数据的副本，未命中时返回None
+        """
+        key = (file_hash, content_hash)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                return None
+            self._entries.move_to_end(key)
+            return dict(data)
+    
+    def put(self, file_hash: str, content_hash: str, data: Dict[str, Any]) -> None:
+        """写入条目，超出容量时淘汰最久未使用的条目
+        
+        Args:
+            file_hash: 文件哈希
+            content_hash: 内容哈希
+            data: 缓存数据
+        """
+        if self.max_entries <= 0:
+            return
+        
+        key = (file_hash, content_hash)
+        with self._lock:
+            self._entries[key] = dict(data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def discard(self, file_hash: str, content_hash: str) -> None:
+        """移除条目
+        
+        Args:
+            file_hash: 文件哈希
+            content_hash: 内容哈希
+        """
+        with self._lock:
+            self._entries.pop((file_hash, content_hash), None)
+    
+    def clear(self) -> None:
+        """清空所有条目"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SourceIndex:
+    """源文件状态索引
+    
+    以源文件绝对路径为键，记录文件上次处理时的修改时间和大小，以及据此计算出的文件哈希、内容哈希和页面语言；
+    文件状态未变化时直接复用这些哈希，无需读取文件或对内容计算哈希。保存到构建清单时使用相对 docs 目录的路径，
+    清单内容与检出位置无关。
+    """
+    
+    def __init__(self, fingerprint: Tuple = ()):
+        """初始化源文件索引
+        
+        Args:
+            fingerprint: 影响哈希结果的配置（如默认语言、哈希算法），配置变化时索引失效
+        """
+        self.fingerprint = fingerprint
+        self._entries: Dict[str, Tuple[int, int, str, str, str]] = {}
+        # 本次构建中已确认未变化的文件，再次查询时无需读取文件状态
+        self._verified: set = set()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def stat(path: str) -> Optional[Tuple[int, int]]:
+        """读取文件状态
+        
+        Args:
+            path: 源文件绝对路径
+            
+        Returns:
+            tuple|None: (修改时间纳秒, 文件大小)，文件不存在时返回None
+        """
+        try:
+            st = os.stat(path)
+        except (OSError, TypeError, ValueError):
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def begin_build(self) -> None:
+        """开始新的构建，之前确认过的文件需要重新检查状态"""
+        with self._lock:
+            self._verified.clear()
+    
+    def get(self, key: str, stat: Optional[Tuple[int, int]]) -> Optional[Tuple[str, str, str]]:
+        """查找状态未变化的文件记录
+        
+        Args:
+            key: 源文件绝对路径
+            stat: 当前文件状态，来自 stat()
+            
+        Returns:
+            tuple|None: (file_hash, content_hash, language)，文件已变化或没有记录时返回None
+        """
+        if stat is None:
+            return None
+        
+        entry = self._entries.get(key)
+        if entry is None or entry[:2] != stat:
+            return None
+        with self._lock:
+            self._verified.add(key)
+        return entry[2:]
+    
+    def get_verified(self, key: str) -> Optional[Tuple[str, str, str]]:
+        """获取本次构建中已确认未变化的文件记录
+        
+        Args:
+            key: 源文件绝对路径
+            
+        Returns:
+            tuple|None: (file_hash, content_hash, language)，本次构建尚未确认时返回None
+        """
+        if key not in self._verified:
+            return None
+        entry = self._entries.get(key)
+        return entry[2:] if entry else None
+    
+    def put(self, key: str, stat: Optional[Tuple[int, int]], file_hash: str,
+            content_hash: str, language: str) -> None:
+        """记录文件状态与对应的哈希
+        
+        Args:
+            key: 源文件绝对路径
+            stat: 读取文件前获取的文件状态，来自 stat()
+            file_hash: 文件哈希
+            content_hash: 内容哈希
+            language: 页面语言
+        """
+        if stat is None:
+            return
+        
+        with self._lock:
+            self._entries[key] = (stat[0], stat[1], file_hash, content_hash, language)
+            self._verified.add(key)
+    
+    def to_dict(self, base: Optional[str] = None) -> Dict[str, Any]:
+        """导出本次构建确认过的记录，用于保存到构建清单
+        
+        Args:
+            base: docs 目录，指定时键转换为相对该目录的 POSIX 路径，目录之外的记录不导出
+        
+        Returns:
+            dict: {'fingerprint': [...], 'files': {key: [mtime_ns, size, file_hash, content_hash, language]}}
+        """
+        with self._lock:
+            entries = {key: list(self._entries[key]) for key in self._verified if key in self._entries}
+        
+        if base is not None:
+            relative = {}
+            for key, entry in entries.items():
+                try:
+                    rel_path = os.path.relpath(key, base)
+                except ValueError:  # Windows 下不同盘符
+                    continue
+                if not rel_path.startswith(os.pardir):
+                    relative[Path(rel_path).as_posix()] = entry
+            entries = relative
+        return {'fingerprint': list(self.fingerprint), 'files': entries}
+    
+    def load(self, data: Dict[str, Any], base: Optional[str] = None) -> bool:
+        """从构建清单恢复记录
+        
+        Args:
+            data: to_dict() 导出的数据
+            base: docs 目录，与导出时的 base 对应，键被还原为绝对路径
+            
+        Returns:
+            bool: 配置一致并成功加载时返回True
+        """
+        if not data or data.get('fingerprint') != list(self.fingerprint):
+            return False
+        
+        with self._lock:
+            for key, entry in data.get('files', {}).items():
+                if base is not None:
+                    if os.path.isabs(key):
+                        continue
+                    key = os.path.normpath(os.path.join(base, key))
+                if len(entry) == 5:
+                    self._entries[key] = (int(entry[0]), int(entry[1]), entry[2], entry[3], entry[4])
+        return True
+    
+    def clear(self) -> None:
+        """清空所有记录"""
+        with self._lock:
+            self._entries.clear()
+            self._verified.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class CacheManager:
     """缓存管理器"""
     
-    def __init__(self, enabled: bool = True, expire_days: int = 30, auto_clean: bool = True):
+    def __init__(self, enabled: bool = True, expire_days: int = 30, auto_clean: bool = True,
+                 backend: str = 'json', clean_limit: int = 0, clean_in_background: bool = True,
+                 memory_cache: Optional[MemoryCache] = None,
+                 hash_algorithm: str = DEFAULT_HASH_ALGORITHM, compression: str = 'none',
+                 remote: Optional[RemoteCache] = None, dedup_identity: Optional[str] = None):
         """初始化缓存管理器
         
         Args:
             enabled: 是否启用缓存
             expire_days: 缓存过期天数
             auto_clean: 是否自动清理过期缓存
+            backend: 缓存存储后端 ('json', 'sqlite')
+            clean_limit: 每次构建最多清理的过期条目数，0表示不限制
+            clean_in_background: 是否在后台线程中清理过期缓存
+            memory_cache: 位于磁盘缓存之前的内存LRU缓存（可选）
+            hash_algorithm: 计算缓存键和内容哈希使用的算法，随条目一起保存
+            compression: 新写入条目的压缩格式 ('none', 'zlib')，读取时自动识别
+            remote: 本地缓存之后的远程缓存层（可选），本地未命中时读取，新条目在 close() 时上传
+            dedup_identity: 生成摘要的模型和提示词版本标识；设置后内容相同的页面复用同一个摘要，
+                None表示不按内容复用
         """
         self.enabled = enabled
+        self.hash_algorithm = hash_algorithm
         self.expire_days = expire_days
         self.auto_clean = auto_clean
+        self.clean_limit = clean_limit
+        self._clean_thread: Optional[threading.Thread] = None
         
-        # 缓存目录
-        self.cache_dir = Path(".ai_cache")
+        # 缓存目录（使用绝对路径，后台清理线程不受工作目录变化影响）
+        self.cache_dir = Path(".ai_cache").absolute()
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # 服务配置文件
         self.service_config_file = self.cache_dir / "service_config.json"
         
+        # 写入、删除和清理时持有的进程间锁；读取依赖原子重命名，无需加锁
+        self.lock = FileLock(self.cache_dir / LOCK_FILE)
+        
+        # 摘要存储后端
+        self.backend = create_cache_backend(backend, self.cache_dir, compression=compression)
+        
+        # 内存缓存（写穿透到磁盘）
+        self.memory_cache = memory_cache
+        
+        # 远程缓存层
+        self.remote = remote
+        
+        # 按内容寻址的索引：content_key -> 保存该内容摘要的 file_hash
+        self.dedup_identity = dedup_identity
+        self._content_index: Dict[str, str] = {}
+        self.dedup_hits = 0
+        
+        # 构建清单：file_hash -> [content_hash, content_key]，按内容查找时无需逐个读取条目
+        self.manifest_file = self.cache_dir / MANIFEST_FILE
+        self._manifest_scope = ''
+        self._manifest: Dict[str, List[str]] = {}
+        self._manifest_used: set = set()
+        self._manifest_dirty = False
+        self._manifest_sources: Dict[str, Any] = {}
+        
         if self.enabled and self.auto_clean:
-            self._clean_expired_cache()
+            if clean_in_background:
+                # 过期清理不阻塞构建启动
+                self._clean_thread = threading.Thread(
+                    target=self._clean_expired_cache, name='ai-summary-cache-clean', daemon=True
+                )
+                self._clean_thread.start()
+            else:
+                self._clean_expired_cache()
+    
+    def lookup(self, file_hash: str, content_hash: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """一次读取完成内容变化检测和缓存读取
+        
+        Args:
+            file_hash: 文件哈希（基于路径+语言）
+            content_hash: 内容哈希（基于实际内容）
+            
+        Returns:
+            tuple: (status, cache_data)，status 为 CACHE_HIT / CACHE_STALE / CACHE_MISS；
+                CACHE_MISS 时 cache_data 为None
+        """
+        if not self.enabled:
+            return CACHE_MISS, None
+        
+        # 先查内存缓存，命中时无需任何磁盘I/O
+        if self.memory_cache is not None:
+            cache_data = self.memory_cache.get(file_hash, content_hash)
+            if cache_data is not None:
+                if not self._is_expired(cache_data):
+                    self._remember(file_hash, cache_data)
+                    return CACHE_HIT, cache_data
+                self.memory_cache.discard(file_hash, content_hash)
+        
+        try:
+            cache_data = self.backend.get(file_hash)
+            
+            # 过期缓存视为不存在
+            if cache_data is not None and self._is_expired(cache_data):
+                self.backend.delete(file_hash)
+                cache_data = None
+        except Exception:
+            # 读取失败时视为未命中但保留文件，重新生成的摘要会原子覆盖它
+            cache_data = None
+        
+        if cache_data is None or cache_data.get('content_hash') != content_hash:
+            # 本地未命中或内容已变化时，依次查找其他路径下相同内容的摘要和远程缓存
+            shared_data = self._lookup_content(content_hash) or self._lookup_remote(file_hash, content_hash)
+            if shared_data is None:
+                return (CACHE_MISS, None) if cache_data is None else (CACHE_STALE, cache_data)
+            cache_data = self._adopt(file_hash, shared_data)
+        
+        self._remember(file_hash, cache_data)
+        if self.memory_cache is not None:
+            self.memory_cache.put(file_hash, content_hash, cache_data)
+        return CACHE_HIT, cache_data
+    
+    def content_key(self, content_hash: str) -> str:
+        """计算按内容寻址的键
+        
+        Args:
+            content_hash: 内容哈希（已包含页面语言）
+            
+        Returns:
+            str: 由内容哈希、模型和提示词版本决定的键
+        """
+        return hash_text(content_hash, self.dedup_identity or '', algorithm=self.hash_algorithm)
+    
+    def _lookup_content(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """查找其他路径下内容相同的摘要
+        
+        索引来自构建清单和本次构建命中或写入的条目，只读取索引指向的那一个条目。
+        
+        Args:
+            content_hash: 内容哈希
+            
+        Returns:
+            dict|None: 内容相同且未过期的条目，没有时返回None
+        """
+        if self.dedup_identity is None or not content_hash:
+            return None
+        
+        content_key = self.content_key(content_hash)
+        source_hash = self._content_index.get(content_key)
+        record = self._manifest.get(source_hash) if source_hash else None
+        if record is None or record != [content_hash, content_key]:
+            return None
+        
+        try:
+            cache_data = self.backend.get(source_hash)
+        except Exception:
+            cache_data = None
+        if (cache_data is None or cache_data.get('content_key') != content_key
+                or cache_data.get('content_hash') != content_hash or self._is_expired(cache_data)):
+            return None
+        
+        self.dedup_hits += 1
+        return cache_data
+    
+    def _adopt(self, file_hash: str, cache_data: Dict[str, Any]) -> Dict[str, Any]:
+        """把其他来源的条目保存到当前文件哈希下
+        
+        保留原条目的时间戳，过期时间从摘要生成时算起。
+        
+        Args:
+            file_hash: 文件哈希
+            cache_data: 相同内容的条目或远程条目
+            
+        Returns:
+            dict: 保存的条目
+        """
+        cache_data = dict(cache_data)
+        try:
+            with self.lock:
+                self.backend.set(file_hash, cache_data)
+        except Exception as e:
+            print(f"⚠️ 保存共享缓存条目失败: {e}")
+        return cache_data
+    
+    def _lookup_remote(self, file_hash: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """从远程缓存读取条目
+        
+        Args:
+            file_hash: 文件哈希
+            content_hash: 内容哈希
+            
+        Returns:
+            dict|None: 未过期的远程条目，未命中时返回None
+        """
+        # 只读取条目而不比较内容时（内容哈希为空）无法按键查询远程缓存
+        if self.remote is None or not content_hash:
+            return None
+        
+        cache_data = self.remote.get(file_hash, content_hash)
+        if cache_data is None or self._is_expired(cache_data):
+            return None
+        return cache_data
+    
+    def _remember(self, file_hash: str, cache_data: Dict[str, Any]) -> None:
+        """把本次构建命中或写入的条目记入构建清单
+        
+        Args:
+            file_hash: 文件哈希
+            cache_data: 缓存条目
+        """
+        self._manifest_used.add(file_hash)
+        content_key = cache_data.get('content_key')
+        if content_key and self.dedup_identity is not None:
+            self._content_index[content_key] = file_hash
+        record = [cache_data.get('content_hash') or '', content_key or '']
+        if self._manifest.get(file_hash) != record:
+            self._manifest[file_hash] = record
+            self._manifest_dirty = True
+    
+    def _read_manifest_file(self) -> Dict[str, Any]:
+        """读取清单文件中格式和哈希算法匹配的各分区
+        
+        Returns:
+            dict: 分区名 -> 分区数据，没有可用清单时为空字典
+        """
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            return {}
+        
+        # 清单格式或哈希算法不同时，条目键不再适用
+        if data.get('version') != MANIFEST_VERSION or data.get('hash_algorithm') != self.hash_algorithm:
+            return {}
+        scopes = data.get('scopes')
+        return scopes if isinstance(scopes, dict) else {}
+    
+    def manifest_scope(self, docs_dir: str) -> str:
+        """计算 docs 目录对应的清单分区名
+        
+        分区名为 docs 目录相对项目目录（.ai_cache 所在目录，即 mkdocs.yml 所在目录）的 POSIX 路径。
+        
+        Args:
+            docs_dir: docs 目录
+            
+        Returns:
+            str: 清单分区名
+        """
+        try:
+            return Path(os.path.relpath(docs_dir, self.cache_dir.parent)).as_posix()
+        except ValueError:  # Windows 下不同盘符
+            return Path(docs_dir).name
+    
+    def load_manifest(self, scope: str = '') -> Dict[str, Any]:
+        """加载上次构建保存的构建清单
+        
+        Args:
+            scope: 清单分区，通常为 manifest_scope() 的结果；共享 .ai_cache 的多个站点各自使用一个分区
+        
+        Returns:
+            dict: 清单中保存的源文件状态（SourceIndex.to_dict() 的格式），没有可用清单时为空字典
+        """
+        self._manifest_scope = scope
+        self._manifest = {}
+        self._manifest_used = set()
+        self._manifest_dirty = False
+        self._manifest_sources = {}
+        self._content_index = {}
+        if not self.enabled:
+            return {}
+        
+        data = self._read_manifest_file().get(scope) or {}
+        self._manifest = {
+            file_hash: record for file_hash, record in data.get('entries', {}).items()
+            if isinstance(record, list) and len(record) == 2
+        }
+        self._manifest_sources = data.get('sources', {})
+        if self.dedup_identity is not None:
+            for file_hash, record in self._manifest.items():
+                if record[1]:
+                    self._content_index[record[1]] = file_hash
+        return self._manifest_sources
+    
+    def save_manifest(self, sources: Optional[Dict[str, Any]] = None) -> None:
+        """保存构建清单，只保留本次构建用到的条目
+        
+        内容与加载时相同（无变化的构建）时不写入文件；写入时保留其他分区的内容，
+        丢弃对应目录已不存在的分区和旧格式的绝对路径分区。
+        
+        Args:
+            sources: 源文件状态（SourceIndex.to_dict() 的格式）
+        """
+        if not self.enabled:
+            return
+        
+        sources = sources or {}
+        entries = {key: self._manifest[key] for key in self._manifest_used if key in self._manifest}
+        if not self._manifest_dirty and len(entries) == len(self._manifest) and sources == self._manifest_sources:
+            return
+        
+        try:
+            with self.lock:
+                # 持锁重新读取，避免覆盖其他构建刚写入的分区
+                scopes = {
+                    name: scope_data for name, scope_data in self._read_manifest_file().items()
+                    if not os.path.isabs(name) and (self.cache_dir.parent / name).is_dir()
+                }
+                scopes[self._manifest_scope] = {'entries': entries, 'sources': sources}
+                data = {
+                    'version': MANIFEST_VERSION,
+                    'hash_algorithm': self.hash_algorithm,
+                    'scopes': scopes
+                }
+                atomic_write_json(self.manifest_file, data, ensure_ascii=False, separators=(',', ':'))
+        except Exception as e:
+            print(f"⚠️ 保存构建清单失败: {e}")
+            return
+        
+        self._manifest = entries
+        self._manifest_dirty = False
+        self._manifest_sources = sources
+    
+    def _is_expired(self, cache_data: Dict[str, Any]) -> bool:
+        """判断缓存条目是否过期
+        
+        Args:
+            cache_data: 缓存数据
+            
+        Returns:
+            bool: True表示已过期
+        """
+        cache_time = datetime.fromisoformat(cache_data.get('timestamp', '1970-01-01'))
+        return (datetime.now() - cache_time).days >= self.expire_days
     
     def get_cached_summary(self, content_hash: str) -> Optional[Dict[str, Any]]:
         """获取缓存的摘要
@@ -47,24 +602,20 @@ class CacheManager:
         if not self.enabled:
             return None
         
-        cache_file = self.cache_dir / f"{content_hash}.json"
-        if not cache_file.exists():
-            return None
-        
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = self.backend.get(content_hash)
+            if cache_data is None:
+                return None
             
             # 检查缓存是否过期
             cache_time = datetime.fromisoformat(cache_data.get('timestamp', '1970-01-01'))
             if (datetime.now() - cache_time).days < self.expire_days:
                 return cache_data
             else:
-                cache_file.unlink()
+                self.backend.delete(content_hash)
                 return None
         except Exception:
-            # 删除损坏的缓存文件
-            cache_file.unlink(missing_ok=True)
+            # 读取失败时视为未命中但保留文件，重新生成的摘要会原子覆盖它
             return None
     
     def is_content_changed(self, file_hash: str, content_hash: str) -> bool:
@@ -80,13 +631,10 @@ class CacheManager:
         if not self.enabled:
             return True  # 如果缓存未启用，总是认为内容已变化
         
-        cache_file = self.cache_dir / f"{file_hash}.json"
-        if not cache_file.exists():
-            return True  # 缓存文件不存在，认为是新内容
-        
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = self.backend.get(file_hash)
+            if cache_data is None:
+                return True  # 缓存条目不存在，认为是新内容
             
             # 比较内容哈希
             cached_content_hash = cache_data.get('content_hash')
@@ -105,43 +653,66 @@ class CacheManager:
         if not self.enabled:
             return
         
-        cache_file = self.cache_dir / f"{content_hash}.json"
         try:
             # 添加内容变化检测哈希（如果提供）
             summary_data.update({
                 'timestamp': datetime.now().isoformat(),
-                'cache_version': '1.2.2'
+                'cache_version': CACHE_VERSION,
+                'hash_algorithm': self.hash_algorithm
             })
             
             if content_hash_for_change_detection:
                 summary_data['content_hash'] = content_hash_for_change_detection
+                if self.dedup_identity is not None:
+                    summary_data['content_key'] = self.content_key(content_hash_for_change_detection)
+            
+            with self.lock:
+                self.backend.set(content_hash, summary_data)
+            self._remember(content_hash, summary_data)
             
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(summary_data, f, ensure_ascii=False, indent=2)
+            if self.remote is not None and content_hash_for_change_detection:
+                self.remote.put(content_hash, content_hash_for_change_detection, summary_data)
+            
+            if self.memory_cache is not None and content_hash_for_change_detection:
+                self.memory_cache.put(content_hash, content_hash_for_change_detection, summary_data)
         except Exception as e:
             print(f"⚠️ 保存缓存失败: {e}")
     
+    def delete_summary_cache(self, file_hash: str) -> None:
+        """删除指定的缓存条目
+        
+        Args:
+            file_hash: 文件哈希（基于路径+语言）
+        """
+        if not self.enabled:
+            return
+        
+        self._manifest_used.discard(file_hash)
+        if self._manifest.pop(file_hash, None) is not None:
+            self._manifest_dirty = True
+        
+        try:
+            with self.lock:
+                self.backend.delete(file_hash)
+        except Exception as e:
+            print(f"⚠️ 删除缓存失败: {e}")
+    
     def _clean_expired_cache(self) -> None:
-        """清理过期缓存"""
+        """清理过期缓存
+        
+        只依赖后端的时间戳索引（或文件修改时间），不解析缓存条目；
+        未被清理的过期条目会在 lookup() 时被识别。
+        """
         try:
-            current_time = datetime.now()
-            expired_count = 0
-            
-            for cache_file in self.cache_dir.glob("*.json"):
-                if cache_file.name == "service_config.json":
-                    continue
-                
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    cache_time = datetime.fromisoformat(cache_data.get('timestamp', '1970-01-01'))
-                    if (current_time - cache_time).days >= self.expire_days:
-                        cache_file.unlink()
-                        expired_count += 1
-                except Exception:
-                    cache_file.unlink()
-                    expired_count += 1
+            cutoff = datetime.now() - timedelta(days=self.expire_days)
+            # 持锁完成查找和删除，避免删除其他构建刚刚刷新的条目
+            with self.lock:
+                expired_keys = self.backend.expired_keys(cutoff, limit=self.clean_limit or None)
+                for key in expired_keys:
+                    self.backend.delete(key)
+                self.backend.flush()
+                remove_stale_temp_files(self.cache_dir)
+            expired_count = len(expired_keys)
             
             if expired_count > 0:
                 print(f"🧹 清理了 {expired_count} 个过期缓存文件")
@@ -153,15 +724,18 @@ class CacheManager:
         
         保留配置文件，只清理摘要缓存文件。
         """
+        if self.memory_cache is not None:
+            self.memory_cache.clear()
+        
+        self._manifest = {}
+        self._manifest_used = set()
+        self._manifest_dirty = True
+        self._content_index = {}
+        
         try:
-            cache_files = list(self.cache_dir.glob("*.json"))
-            config_files = ['service_config.json']  # 需要保留的配置文件
-            
-            cleared_count = 0
-            for cache_file in cache_files:
-                if cache_file.name not in config_files:
-                    cache_file.unlink()
-                    cleared_count += 1
+            # 后端只管理摘要条目，配置文件不受影响
+            with self.lock:
+                cleared_count = self.backend.clear()
             
             if cleared_count > 0:
                 print(f"🧹 已清理 {cleared_count} 个缓存文件")
@@ -169,6 +743,38 @@ class CacheManager:
         except Exception as e:
             print(f"❌ 清理缓存失败: {e}")
     
+    def count_entries(self) -> int:
+        """获取摘要缓存条目数量
+        
+        Returns:
+            int: 条目数量
+        """
+        try:
+            return self.backend.count()
+        except Exception:
+            return 0
+    
+    def flush(self) -> None:
+        """提交后端中缓冲的写入"""
+        try:
+            self.backend.flush()
+        except Exception as e:
+            print(f"⚠️ 提交缓存失败: {e}")
+    
+    def close(self) -> None:
+        """提交缓冲的写入并释放后端资源"""
+        if self._clean_thread is not None:
+            self._clean_thread.join()
+            self._clean_thread = None
+        
+        try:
+            self.backend.close()
+        except Exception as e:
+            print(f"⚠️ 关闭缓存失败: {e}")
+        
+        if self.remote is not None:
+            self.remote.close()
+    
     def save_service_config(self, config: Dict[str, Any]) -> None:
         """保存服务配置到文件
         
@@ -176,8 +782,8 @@ class CacheManager:
             config: 包含服务和语言配置的字典
         """
         try:
-            with open(self.service_config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            with self.lock:
+                atomic_write_json(self.service_config_file, config, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"⚠️ 保存服务配置失败: {e}")
     
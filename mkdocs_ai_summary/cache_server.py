@@ -0,0 +1,136 @@
+"""远程缓存参考服务器
+
+实现 remote_cache.py 中的 GET/PUT 协议，把条目保存为目录中的 JSON 文件，
+用于本地测试或小团队共享缓存。只依赖标准库。
+
+用法:
+    python -m mkdocs_ai_summary.cache_server --port 8765 --dir .ai_remote_cache
+    # 插件配置: remote_cache_url: http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import os
+import re
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from .remote_cache import REMOTE_CACHE_TOKEN_ENV
+from .storage import atomic_write_bytes
+
+
+# 条目路径: /{file_hash}/{content_hash}，只接受十六进制哈希，避免访问目录外的文件
+ENTRY_PATH_PATTERN = re.compile(r'^(?:.*/)?([0-9a-f]{8,128})/([0-9a-f]{8,128})$')
+
+# 单个条目的最大字节数
+MAX_ENTRY_SIZE = 1024 * 1024
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """处理缓存条目的 GET/PUT 请求"""
+    
+    def __init__(self, *args, storage_dir: Path, token: Optional[str] = None, **kwargs):
+        self.storage_dir = storage_dir
+        self.token = token
+        super().__init__(*args, **kwargs)
+    
+    def _entry_file(self) -> Optional[Path]:
+        """解析请求路径对应的条目文件，路径无效时返回None"""
+        match = ENTRY_PATH_PATTERN.match(self.path.split('?', 1)[0])
+        if not match:
+            return None
+        file_hash, content_hash = match.groups()
+        return self.storage_dir / f"{file_hash}-{content_hash}.json"
+    
+    def _authorized(self) -> bool:
+        if not self.token:
+            return True
+        return self.headers.get('Authorization') == f'Bearer {self.token}'
+    
+    def _reply(self, status: int, body: bytes = b'') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+    
+    def do_GET(self) -> None:
+        if not self._authorized():
+            return self._reply(401)
+        entry_file = self._entry_file()
+        if entry_file is None:
+            return self._reply(400)
+        try:
+            body = entry_file.read_bytes()
+        except FileNotFoundError:
+            return self._reply(404)
+        self._reply(200, body)
+    
+    def do_PUT(self) -> None:
+        if not self._authorized():
+            return self._reply(401)
+        entry_file = self._entry_file()
+        length = int(self.headers.get('Content-Length') or 0)
+        if entry_file is None or not 0 < length <= MAX_ENTRY_SIZE:
+            return self._reply(400)
+        
+        body = self.rfile.read(length)
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return self._reply(400)
+        if not isinstance(data, dict) or 'summary' not in data:
+            return self._reply(400)
+        
+        atomic_write_bytes(entry_file, body)
+        self._reply(204)
+    
+    def log_message(self, format: str, *args) -> None:
+        """只在调试时输出访问日志"""
+        if os.getenv('AI_SUMMARY_CACHE_SERVER_DEBUG'):
+            super().log_message(format, *args)
+
+
+def create_server(host: str, port: int, storage_dir: Path, token: Optional[str] = None) -> ThreadingHTTPServer:
+    """创建缓存服务器
+    
+    Args:
+        host: 监听地址
+        port: 监听端口，0表示随机端口
+        storage_dir: 条目保存目录
+        token: 访问令牌，None表示不校验
+    
+    Returns:
+        ThreadingHTTPServer: 未启动的服务器
+    """
+    storage_dir = Path(storage_dir)
+    storage_dir.mkdir(parents=True, exist_ok=True)
+    handler = partial(CacheRequestHandler, storage_dir=storage_dir, token=token)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='AI摘要远程缓存参考服务器')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址，默认127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口，默认8765')
+    parser.add_argument('--dir', default='.ai_remote_cache', help='条目保存目录')
+    args = parser.parse_args(argv)
+    
+    token = os.getenv(REMOTE_CACHE_TOKEN_ENV)
+    server = create_server(args.host, args.port, Path(args.dir), token=token)
+    print(f"🌐 远程缓存服务已启动: http://{args.host}:{server.server_port} -> {args.dir}"
+          f"{'（需要令牌）' if token else ''}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""熔断器模块
+
+服务连续失败达到阈值后熔断一段时间，期间直接跳过该服务；
+冷却结束后只放行一个探测请求，成功则恢复，失败则重新熔断。
+"""
+
+import threading
+import time
+from typing import Dict, Any
+
+
+class CircuitBreaker:
+    """单个AI服务的熔断器"""
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0):
+        """初始化熔断器
+        
+        Args:
+            failure_threshold: 触发熔断的连续失败次数
+            cooldown: 熔断持续秒数
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.trip_count = 0
+        self.skipped_count = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """判断是否允许发送请求
+        
+        Returns:
+            bool: True表示允许，False表示熔断中应跳过
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            
+            # 半开状态只放行一个探测请求
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            
+            self.skipped_count += 1
+            return False
+    
+    def record_success(self) -> None:
+        """记录一次成功，恢复为关闭状态"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+    
+    def release_probe(self) -> None:
+        """放弃本次请求的结果，不计为成功或失败
+        
+        用于不能说明服务状态的请求（如被拒绝的批量请求、被取消的对冲请求），
+        半开状态下会放行下一个探测请求。
+        """
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def record_failure(self) -> bool:
+        """记录一次失败（包括超时）
+        
+        Returns:
+            bool: True表示本次失败触发了熔断
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.trip_count += 1
+                return True
+            return False
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """获取熔断器状态快照
+        
+        Returns:
+            dict: 状态、连续失败次数、熔断次数、跳过的请求数
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'trips': self.trip_count,
+                'skipped': self.skipped_count
+            }
@@ -0,0 +1,147 @@
+"""命令行工具
+
+不渲染站点、只填充摘要缓存，CI 可以在单独的并行任务中预热 .ai_cache:
+    mkdocs-ai-summary warm -f mkdocs.yml --workers 8
+
+读取 mkdocs.yml 中 ai-summary 插件的配置，按与构建相同的规则（ContentProcessor 的目录和排除规则）
+遍历 docs_dir，并发生成缺失的摘要。每完成一组页面就提交一次缓存写入，
+中断后重新运行会跳过已经缓存的页面。应在运行 mkdocs build 的同一目录下执行。
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+from .plugin import AISummaryPlugin
+
+
+# 每生成多少个页面提交一次缓存写入
+DEFAULT_CHECKPOINT_SIZE = 50
+
+
+def _find_plugin(config) -> Optional[AISummaryPlugin]:
+    """从 MkDocs 配置中找到 ai-summary 插件实例"""
+    for plugin in config['plugins'].values():
+        if isinstance(plugin, AISummaryPlugin):
+            return plugin
+    return None
+
+
+def warm(config_file: Optional[str] = None, workers: Optional[int] = None,
+         checkpoint_size: int = DEFAULT_CHECKPOINT_SIZE, dry_run: bool = False) -> int:
+    """生成缓存中缺失的摘要
+    
+    Args:
+        config_file: mkdocs.yml 路径，None表示使用当前目录下的配置
+        workers: 并发数，None表示使用插件的 prefetch_workers 配置
+        checkpoint_size: 每生成多少个页面提交一次缓存写入
+        dry_run: 只统计需要生成的页面，不调用AI服务
+    
+    Returns:
+        int: 退出码，有页面生成失败时为1
+    """
+    from mkdocs.config import load_config
+    from mkdocs.structure.files import get_files
+    
+    config = load_config(config_file)
+    plugin = _find_plugin(config)
+    if plugin is None:
+        print("❌ mkdocs.yml 中没有启用 ai-summary 插件")
+        return 1
+    
+    # 预热任务本身就是用来生成摘要的，忽略环境开关和仅缓存模式
+    plugin.config.update({
+        'local_enabled': True,
+        'ci_enabled': True,
+        'ci_cache_only': False,
+        'batch_job_export': '',
+        'batch_job_import': ''
+    })
+    if workers:
+        plugin.config['prefetch_workers'] = workers
+    
+    plugin.on_startup(command='build', dirty=False)
+    plugin.on_config(config)
+    try:
+        if not plugin._service_available:
+            return 1
+        
+        files = get_files(config)
+        eligible_count = sum(
+            1 for file in files.documentation_pages()
+            if plugin.content_processor.should_generate_summary(SimpleNamespace(file=file))
+        )
+        jobs, duplicates = plugin._collect_prefetch_jobs(files)
+        duplicate_count = sum(len(pages) for pages in duplicates.values())
+        print(f"🔥 预热摘要缓存: {eligible_count} 个页面, {len(jobs)} 个需要生成"
+              f"{f'（另有 {duplicate_count} 个内容相同的页面）' if duplicate_count else ''}")
+        if dry_run or not jobs:
+            return 0
+        
+        return _generate(plugin, jobs, duplicates, max(1, checkpoint_size))
+    except KeyboardInterrupt:
+        print("\n⏹️ 已中断，尚未生成摘要")
+        return 130
+    finally:
+        plugin.on_post_build(config)
+
+
+def _generate(plugin: AISummaryPlugin, jobs: list, duplicates: dict, checkpoint_size: int) -> int:
+    """分组生成摘要并在每组完成后提交缓存写入
+    
+    Args:
+        plugin: 已初始化的插件实例
+        jobs: 预取任务列表
+        duplicates: 内容相同的其他页面
+        checkpoint_size: 每组页面数
+    
+    Returns:
+        int: 退出码，有页面生成失败时为1，被中断时为130
+    """
+    started = time.monotonic()
+    done_count = 0
+    failed_count = 0
+    try:
+        for start in range(0, len(jobs), checkpoint_size):
+            for job, summary_result in plugin._generate_jobs(jobs[start:start + checkpoint_size]):
+                done_count += 1
+                if summary_result:
+                    plugin._save_job_result(job, duplicates, summary_result)
+                    print(f"[{done_count}/{len(jobs)}] ✅ {job['src_path']} ({summary_result['service']})")
+                else:
+                    failed_count += 1
+                    print(f"[{done_count}/{len(jobs)}] ❌ {job['src_path']}")
+            plugin.cache_manager.flush()
+            # 预热不渲染页面，无需保留预取结果
+            plugin._prefetched_summaries.clear()
+    except KeyboardInterrupt:
+        # 排队中的页面已取消，中断前完成的摘要在这里提交
+        plugin.cache_manager.flush()
+        print(f"\n⏹️ 已中断: 已保存 {done_count - failed_count} 个摘要，"
+              f"{len(jobs) - done_count} 个页面未完成，重新运行即可继续")
+        return 130
+    
+    elapsed = time.monotonic() - started
+    print(f"🎉 预热完成: 生成 {done_count - failed_count} 个, 失败 {failed_count} 个, 耗时 {elapsed:.1f}s")
+    return 1 if failed_count else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='mkdocs-ai-summary', description='MkDocs AI Summary 命令行工具')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    warm_parser = subparsers.add_parser('warm', help='不构建站点，只生成缓存中缺失的摘要')
+    warm_parser.add_argument('-f', '--config-file', default=None, help='mkdocs.yml 路径')
+    warm_parser.add_argument('-j', '--workers', type=int, default=None,
+                             help='并发数，默认使用插件的 prefetch_workers 配置')
+    warm_parser.add_argument('--checkpoint', type=int, default=DEFAULT_CHECKPOINT_SIZE,
+                             help=f'每生成多少个页面提交一次缓存写入，默认{DEFAULT_CHECKPOINT_SIZE}')
+    warm_parser.add_argument('--dry-run', action='store_true', help='只统计需要生成的页面')
+    
+    args = parser.parse_args(argv)
+    return warm(args.config_file, workers=args.workers, checkpoint_size=args.checkpoint, dry_run=args.dry_run)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -78,13 +78,17 @@ class ConfigManager:
     def should_generate_new_summary(self) -> bool:
         """判断是否应该生成新摘要
         
-        在CI环境中，如果设置为仅缓存模式，则不生成新摘要。
+        在CI环境中，如果设置为仅缓存模式，则不生成新摘要；
+        导出离线批处理请求时也不生成新摘要。
         
         Returns:
             bool: True表示可以生成新摘要，False表示不应生成
         """
         if self.is_ci and self.plugin_config.get('ci_cache_only', False):
             return False
+        # 导出离线批处理请求的构建只收集提示词，不调用AI服务
+        if self.plugin_config.get('batch_job_export'):
+            return False
         return True
     
     def log_environment_status(self, debug: bool = False) -> None:
@@ -4,18 +4,41 @@
 """
 
 import re
-import hashlib
 import yaml
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from mkdocs.structure.pages import Page
 
+from .hashing import DEFAULT_HASH_ALGORITHM, hash_text
+
+
+# YAML front matter，只匹配文档开头
+FRONT_MATTER_PATTERN = re.compile(r'^---.*?---\s*', re.DOTALL)
+
+# 插件自身输出的摘要块
+SUMMARY_BLOCK_PATTERNS = (
+    ('!!! info "📖 阅读信息"', re.compile(r'!!! info "📖 阅读信息".*?(?=\n\n|\n#|\Z)', re.DOTALL)),
+    ('!!! abstract "🤖 AI摘要"', re.compile(r'!!! abstract "🤖 AI摘要".*?(?=\n\n|\n#|\Z)', re.DOTALL)),
+)
+
+# 与 ```.*?```（DOTALL）等价：展开写法让正则引擎按字符集批量跳过，而不是逐字符尝试惰性匹配
+FENCED_CODE_PATTERN = re.compile(r'```[^`]*(?:`(?!``)[^`]*)*```')
+INLINE_CODE_PATTERN = re.compile(r'`[^`]+`')
+IMAGE_PATTERN = re.compile(r'!\[.*?\]\(.*?\)')
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+BLANK_LINES_PATTERN = re.compile(r'\n\s*\n')
+
+# 发送给AI的内容长度上限（字符）
+PROMPT_CONTENT_LENGTH = 2000
+
 
 class ContentProcessor:
     """内容处理器"""
     
     def __init__(self, enabled_folders: List[str], exclude_patterns: List[str], 
                  exclude_files: List[str], summary_language: str, debug: bool = False,
-                 default_enabled_folders: List[str] = None, default_exclude_patterns: List[str] = None):
+                 default_enabled_folders: List[str] = None, default_exclude_patterns: List[str] = None,
+                 hash_algorithm: str = DEFAULT_HASH_ALGORITHM):
         """初始化内容处理器
         
         Args:
@@ -26,11 +49,13 @@ class ContentProcessor:
             debug: 是否启用调试模式
             default_enabled_folders: 默认启用文件夹列表
             default_exclude_patterns: 默认排除模式列表
+            hash_algorithm: 生成文件哈希使用的算法
         """
         # 首先设置基本属性
         self.exclude_files = exclude_files
         self.summary_language = summary_language
         self.debug = debug
+        self.hash_algorithm = hash_algorithm
         
         # 设置默认值
         self.default_enabled_folders = default_enabled_folders or ['docs/']
@@ -173,9 +198,156 @@ class ContentProcessor:
         
         return self.summary_language
     
-    def clean_content_for_ai(self, markdown: str) -> str:
+    def is_regeneration_forced(self, page) -> bool:
+        """页面是否要求内容变化时总是重新生成摘要
+        
+        Front Matter 中设置 ai_summary_regenerate: true 时，不再按改动大小沿用已有摘要。
+        
+        Args:
+            page: MkDocs页面对象
+            
+        Returns:
+            bool: True表示任何内容变化都重新生成
+        """
+        page_meta = getattr(page, 'meta', None) or {}
+        return page_meta.get('ai_summary_regenerate') is True
+    
+    def clean_content_for_ai(self, markdown: str, budget: Optional[int] = None) -> str:
         """清理内容用于AI处理
         
+        与逐条替换的旧实现（_clean_content_legacy）输出逐字节一致，但使用预编译的模式，
+        front matter 只在开头匹配一次，并跳过页面中不存在对应标记的替换。
+        
+        指定 budget 时按段落分块清理，清理结果超过 budget 个字符后即停止，
+        适合只需要开头部分内容的提示词；超出部分不会被处理。某个块末尾有跨越空行、
+        尚未闭合的标记（如多段 HTML 注释、多行标签或链接）时，剩余内容整体清理。
+        
+        Args:
+            markdown: 原始markdown内容
+            budget: 需要的清理后字符数，None表示清理全文
+            
+        Returns:
+            str: 清理后的内容
+        """
+        content = markdown
+        
+        # 移除YAML front matter
+        front_matter = FRONT_MATTER_PATTERN.match(content)
+        if front_matter:
+            content = content[front_matter.end():]
+        
+        if budget is None:
+            return BLANK_LINES_PATTERN.sub('\n\n', self._clean_markup(content)).strip()
+        
+        # 块之间以空行分隔，各块清理后按原样拼接，结果与全文清理的开头部分一致
+        parts = []
+        length = 0
+        blocks = self._iter_raw_blocks(content, max(budget, 1024))
+        for block in blocks:
+            cleaned, unclosed = self._clean_block(block)
+            if unclosed:
+                # 标记延续到下一个块，在此切分会漏掉它，剩余内容整体清理
+                parts.append(self._clean_markup('\n\n'.join([block, *blocks])))
+                break
+            parts.append(cleaned)
+            length += len(parts[-1]) + 2
+            if length > budget:
+                result = BLANK_LINES_PATTERN.sub('\n\n', '\n\n'.join(parts)).strip()
+                if len(result) > budget:
+                    return result
+        return BLANK_LINES_PATTERN.sub('\n\n', '\n\n'.join(parts)).strip()
+    
+    def _iter_raw_blocks(self, content: str, chunk_size: int):
+        """把原始内容切分为可独立清理的块
+        
+        每块至少 chunk_size 个字符，只在代码块之外的空行处切分，
+        保证代码块不会被拆到两个块中。
+        
+        Args:
+            content: 去除 front matter 后的markdown内容
+            chunk_size: 每块的最小字符数
+            
+        Yields:
+            str: 原始内容块
+        """
+        pos = 0
+        while pos < len(content):
+            cut = content.find('\n\n', pos + chunk_size)
+            # 代码块未闭合时，切分点移到代码块结束之后
+            while cut != -1 and content.count('```', pos, cut) % 2:
+                closing = content.find('```', cut)
+                cut = content.find('\n\n', closing + 3) if closing != -1 else -1
+            
+            if cut == -1:
+                yield content[pos:]
+                return
+            yield content[pos:cut]
+            pos = cut + 2
+    
+    def _clean_markup(self, content: str) -> str:
+        """移除不含 front matter 的内容中的摘要块、代码、图片、链接和HTML标签
+        
+        Args:
+            content: markdown内容
+            
+        Returns:
+            str: 移除标记后的内容（未规整空白）
+        """
+        return self._clean_block(content)[0]
+    
+    def _clean_block(self, content: str) -> Tuple[str, bool]:
+        """清理一个内容块，并检查块末尾是否有未闭合的标记
+        
+        代码、链接和HTML标签的模式可以跨越空行。每一步替换后残留未闭合的起始符号
+        （代码块的 ```、块中最后一个未被匹配的反引号、之后没有 ] 的 [ 或之后没有 ) 的 ](、
+        之后没有 > 的 <）时，该标记可能与下一个块中的内容组成匹配，不能在块末尾切分。
+        
+        Args:
+            content: markdown内容块
+            
+        Returns:
+            tuple: (移除标记后的内容, 是否有未闭合的标记)
+        """
+        unclosed = False
+        
+        # 移除已存在的摘要块（匹配止于空行，不会跨块）
+        for marker, pattern in SUMMARY_BLOCK_PATTERNS:
+            if marker in content:
+                content = pattern.sub('', content)
+        
+        # 移除代码块
+        if '```' in content:
+            content = FENCED_CODE_PATTERN.sub('', content)
+            unclosed = '```' in content
+        if '`' in content:
+            # 最后一个反引号之后的内容不受替换影响；它仍在末尾说明没有配对
+            tail = content[content.rfind('`'):]
+            content = INLINE_CODE_PATTERN.sub('', content)
+            unclosed = unclosed or content.endswith(tail)
+        
+        # 移除图片和链接（图片的模式不跨行）
+        if '![' in content:
+            content = IMAGE_PATTERN.sub('', content)
+        if '](' in content:
+            content = LINK_PATTERN.sub(r'\1', content)
+        unclosed = (
+            unclosed
+            or content.rfind('[') > content.rfind(']')
+            or content.rfind('](') > content.rfind(')')
+        )
+        
+        # 移除HTML标签
+        if '<' in content:
+            content = HTML_TAG_PATTERN.sub('', content)
+            unclosed = unclosed or content.rfind('<') > content.rfind('>')
+        
+        return content, unclosed
+    
+    def _clean_content_legacy(self, markdown: str) -> str:
+        """逐条正则替换的清理实现
+        
+        保留作为 clean_content_for_ai 的参照实现，用于测试和基准对比。
+        
         Args:
             markdown: 原始markdown内容
             
@@ -217,13 +389,12 @@ class ContentProcessor:
             language: 语言设置，如果为None则使用默认语言
             
         Returns:
-            str: MD5哈希值（基于文件路径+语言，确保同一文件对应固定缓存）
+            str: 哈希值（基于文件路径+语言，确保同一文件对应固定缓存）
         """
         lang = language or self.summary_language
         # 只基于文件路径和语言生成哈希，确保同一文件始终对应同一个缓存文件
         # 当内容变化时，会覆盖原有缓存而不是创建新文件
-        combined_key = f"{file_path}_{lang}"
-        return hashlib.md5(combined_key.encode('utf-8')).hexdigest()
+        return hash_text(file_path, lang, algorithm=self.hash_algorithm)
     
     def format_summary(self, summary: str, service: str, language: str) -> str:
         """格式化摘要显示
@@ -347,7 +518,7 @@ class ContentProcessor:
         
         return True
     
-    def truncate_content(self, content: str, max_length: int = 2000) -> str:
+    def truncate_content(self, content: str, max_length: int = PROMPT_CONTENT_LENGTH) -> str:
         """截断内容到指定长度
         
         Args:
@@ -0,0 +1,97 @@
+"""哈希模块
+
+为缓存键和内容变化检测提供可选的摘要算法，逐段增量计算，
+不需要先把内容拼接成一个新的字符串。
+"""
+
+import hashlib
+from typing import Any
+
+try:
+    import xxhash
+except ImportError:  # 可选依赖，仅 hash_algorithm: xxhash 需要
+    xxhash = None
+
+
+# 可选的哈希算法
+HASH_ALGORITHMS = ('blake2b', 'xxhash', 'md5')
+
+DEFAULT_HASH_ALGORITHM = 'blake2b'
+
+# 旧版本缓存使用的算法，缓存条目中没有 hash_algorithm 字段时即为该算法
+LEGACY_HASH_ALGORITHM = 'md5'
+
+# 各段之间的分隔符，与旧版本 f"{a}_{b}" 的拼接方式一致，md5 结果保持不变
+_SEPARATOR = b'_'
+
+
+def is_hash_algorithm_available(algorithm: str) -> bool:
+    """判断哈希算法在当前环境是否可用
+    
+    Args:
+        algorithm: 算法名称
+    
+    Returns:
+        bool: 算法有效且依赖已安装时返回True
+    """
+    if algorithm == 'xxhash':
+        return xxhash is not None
+    return algorithm in HASH_ALGORITHMS
+
+
+def resolve_hash_algorithm(algorithm: str) -> str:
+    """检查哈希算法是否可用
+    
+    Args:
+        algorithm: 配置的算法名称
+    
+    Returns:
+        str: 实际使用的算法，xxhash 未安装或名称无效时使用默认算法
+    """
+    if algorithm == 'xxhash' and not is_hash_algorithm_available(algorithm):
+        print("⚠️ 未安装 xxhash，改用 blake2b（pip install \"mkdocs_ai_summary_wcowin[xxhash]\"）")
+        return DEFAULT_HASH_ALGORITHM
+    
+    if algorithm not in HASH_ALGORITHMS:
+        print(f"⚠️ 未知哈希算法 '{algorithm}'，使用 {DEFAULT_HASH_ALGORITHM}")
+        return DEFAULT_HASH_ALGORITHM
+    
+    return algorithm
+
+
+def _new_hasher(algorithm: str) -> Any:
+    """创建哈希对象
+    
+    Args:
+        algorithm: 算法名称
+    
+    Returns:
+        哈希对象，支持 update() 和 hexdigest()
+    """
+    if algorithm == 'blake2b':
+        # 16 字节摘要，与 md5 的十六进制长度相同，缓存文件名长度不变
+        return hashlib.blake2b(digest_size=16)
+    if algorithm == 'xxhash':
+        return xxhash.xxh3_128()
+    return hashlib.md5()
+
+
+def hash_text(*parts: str, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """计算多段文本的哈希
+    
+    各段之间以 "_" 分隔，结果与对 "_".join(parts) 计算哈希相同，
+    但逐段更新，不会复制拼接后的整段内容。
+    
+    Args:
+        *parts: 要计算哈希的文本
+        algorithm: 算法名称
+    
+    Returns:
+        str: 十六进制哈希值
+    """
+    hasher = _new_hasher(algorithm)
+    for index, part in enumerate(parts):
+        if index:
+            hasher.update(_SEPARATOR)
+        hasher.update(part.encode('utf-8'))
+    return hasher.hexdigest()
@@ -3,17 +3,26 @@
 这是插件的核心入口，负责协调各个模块的工作。
 """
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
 from mkdocs.config import config_options
 from mkdocs.plugins import BasePlugin
-from mkdocs.structure.files import File
+from mkdocs.structure.files import File, Files
 from mkdocs.structure.pages import Page
 from mkdocs.config.defaults import MkDocsConfig
 
-from .ai_services import AIServiceManager
-from .cache_manager import CacheManager
-from .content_processor import ContentProcessor
+from .ai_services import AIServiceManager, PROMPT_VERSION
+from .cache_manager import CacheManager, MemoryCache, SourceIndex, CACHE_HIT, CACHE_MISS
+from .content_processor import ContentProcessor, PROMPT_CONTENT_LENGTH
+from .hashing import (
+    HASH_ALGORITHMS, LEGACY_HASH_ALGORITHM, hash_text, is_hash_algorithm_available, resolve_hash_algorithm
+)
 from .config_manager import ConfigManager
+from .remote_cache import RemoteCache
+from .similarity import estimate_similarity, minhash_signature
+from .routing import LatencyRouter
 
 
 class AISummaryPlugin(BasePlugin):
@@ -32,6 +41,19 @@ class AISummaryPlugin(BasePlugin):
         ('cache_enabled', config_options.Type(bool, default=True)),
         ('cache_expire_days', config_options.Type(int, default=30)),
         ('cache_auto_clean', config_options.Type(bool, default=True)),
+        ('cache_backend', config_options.Choice(['json', 'sqlite'], default='json')),
+        ('cache_compression', config_options.Choice(['none', 'zlib'], default='none')),
+        ('cache_clean_limit', config_options.Type(int, default=0)),
+        ('cache_clean_background', config_options.Type(bool, default=True)),
+        ('cache_memory_entries', config_options.Type(int, default=1000)),
+        ('source_stat_check', config_options.Type(bool, default=True)),
+        ('cache_dedup', config_options.Type(bool, default=True)),
+        ('similarity_reuse', config_options.Type(bool, default=False)),
+        ('similarity_threshold', config_options.Type(float, default=0.9)),
+        ('similarity_max_reuses', config_options.Type(int, default=5)),
+        ('remote_cache_url', config_options.Type(str, default='')),
+        ('remote_cache_write', config_options.Type(bool, default=True)),
+        ('remote_cache_timeout', config_options.Type(float, default=5.0)),
         
         # 环境配置
         ('local_enabled', config_options.Type(bool, default=True)),
@@ -52,6 +74,48 @@ class AISummaryPlugin(BasePlugin):
         
         # 缓存清理配置
         ('clear_cache', config_options.Type(bool, default=False)),
+        
+        # 预取配置（在页面渲染前并发生成摘要）
+        ('prefetch_enabled', config_options.Type(bool, default=True)),
+        ('prefetch_workers', config_options.Type(int, default=4)),
+        ('prefetch_engine', config_options.Choice(['thread', 'async'], default='thread')),
+        ('prefetch_max_concurrency', config_options.Type(int, default=64)),
+        ('batch_enabled', config_options.Type(bool, default=False)),
+        ('batch_token_budget', config_options.Type(int, default=4000)),
+        ('batch_max_pages', config_options.Type(int, default=10)),
+        ('batch_max_output_tokens', config_options.Type(int, default=4096)),
+        
+        # 离线批处理配置（导出缓存未命中页面的提示词，导入批处理服务返回的结果）
+        ('batch_job_export', config_options.Type(str, default='')),
+        ('batch_job_import', config_options.Type(str, default='')),
+        
+        # HTTP连接池配置
+        ('http_pool_size', config_options.Type(int, default=10)),
+        ('http_keep_alive', config_options.Type(bool, default=True)),
+        
+        # 限流与重试配置
+        ('rate_limits', config_options.Type(dict, default={})),
+        ('max_retries', config_options.Type(int, default=3)),
+        ('retry_backoff', config_options.Type(float, default=1.0)),
+        
+        # 熔断配置（服务连续失败后暂时跳过）
+        ('breaker_failure_threshold', config_options.Type(int, default=3)),
+        ('breaker_cooldown', config_options.Type(float, default=60.0)),
+        
+        # 路由配置（fixed 按配置顺序，adaptive 按最近延迟和错误率）
+        ('routing_mode', config_options.Choice(['fixed', 'adaptive'], default='fixed')),
+        ('routing_latency_threshold', config_options.Type(float, default=2.0)),
+        
+        # 对冲请求配置（首选服务过慢时同时请求下一个服务）
+        ('hedging_enabled', config_options.Type(bool, default=False)),
+        ('hedge_percentile', config_options.Type(float, default=95.0)),
+        ('hedge_delay', config_options.Type(float, default=5.0)),
+        
+        # 内容清理配置（只清理提示词需要的开头部分）
+        ('budget_clean', config_options.Type(bool, default=True)),
+        
+        # 哈希算法（缓存键和内容变化检测），xxhash 需要安装可选依赖
+        ('hash_algorithm', config_options.Choice(list(HASH_ALGORITHMS), default='blake2b')),
     )
     
     def _discover_docs_structure(self, config: MkDocsConfig) -> List[str]:
@@ -101,6 +165,82 @@ class AISummaryPlugin(BasePlugin):
         
         return result
     
+    def on_startup(self, *, command: str, dirty: bool) -> None:
+        """MkDocs 启动事件
+        
+        定义该方法后，插件对象会在 mkdocs serve 的多次重建之间保持存活，
+        内存缓存因此可以跨重建复用。
+        
+        Args:
+            command: MkDocs 命令（build、gh-deploy、serve）
+            dirty: 是否使用了 --dirty 参数
+        """
+        self._command = command
+    
+    def _get_memory_cache(self) -> Optional[MemoryCache]:
+        """获取跨重建复用的内存缓存
+        
+        Returns:
+            MemoryCache|None: 内存缓存，容量为0时返回None
+        """
+        max_entries = self.config['cache_memory_entries']
+        if max_entries <= 0:
+            return None
+        
+        memory_cache = getattr(self, '_memory_cache', None)
+        if memory_cache is None or memory_cache.max_entries != max_entries:
+            memory_cache = MemoryCache(max_entries)
+            self._memory_cache = memory_cache
+        return memory_cache
+    
+    def _dedup_identity(self) -> Optional[str]:
+        """获取按内容复用摘要时的生成方标识
+        
+        Returns:
+            str|None: 服务、模型和提示词版本组成的标识，关闭 cache_dedup 时返回None
+        """
+        if not self.config['cache_dedup']:
+            return None
+        return f"{self.config['ai_service']}/{self.config['model']}/prompt-v{PROMPT_VERSION}"
+    
+    def _create_remote_cache(self) -> Optional[RemoteCache]:
+        """根据配置创建远程缓存层
+        
+        Returns:
+            RemoteCache|None: 远程缓存客户端，未配置 remote_cache_url 时返回None
+        """
+        url = self.config['remote_cache_url']
+        if not url or not self.config['cache_enabled']:
+            return None
+        
+        if self.config['debug']:
+            print(f"🌐 远程缓存: {url}{'' if self.config['remote_cache_write'] else '（只读）'}")
+        return RemoteCache(
+            url,
+            timeout=self.config['remote_cache_timeout'],
+            write=self.config['remote_cache_write']
+        )
+    
+    def _get_source_index(self, hash_algorithm: str) -> Optional[SourceIndex]:
+        """获取跨重建复用的源文件状态索引
+        
+        Args:
+            hash_algorithm: 当前使用的哈希算法
+            
+        Returns:
+            SourceIndex|None: 源文件索引，未启用 source_stat_check 时返回None
+        """
+        if not self.config['source_stat_check']:
+            return None
+        
+        # 默认语言或哈希算法变化后，文件未变化也需要重新计算哈希
+        fingerprint = (self.config['summary_language'], hash_algorithm)
+        source_index = getattr(self, '_source_index', None)
+        if source_index is None or source_index.fingerprint != fingerprint:
+            source_index = SourceIndex(fingerprint)
+            self._source_index = source_index
+        return source_index
+    
     def on_config(self, config: MkDocsConfig) -> MkDocsConfig:
         """插件配置初始化
         
@@ -113,6 +253,9 @@ class AISummaryPlugin(BasePlugin):
         # 初始化配置管理器
         self.config_manager = ConfigManager(self.config)
         
+        # 预取阶段生成的摘要: file_hash -> (content_hash, summary_result)
+        self._prefetched_summaries: Dict[str, Any] = {}
+        
         # 记录环境状态
         self.config_manager.log_environment_status(debug=self.config['debug'])
         
@@ -120,13 +263,39 @@ class AISummaryPlugin(BasePlugin):
         if not self.config_manager.should_run():
             return config
         
+        hash_algorithm = resolve_hash_algorithm(self.config['hash_algorithm'])
+        
         # 初始化缓存管理器
         self.cache_manager = CacheManager(
             enabled=self.config['cache_enabled'],
             expire_days=self.config['cache_expire_days'],
-            auto_clean=self.config['cache_auto_clean']
+            auto_clean=self.config['cache_auto_clean'],
+            backend=self.config['cache_backend'],
+            clean_limit=self.config['cache_clean_limit'],
+            clean_in_background=self.config['cache_clean_background'],
+            memory_cache=self._get_memory_cache(),
+            hash_algorithm=hash_algorithm,
+            compression=self.config['cache_compression'],
+            remote=self._create_remote_cache(),
+            dedup_identity=self._dedup_identity()
         )
         
+        # 源文件状态索引：文件未变化时复用上次计算的哈希
+        self.source_index = self._get_source_index(hash_algorithm)
+        
+        # 一次读取本 docs 目录的构建清单（源文件状态和按内容查找的索引）；
+        # mkdocs serve 重建时索引仍在内存中，只在首次构建时从清单恢复；
+        # 清单中的路径相对 docs 目录保存，不包含本机路径
+        self._docs_dir = config['docs_dir']
+        manifest_sources = self.cache_manager.load_manifest(
+            scope=self.cache_manager.manifest_scope(config['docs_dir'])
+        )
+        if self.source_index is not None:
+            self.source_index.begin_build()
+            if not len(self.source_index) and self.source_index.load(manifest_sources, base=self._docs_dir):
+                if self.config['debug']:
+                    print(f"📋 已加载构建清单 ({len(self.source_index)} 个页面)")
+        
         # 检查是否需要清理所有缓存
         if self.config['clear_cache']:
             if self.config['debug']:
@@ -140,9 +309,28 @@ class AISummaryPlugin(BasePlugin):
             custom_services=self.config['custom_services'],
             model=self.config['model'],
             max_tokens=self.config['max_tokens'],
-            temperature=self.config['temperature']
+            temperature=self.config['temperature'],
+            pool_size=self.config['http_pool_size'],
+            keep_alive=self.config['http_keep_alive'],
+            rate_limits=self.config['rate_limits'],
+            max_retries=self.config['max_retries'],
+            retry_backoff=self.config['retry_backoff'],
+            breaker_threshold=self.config['breaker_failure_threshold'],
+            breaker_cooldown=self.config['breaker_cooldown'],
+            routing_mode=self.config['routing_mode'],
+            routing_latency_threshold=self.config['routing_latency_threshold'],
+            hedging_enabled=self.config['hedging_enabled'],
+            hedge_percentile=self.config['hedge_percentile'],
+            hedge_delay=self.config['hedge_delay'],
+            batch_max_output_tokens=self.config['batch_max_output_tokens']
         )
         
+        # 加载上次构建保存的服务延迟统计，使路由在启动时即可使用
+        routing_stats_path = self._routing_stats_path()
+        if routing_stats_path and self.ai_service_manager.router.load(routing_stats_path):
+            if self.config['debug']:
+                print("📈 已加载服务延迟统计")
+        
         # 验证AI服务配置
         if not self.ai_service_manager.validate_service_config(debug=self.config['debug']):
             print("⚠️ AI服务配置验证失败，插件将不会生成摘要")
@@ -161,7 +349,8 @@ class AISummaryPlugin(BasePlugin):
             summary_language=self.config['summary_language'],
             debug=self.config['debug'],
             default_enabled_folders=discovered_docs_structure,
-            default_exclude_patterns=['tag.md']
+            default_exclude_patterns=['tag.md'],
+            hash_algorithm=hash_algorithm
         )
         
         # 检查服务配置变更
@@ -176,6 +365,607 @@ class AISummaryPlugin(BasePlugin):
         
         return config
     
+    def on_files(self, files: Files, config: MkDocsConfig) -> Files:
+        """在页面渲染前预取所有缺失的摘要
+        
+        Args:
+            files: 文件集合
+            config: MkDocs配置对象
+            
+        Returns:
+            Files: 原样返回的文件集合
+        """
+        if self.config['batch_job_import'] or self.config['batch_job_export']:
+            self._run_batch_job(files)
+        
+        if not self._should_prefetch():
+            return files
+        
+        try:
+            self._prefetch_summaries(files)
+        except Exception as e:
+            # 预取失败不影响构建，on_page_markdown 会按原流程逐页生成
+            if self.config['debug']:
+                print(f"⚠️ 预取失败: {str(e)[:50]}...")
+        
+        return files
+    
+    def _should_prefetch(self) -> bool:
+        """判断是否应该运行预取阶段
+        
+        Returns:
+            bool: True表示应该预取
+        """
+        if not hasattr(self, 'config_manager') or not self.config_manager.should_run():
+            return False
+        if not self.config['prefetch_enabled'] or self.config['prefetch_workers'] < 1:
+            return False
+        if not getattr(self, '_service_available', False):
+            return False
+        return self.config_manager.should_generate_new_summary()
+    
+    def _prefetch_summaries(self, files: Files) -> None:
+        """找出所有缓存未命中的页面，并通过有界线程池并发生成摘要
+        
+        Args:
+            files: 文件集合
+        """
+        jobs, duplicates = self._collect_prefetch_jobs(files)
+        if not jobs:
+            return
+        
+        duplicate_count = sum(len(pages) for pages in duplicates.values())
+        if duplicate_count and self.config['debug']:
+            print(f"♻️ {duplicate_count} 个页面与其他页面内容相同，复用同一次生成")
+        
+        try:
+            for job, summary_result in self._generate_jobs(jobs):
+                if summary_result:
+                    self._save_job_result(job, duplicates, summary_result)
+        except KeyboardInterrupt:
+            # 构建被中断时不会执行 on_post_build，先提交已保存的摘要
+            self.cache_manager.flush()
+            raise
+    
+    def _generate_jobs(self, jobs: List[Dict[str, Any]]):
+        """按配置的方式（批量提示词、asyncio 引擎或线程池）生成预取任务的摘要
+        
+        Args:
+            jobs: 预取任务列表
+            
+        Returns:
+            iterable: (job, summary_result)，失败时 summary_result 为None
+        """
+        if self.config['batch_enabled']:
+            return self._prefetch_with_batches(jobs)
+        if self.config['prefetch_engine'] == 'async':
+            return self._prefetch_with_asyncio(jobs)
+        return self._prefetch_with_threads(jobs)
+    
+    def _collect_prefetch_jobs(self, files: Files):
+        """找出所有缓存未命中的页面
+        
+        Args:
+            files: 文件集合
+            
+        Returns:
+            tuple: (jobs, duplicates)，duplicates 按内容哈希记录与 jobs 中页面内容相同的其他页面
+        """
+        # 内容相同的页面（如多版本文档中未变化的页面）只生成一次
+        jobs = []
+        duplicates: Dict[str, List[Dict[str, Any]]] = {}
+        for file in files.documentation_pages():
+            job = self._build_prefetch_job(file)
+            if not job:
+                continue
+            if self.cache_manager.dedup_identity is not None and job['content_hash'] in duplicates:
+                duplicates[job['content_hash']].append(job)
+                continue
+            duplicates[job['content_hash']] = []
+            jobs.append(job)
+        return jobs, duplicates
+    
+    def _save_job_result(self, job: Dict[str, Any], duplicates: Dict[str, List[Dict[str, Any]]],
+                         summary_result: Dict[str, Any]) -> None:
+        """保存预取任务的摘要，内容相同的页面一并保存
+        
+        Args:
+            job: 预取任务
+            duplicates: _collect_prefetch_jobs 返回的重复页面
+            summary_result: 摘要结果
+        """
+        for page_job in [job] + duplicates[job['content_hash']]:
+            self._prefetched_summaries[page_job['file_hash']] = (page_job['content_hash'], summary_result)
+            self.cache_manager.save_summary_cache(
+                page_job['file_hash'],
+                self._new_cache_entry(summary_result, page_job['title'], job['cleaned_content']),
+                page_job['content_hash']
+            )
+    
+    def _run_batch_job(self, files: Files) -> None:
+        """导入离线批处理结果，并导出仍然缺失的页面的批处理请求
+        
+        Args:
+            files: 文件集合
+        """
+        if not hasattr(self, 'config_manager') or not self.config_manager.should_run():
+            return
+        
+        try:
+            if self.config['batch_job_import']:
+                self._import_batch_results(files, Path(self.config['batch_job_import']))
+            if self.config['batch_job_export']:
+                self._export_batch_requests(files, Path(self.config['batch_job_export']))
+        except Exception as e:
+            # 批处理失败不影响构建
+            print(f"⚠️ 离线批处理失败: {str(e)[:80]}")
+    
+    def _export_batch_requests(self, files: Files, path: Path) -> None:
+        """把所有缓存未命中页面的提示词写入批处理请求文件
+        
+        Args:
+            files: 文件集合
+            path: 请求文件路径
+        """
+        from .batch_jobs import batch_custom_id, write_batch_requests
+        
+        jobs, _ = self._collect_prefetch_jobs(files)
+        count = write_batch_requests(path, (
+            self.ai_service_manager.build_batch_request(
+                batch_custom_id(job['file_hash'], job['content_hash']),
+                self.content_processor.truncate_content(job['cleaned_content']),
+                job['title'], job['language']
+            )
+            for job in jobs
+        ))
+        print(f"📤 已导出 {count} 个页面的批处理请求: {path}")
+    
+    def _import_batch_results(self, files: Files, path: Path) -> None:
+        """把批处理结果按 file_hash/content_hash 写入缓存
+        
+        导出后内容发生变化的页面哈希不同，对应的结果会被忽略。
+        
+        Args:
+            files: 文件集合
+            path: 结果文件路径
+        """
+        from .batch_jobs import batch_custom_id, read_batch_results
+        
+        results = read_batch_results(path)
+        if not results:
+            print(f"⚠️ 批处理结果为空: {path}")
+            return
+        
+        jobs, duplicates = self._collect_prefetch_jobs(files)
+        imported_count = 0
+        for job in jobs:
+            summary = results.get(batch_custom_id(job['file_hash'], job['content_hash']))
+            if not summary or not self.content_processor.validate_summary_content(summary):
+                continue
+            self._save_job_result(job, duplicates, {'summary': summary, 'service': self.config['ai_service']})
+            imported_count += 1
+        print(f"📥 已导入 {imported_count} 个页面的批处理结果 (共 {len(results)} 条): {path}")
+    
+    def _prefetch_with_threads(self, jobs: List[Dict[str, Any]]):
+        """通过有界线程池生成预取摘要
+        
+        Args:
+            jobs: 预取任务列表
+            
+        Yields:
+            tuple: (job, summary_result)，失败时 summary_result 为None
+        
+        被 Ctrl-C 中断时取消排队中的任务、不等待进行中的请求，
+        先产出已经完成但尚未产出的结果，再重新抛出 KeyboardInterrupt。
+        """
+        def result_of(future):
+            try:
+                return future.result()
+            except Exception:
+                return None
+        
+        workers = min(self.config['prefetch_workers'], len(jobs))
+        if self.config['debug']:
+            print(f"🚀 预取摘要: {len(jobs)} 个页面, {workers} 个线程")
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {
+            executor.submit(
+                self._generate_summary_result,
+                job['cleaned_content'], job['title'], job['language']
+            ): job
+            for job in jobs
+        }
+        pending = set(futures)
+        
+        def stop():
+            # 等价于 shutdown(wait=False, cancel_futures=True)，兼容 Python 3.8
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        try:
+            for future in as_completed(futures):
+                pending.discard(future)
+                yield futures[future], result_of(future)
+        except KeyboardInterrupt:
+            stop()
+            for future in [future for future in pending if future.done() and not future.cancelled()]:
+                yield futures[future], result_of(future)
+            raise
+        finally:
+            # 调用方提前停止迭代时同样不等待排队中的任务
+            stop()
+    
+    def _prefetch_with_batches(self, jobs: List[Dict[str, Any]]):
+        """把多个短页面合并为批量请求生成预取摘要
+        
+        Args:
+            jobs: 预取任务列表
+        
+        Returns:
+            list: (job, summary_result) 列表，失败时 summary_result 为None
+        """
+        requests_batch = [
+            {
+                'content': self.content_processor.truncate_content(job['cleaned_content']),
+                'title': job['title'],
+                'language': job['language']
+            }
+            for job in jobs
+        ]
+        results = self.ai_service_manager.generate_summaries_batched(
+            requests_batch,
+            token_budget=self.config['batch_token_budget'],
+            max_pages=self.config['batch_max_pages'],
+            validate=self.content_processor.validate_summary_content,
+            max_workers=self.config['prefetch_workers'],
+            debug=self.config['debug']
+        )
+        return list(zip(jobs, results))
+    
+    def _prefetch_with_asyncio(self, jobs: List[Dict[str, Any]]):
+        """通过 asyncio 引擎并发生成预取摘要，不可用时退回线程池
+        
+        Args:
+            jobs: 预取任务列表
+            
+        Returns:
+            list|generator: (job, summary_result) 序列
+        """
+        import asyncio
+        
+        from .async_ai_services import AsyncAIServiceManager
+        
+        try:
+            async_manager = AsyncAIServiceManager.from_manager(
+                self.ai_service_manager, max_concurrency=self.config['prefetch_max_concurrency']
+            )
+        except ImportError as e:
+            print(f"⚠️ {e}，改用线程池预取")
+            return self._prefetch_with_threads(jobs)
+        
+        if self.config['debug']:
+            print(f"🚀 预取摘要: {len(jobs)} 个页面, asyncio 并发上限 {async_manager.max_concurrency}/服务")
+        
+        requests_batch = [
+            {
+                'content': self.content_processor.truncate_content(job['cleaned_content']),
+                'title': job['title'],
+                'language': job['language']
+            }
+            for job in jobs
+        ]
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            # 已经处于运行中的事件循环内（例如被其他工具嵌入调用）
+            return self._prefetch_with_threads(jobs)
+        
+        summary_results = asyncio.run(
+            async_manager.generate_summaries(requests_batch, debug=self.config['debug'])
+        )
+        
+        results = []
+        for job, summary_result in zip(jobs, summary_results):
+            if summary_result and not self.content_processor.validate_summary_content(summary_result['summary']):
+                summary_result = None
+            results.append((job, summary_result))
+        return results
+    
+    def _build_prefetch_job(self, file: File) -> Optional[Dict[str, Any]]:
+        """读取源文件并为缓存未命中的页面构建预取任务
+        
+        Args:
+            file: MkDocs文件对象
+            
+        Returns:
+            dict|None: 预取任务，页面无需生成摘要时返回None
+        """
+        from mkdocs.utils import meta as meta_utils
+        
+        # 读取源文件前先按路径过滤，避免读取不相关的页面
+        if not self.content_processor.should_generate_summary(SimpleNamespace(file=file)):
+            return None
+        
+        # 文件状态未变化且缓存有效时无需读取文件
+        stat = SourceIndex.stat(file.abs_src_path) if self.source_index is not None else None
+        indexed = self.source_index.get(file.abs_src_path, stat) if stat else None
+        if indexed and self.cache_manager.lookup(indexed[0], indexed[1])[0] == CACHE_HIT:
+            return None
+        
+        try:
+            with open(file.abs_src_path, 'r', encoding='utf-8-sig') as f:
+                source = f.read()
+        except (OSError, ValueError):
+            return None
+        
+        markdown, page_meta = meta_utils.get_data(source)
+        page_view = SimpleNamespace(file=file, meta=page_meta)
+        page_language = self.content_processor.get_page_language(page_view)
+        file_hash, content_hash = self._compute_hashes(str(file.src_path), markdown, page_language)
+        if stat:
+            self.source_index.put(file.abs_src_path, stat, file_hash, content_hash, page_language)
+        
+        cache_status, _ = self._lookup_cache(
+            str(file.src_path), file_hash, content_hash, markdown, page_language,
+            force_regenerate=self.content_processor.is_regeneration_forced(page_view)
+        )
+        if cache_status == CACHE_HIT:
+            return None
+        
+        return {
+            'src_path': str(file.src_path),
+            'file_hash': file_hash,
+            'content_hash': content_hash,
+            'cleaned_content': self._clean_content(markdown),
+            'title': self._guess_page_title(file, markdown, page_meta),
+            'language': page_language
+        }
+    
+    def _guess_page_title(self, file: File, markdown: str, page_meta: Dict[str, Any]) -> str:
+        """在页面对象可用前推断页面标题（与 MkDocs 的规则保持一致）
+        
+        Args:
+            file: MkDocs文件对象
+            markdown: 去除 front matter 后的 markdown 内容
+            page_meta: 页面 front matter
+            
+        Returns:
+            str: 页面标题
+        """
+        import re
+        
+        if page_meta.get('title'):
+            return str(page_meta['title'])
+        
+        heading = re.search(r'^#\s+(.+?)\s*#*\s*$', markdown, re.MULTILINE)
+        if heading:
+            return heading.group(1)
+        
+        title = file.name.replace('-', ' ').replace('_', ' ')
+        return title.capitalize() if title.lower() == title else title
+    
+    def _compute_hashes(self, file_path: str, markdown: str, page_language: str) -> tuple:
+        """生成缓存使用的文件哈希与内容哈希
+        
+        Args:
+            file_path: 页面源文件路径
+            markdown: 页面原始markdown内容（不含 front matter）
+            page_language: 页面语言
+            
+        Returns:
+            tuple: (file_hash, content_hash)
+        """
+        # 文件哈希基于路径+语言，用于缓存文件名
+        file_hash = self.content_processor.get_content_hash(file_path, "", page_language)
+        # 内容哈希基于原始内容，检测变化时无需先清理全文
+        content_hash = hash_text(markdown, page_language, algorithm=self.content_processor.hash_algorithm)
+        return file_hash, content_hash
+    
+    def _page_hashes(self, page: Page, markdown: str, page_language: str) -> tuple:
+        """获取页面的文件哈希与内容哈希，源文件未变化时直接使用索引中的记录
+        
+        Args:
+            page: MkDocs页面对象
+            markdown: 页面markdown内容
+            page_language: 页面语言
+            
+        Returns:
+            tuple: (file_hash, content_hash)
+        """
+        src_path = str(page.file.src_path)
+        # 索引按源文件绝对路径记录，共享 .ai_cache 的多个 docs 目录中相同的相对路径不会混淆
+        abs_src_path = page.file.abs_src_path
+        stat = None
+        if self.source_index is not None:
+            # 预取阶段已确认未变化的文件无需再次读取文件状态
+            indexed = self.source_index.get_verified(abs_src_path)
+            if indexed is None:
+                stat = SourceIndex.stat(abs_src_path)
+                indexed = self.source_index.get(abs_src_path, stat)
+            if indexed and indexed[2] == page_language:
+                return indexed[0], indexed[1]
+            if stat is None:
+                stat = SourceIndex.stat(abs_src_path)
+        
+        file_hash, content_hash = self._compute_hashes(src_path, markdown, page_language)
+        if stat:
+            self.source_index.put(abs_src_path, stat, file_hash, content_hash, page_language)
+        return file_hash, content_hash
+    
+    def _clean_content(self, markdown: str) -> str:
+        """清理页面内容用于生成摘要
+        
+        Args:
+            markdown: 页面markdown内容
+            
+        Returns:
+            str: 清理后的内容，启用 budget_clean 时只包含提示词需要的开头部分
+        """
+        budget = PROMPT_CONTENT_LENGTH if self.config['budget_clean'] else None
+        return self.content_processor.clean_content_for_ai(markdown, budget=budget)
+    
+    def _lookup_cache(self, file_path: str, file_hash: str, content_hash: str,
+                      markdown: str, page_language: str, force_regenerate: bool = False) -> tuple:
+        """查询缓存，并兼容旧版本或其他哈希算法保存的缓存
+        
+        当前键下没有条目时，再按其他哈希算法（包括旧版本的 md5）计算的键查找；
+        找到的条目内容未变化时视为命中，并改用当前的键和内容哈希保存。
+        启用 similarity_reuse 时，内容改动小于阈值的条目同样视为命中。
+        
+        Args:
+            file_path: 页面源文件路径
+            file_hash: 文件哈希
+            content_hash: 基于原始内容的内容哈希
+            markdown: 页面markdown内容
+            page_language: 页面语言
+            force_regenerate: 内容变化时总是重新生成（Front Matter ai_summary_regenerate）
+            
+        Returns:
+            tuple: (status, cache_data)，与 CacheManager.lookup 相同
+        """
+        cache_status, cache_data = self.cache_manager.lookup(file_hash, content_hash)
+        if cache_status == CACHE_HIT:
+            return cache_status, cache_data
+        
+        cache_key = file_hash
+        if cache_status == CACHE_MISS:
+            for algorithm in HASH_ALGORITHMS:
+                if algorithm == self.content_processor.hash_algorithm or not is_hash_algorithm_available(algorithm):
+                    continue
+                cache_key = hash_text(file_path, page_language, algorithm=algorithm)
+                # 内容哈希传空字符串，只读取条目，由下面按条目自己的算法比较
+                _, cache_data = self.cache_manager.lookup(cache_key, '')
+                if cache_data is not None:
+                    break
+            else:
+                return cache_status, None
+        
+        minor_change = False
+        if not self._is_cached_content_current(cache_data, markdown, page_language):
+            if cache_key != file_hash or force_regenerate or not self._is_minor_change(cache_data, markdown):
+                return cache_status, cache_data
+            minor_change = True
+        
+        reused_entry = {
+            'summary': cache_data['summary'],
+            'service': cache_data.get('service'),
+            'page_title': cache_data.get('page_title')
+        }
+        # 保留生成摘要时的签名，连续的小改动累计超过阈值后仍会重新生成
+        if cache_data.get('minhash'):
+            reused_entry['minhash'] = cache_data['minhash']
+        reuse_count = cache_data.get('reuse_count', 0) + (1 if minor_change else 0)
+        if reuse_count:
+            reused_entry['reuse_count'] = reuse_count
+        self.cache_manager.save_summary_cache(file_hash, reused_entry, content_hash)
+        if cache_key != file_hash:
+            self.cache_manager.delete_summary_cache(cache_key)
+        return CACHE_HIT, cache_data
+    
+    def _is_minor_change(self, cache_data: Dict[str, Any], markdown: str) -> bool:
+        """按变化显著性策略判断是否可以继续使用已有摘要
+        
+        改动需同时满足：与生成摘要时的提示词内容足够相似，且此前沿用的次数
+        未达到 similarity_max_reuses（0 表示不限制）。
+        
+        Args:
+            cache_data: 内容已变化的缓存条目
+            markdown: 页面markdown内容
+            
+        Returns:
+            bool: True表示改动不显著，沿用已有摘要
+        """
+        if not self.config['similarity_reuse'] or not cache_data.get('minhash'):
+            return False
+        
+        max_reuses = self.config['similarity_max_reuses']
+        if max_reuses and cache_data.get('reuse_count', 0) >= max_reuses:
+            if self.config['debug']:
+                print(f"🔄 已连续 {max_reuses} 次沿用摘要，重新生成")
+            return False
+        
+        signature = minhash_signature(self.content_processor.truncate_content(self._clean_content(markdown)))
+        similarity = estimate_similarity(cache_data['minhash'], signature)
+        if similarity < self.config['similarity_threshold']:
+            return False
+        
+        if self.config['debug']:
+            print(f"🔁 内容改动较小 (相似度 {similarity:.2f})，沿用已有摘要")
+        return True
+    
+    def _new_cache_entry(self, summary_result: Dict[str, Any], title: str, cleaned_content: str) -> Dict[str, Any]:
+        """构建新生成摘要的缓存条目
+        
+        Args:
+            summary_result: 摘要结果
+            title: 页面标题
+            cleaned_content: 生成摘要时使用的清理后内容
+            
+        Returns:
+            dict: 缓存条目
+        """
+        entry = {
+            'summary': summary_result['summary'],
+            'service': summary_result['service'],
+            'page_title': title
+        }
+        if self.config['similarity_reuse']:
+            entry['minhash'] = minhash_signature(self.content_processor.truncate_content(cleaned_content))
+        return entry
+    
+    def _is_cached_content_current(self, cache_data: Dict[str, Any], markdown: str, page_language: str) -> bool:
+        """按缓存条目自己的哈希算法判断内容是否未变化
+        
+        Args:
+            cache_data: 缓存条目
+            markdown: 页面markdown内容
+            page_language: 页面语言
+            
+        Returns:
+            bool: 条目对应的内容与当前内容一致时返回True
+        """
+        cached_hash = cache_data.get('content_hash')
+        algorithm = cache_data.get('hash_algorithm', LEGACY_HASH_ALGORITHM)
+        
+        # 条目使用的算法在当前环境不可用时（如未安装 xxhash）无法比较
+        if algorithm != self.content_processor.hash_algorithm and is_hash_algorithm_available(algorithm):
+            if cached_hash == hash_text(markdown, page_language, algorithm=algorithm):
+                return True
+        
+        if algorithm != LEGACY_HASH_ALGORITHM or 'hash_algorithm' in cache_data:
+            return False
+        
+        # 1.3.0 及更早版本的内容哈希基于清理后的全文
+        cleaned_content = self.content_processor.clean_content_for_ai(markdown)
+        return cached_hash == hash_text(cleaned_content, page_language, algorithm=LEGACY_HASH_ALGORITHM)
+    
+    def _generate_summary_result(self, cleaned_content: str, title: str, page_language: str) -> Optional[Dict[str, Any]]:
+        """调用AI服务生成摘要并校验结果
+        
+        Args:
+            cleaned_content: 清理后的内容
+            title: 页面标题
+            page_language: 页面语言
+            
+        Returns:
+            dict|None: 通过校验的摘要结果，失败时返回None
+        """
+        # 截断内容以避免过长
+        truncated_content = self.content_processor.truncate_content(cleaned_content)
+        
+        # AI服务管理器会自动尝试所有可用的服务（包括fallback）
+        summary_result = self.ai_service_manager.generate_summary(
+            truncated_content, title, page_language, debug=self.config['debug']
+        )
+        
+        if summary_result and self.content_processor.validate_summary_content(summary_result['summary']):
+            return summary_result
+        return None
+    
     def on_page_markdown(self, markdown: str, page: Page, config: MkDocsConfig, files) -> str:
         """处理页面markdown内容，生成AI摘要
         
@@ -215,23 +1005,16 @@ class AISummaryPlugin(BasePlugin):
             if not self.config['debug']:
                 page_language = self.content_processor.get_page_language(page)
             
-            # 清理内容并生成哈希
-            cleaned_content = self.content_processor.clean_content_for_ai(markdown)
-            # 生成文件哈希（基于路径+语言，用于缓存文件名）
-            file_hash = self.content_processor.get_content_hash(file_path, "", page_language)
-            # 生成内容哈希（基于实际内容，用于检测变化）
-            import hashlib
-            content_hash = hashlib.md5(f"{cleaned_content}_{page_language}".encode('utf-8')).hexdigest()
+            # 基于原始内容生成哈希，只有需要调用AI时才清理内容；源文件未变化时不再计算哈希
+            file_hash, content_hash = self._page_hashes(page, markdown, page_language)
             
-            # 检查内容是否发生变化
-            content_changed = self.cache_manager.is_content_changed(file_hash, content_hash)
-            
-            # 尝试从缓存获取摘要（只有在内容未变化时才使用缓存）
-            cached_summary = None
-            if not content_changed:
-                cached_summary = self.cache_manager.get_cached_summary(file_hash)
+            # 一次读取完成内容变化检测和缓存读取（只有在内容未变化时才使用缓存）
+            cache_status, cached_summary = self._lookup_cache(
+                file_path, file_hash, content_hash, markdown, page_language,
+                force_regenerate=self.content_processor.is_regeneration_forced(page)
+            )
             
-            if cached_summary and not content_changed:
+            if cache_status == CACHE_HIT:
                 summary_text = cached_summary['summary']
                 service_used = cached_summary['service']
                 if self.config['debug']:
@@ -250,31 +1033,36 @@ class AISummaryPlugin(BasePlugin):
                     else:
                         return markdown
                 else:
-                    # 调用AI服务生成摘要
-                    if self.config['debug']:
-                        print(f"🤖 生成中... ({page_language})")
-                    
-                    # 截断内容以避免过长
-                    truncated_content = self.content_processor.truncate_content(cleaned_content)
-                    
-                    # AI服务管理器会自动尝试所有可用的服务（包括fallback）
-                    summary_result = self.ai_service_manager.generate_summary(
-                        truncated_content, page.title, page_language, debug=self.config['debug']
-                    )
+                    # 优先使用预取阶段已经生成的摘要
+                    prefetched = self._prefetched_summaries.pop(file_hash, None)
+                    if prefetched and prefetched[0] == content_hash:
+                        summary_result = prefetched[1]
+                        if self.config['debug']:
+                            print(f"⚡ 预取命中 ({summary_result['service']})")
+                    else:
+                        # 调用AI服务生成摘要
+                        if self.config['debug']:
+                            print(f"🤖 生成中... ({page_language})")
+                        
+                        cleaned_content = self._clean_content(markdown)
+                        summary_result = self._generate_summary_result(
+                            cleaned_content, page.title, page_language
+                        )
+                        
+                        if summary_result:
+                            # 保存到缓存
+                            self.cache_manager.save_summary_cache(
+                                file_hash,
+                                self._new_cache_entry(summary_result, page.title, cleaned_content),
+                                content_hash
+                            )
                     
-                    if summary_result and self.content_processor.validate_summary_content(summary_result['summary']):
+                    if summary_result:
                         summary_text = summary_result['summary']
                         service_used = summary_result['service']
                         
                         if self.config['debug']:
                             print(f"✅ 生成完成 ({service_used})")
-                        
-                        # 保存到缓存
-                        self.cache_manager.save_summary_cache(file_hash, {
-                            'summary': summary_text,
-                            'service': service_used,
-                            'page_title': page.title
-                        }, content_hash)
                     else:
                         # 所有AI服务都失败了，使用备用摘要
                         if self.config_manager.get_fallback_enabled():
@@ -321,6 +1109,31 @@ class AISummaryPlugin(BasePlugin):
             
             return markdown
     
+    def _routing_stats_path(self) -> Optional[Path]:
+        """获取服务延迟统计文件路径
+        
+        Returns:
+            Path|None: 统计文件路径，未启用缓存时返回None
+        """
+        if not hasattr(self, 'cache_manager') or not self.cache_manager.enabled:
+            return None
+        return self.cache_manager.cache_dir / LatencyRouter.STATS_FILE
+    
+    def _format_breaker_stats(self) -> str:
+        """汇总本次构建中触发过熔断的服务
+        
+        Returns:
+            str: 例如 "glm(open, 熔断1次, 跳过42次)"，没有触发熔断时返回空字符串
+        """
+        if not hasattr(self, 'ai_service_manager'):
+            return ''
+        
+        parts = []
+        for name, state in self.ai_service_manager.get_breaker_states().items():
+            if state['trips']:
+                parts.append(f"{name}({state['state']}, 熔断{state['trips']}次, 跳过{state['skipped']}次)")
+        return ', '.join(parts)
+    
     def on_post_build(self, config: MkDocsConfig) -> None:
         """构建完成后的清理工作
         
@@ -328,6 +1141,21 @@ class AISummaryPlugin(BasePlugin):
             config: MkDocs配置对象
         """
         if hasattr(self, 'config_manager') and self.config_manager.should_run():
+            if hasattr(self, 'ai_service_manager'):
+                # 关闭HTTP会话，释放连接池
+                self.ai_service_manager.close()
+                
+                # 保存服务延迟统计，供下次构建路由使用
+                routing_stats_path = self._routing_stats_path()
+                if routing_stats_path and self.ai_service_manager.router.snapshot():
+                    try:
+                        self.ai_service_manager.router.save(routing_stats_path)
+                    except Exception as e:
+                        if self.config['debug']:
+                            print(f"⚠️ 保存服务延迟统计失败: {e}")
+            
+            breaker_stats = self._format_breaker_stats()
+            
             if self.config['debug']:
                 # 显示统计信息
                 stats = []
@@ -336,9 +1164,27 @@ class AISummaryPlugin(BasePlugin):
                     stats.append(f"服务: {', '.join(available_services)}")
                 
                 if hasattr(self, 'cache_manager') and self.cache_manager.enabled:
-                    cache_files = list(self.cache_manager.cache_dir.glob("*.json"))
-                    cache_count = len([f for f in cache_files if f.name != "service_config.json"])
-                    stats.append(f"缓存: {cache_count}")
+                    stats.append(f"缓存: {self.cache_manager.count_entries()}")
+                    if self.cache_manager.dedup_hits:
+                        stats.append(f"按内容复用: {self.cache_manager.dedup_hits}")
+                    remote = self.cache_manager.remote
+                    if remote is not None:
+                        stats.append(f"远程缓存: 命中 {remote.hits} / 未命中 {remote.misses}")
+                
+                if breaker_stats:
+                    stats.append(f"熔断: {breaker_stats}")
                 
                 print(f"\n🎉 构建完成 | {' | '.join(stats)}")
-                print()  # 添加空行分隔
\ No newline at end of file
+                print()  # 添加空行分隔
+            elif breaker_stats:
+                print(f"⚡ 本次构建触发熔断: {breaker_stats}")
+            
+            if hasattr(self, 'cache_manager'):
+                # 保存构建清单，内容无变化时不写入
+                source_index = getattr(self, 'source_index', None)
+                self.cache_manager.save_manifest(
+                    source_index.to_dict(base=self._docs_dir) if source_index is not None else None
+                )
+                
+                # 批量提交缓存写入并释放存储句柄
+                self.cache_manager.close()
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""限流器模块
+
+为每个AI服务提供按请求数/分钟和token数/分钟计算的令牌桶限流，
+以及 Retry-After 解析和带抖动的指数退避。
+"""
+
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """令牌桶
+    
+    令牌按每分钟的配额匀速补充，允许预支为负数，预支部分转换为等待时间。
+    """
+    
+    def __init__(self, per_minute: float):
+        """初始化令牌桶
+        
+        Args:
+            per_minute: 每分钟补充的令牌数，同时作为桶容量
+        """
+        self.capacity = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+    
+    def reserve(self, amount: float, now: float) -> float:
+        """预留令牌
+        
+        Args:
+            amount: 需要的令牌数
+            now: 当前单调时间
+        
+        Returns:
+            float: 需要等待的秒数
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        # 单次请求超过桶容量时按容量计算，避免永远无法满足
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """单个AI服务的限流器"""
+    
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        """初始化限流器
+        
+        Args:
+            rpm: 每分钟最大请求数，None表示不限制
+            tpm: 每分钟最大token数，None表示不限制
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._request_bucket = TokenBucket(rpm) if rpm else None
+        self._token_bucket = TokenBucket(tpm) if tpm else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def reserve(self, tokens: int = 0) -> float:
+        """为一次请求预留配额，不阻塞
+        
+        Args:
+            tokens: 本次请求预计消耗的token数
+        
+        Returns:
+            float: 发送请求前需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self._request_bucket:
+                wait = max(wait, self._request_bucket.reserve(1, now))
+            if self._token_bucket and tokens:
+                wait = max(wait, self._token_bucket.reserve(tokens, now))
+            return wait
+    
+    def acquire(self, tokens: int = 0) -> None:
+        """预留配额并在需要时阻塞等待
+        
+        Args:
+            tokens: 本次请求预计消耗的token数
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+    
+    def pause(self, seconds: float) -> None:
+        """在服务返回限流响应后暂停所有后续请求
+        
+        Args:
+            seconds: 暂停秒数
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算文本的token数
+    
+    中日韩字符约每字一个token，其他字符约每4个字符一个token。
+    
+    Args:
+        text: 文本
+    
+    Returns:
+        int: 估算的token数
+    """
+    cjk_count = len(re.findall(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]', text))
+    return cjk_count + (len(text) - cjk_count + 3) // 4
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头
+    
+    Args:
+        value: 响应头的值（秒数或HTTP日期）
+    
+    Returns:
+        float|None: 需要等待的秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """计算带完全抖动的指数退避时间
+    
+    Args:
+        attempt: 已重试次数（从0开始）
+        base: 基础等待秒数
+        cap: 最大等待秒数
+    
+    Returns:
+        float: 等待秒数
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
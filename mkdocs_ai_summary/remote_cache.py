@@ -0,0 +1,153 @@
+"""远程缓存模块
+
+在本地 .ai_cache 之后增加一个共享的 HTTP 缓存层，多个 CI 构建可以共用同一份摘要缓存。
+
+协议非常简单，便于用任意键值存储实现：
+    GET {url}/{file_hash}/{content_hash}  -> 200 缓存条目 JSON，未命中时 404
+    PUT {url}/{file_hash}/{content_hash}  请求体为缓存条目 JSON，成功时返回 2xx
+配置了令牌时请求带有 Authorization: Bearer <token> 头。
+参考实现见 cache_server.py。
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+
+
+# 远程缓存访问令牌的环境变量
+REMOTE_CACHE_TOKEN_ENV = 'AI_SUMMARY_CACHE_TOKEN'
+
+
+class RemoteCache:
+    """远程缓存客户端
+    
+    读取时同步请求（read-through），写入先缓冲，在 flush() 时统一上传（write-back）。
+    连续失败达到上限后本次构建不再访问远程缓存，避免拖慢构建。
+    """
+    
+    def __init__(self, url: str, token: Optional[str] = None, timeout: float = 5.0,
+                 write: bool = True, max_failures: int = 3):
+        """初始化远程缓存客户端
+        
+        Args:
+            url: 远程缓存地址，如 http://cache.internal:8765/ai-summary
+            token: 访问令牌，默认读取环境变量 AI_SUMMARY_CACHE_TOKEN
+            timeout: 单次请求超时（秒）
+            write: 是否上传新生成的摘要，只读的构建设为False
+            max_failures: 连续失败多少次后停止访问
+        """
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.write = write
+        self.max_failures = max_failures
+        
+        self._session = requests.Session()
+        token = token if token is not None else os.getenv(REMOTE_CACHE_TOKEN_ENV)
+        if token:
+            self._session.headers['Authorization'] = f'Bearer {token}'
+        
+        self._lock = threading.Lock()
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._failures = 0
+        self.disabled = False
+        
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.uploads = 0
+    
+    def _entry_url(self, file_hash: str, content_hash: str) -> str:
+        return f"{self.url}/{file_hash}/{content_hash}"
+    
+    def _record_failure(self, error: Exception) -> None:
+        """记录一次失败，连续失败达到上限时停用远程缓存"""
+        with self._lock:
+            self._failures += 1
+            if self._failures < self.max_failures or self.disabled:
+                return
+            self.disabled = True
+        print(f"⚠️ 远程缓存不可用，本次构建不再访问: {error}")
+    
+    def get(self, file_hash: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """读取远程缓存条目
+        
+        Args:
+            file_hash: 文件哈希
+            content_hash: 内容哈希
+        
+        Returns:
+            dict|None: 缓存数据，未命中或请求失败时返回None
+        """
+        if self.disabled:
+            return None
+        
+        try:
+            response = self._session.get(self._entry_url(file_hash, content_hash), timeout=self.timeout)
+            if response.status_code == 404:
+                self._failures = 0
+                self.misses += 1
+                return None
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            self._record_failure(e)
+            return None
+        
+        self._failures = 0
+        # 远程条目必须对应请求的内容，避免错误的服务端返回其他页面的摘要
+        if not isinstance(data, dict) or data.get('content_hash') != content_hash or 'summary' not in data:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return data
+    
+    def put(self, file_hash: str, content_hash: str, data: Dict[str, Any]) -> None:
+        """缓冲一次上传，flush() 时提交
+        
+        Args:
+            file_hash: 文件哈希
+            content_hash: 内容哈希
+            data: 缓存数据
+        """
+        if not self.write or self.disabled:
+            return
+        
+        with self._lock:
+            self._pending[(file_hash, content_hash)] = dict(data)
+    
+    def flush(self) -> int:
+        """上传缓冲的条目
+        
+        Returns:
+            int: 成功上传的条目数量
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        
+        uploaded = 0
+        for (file_hash, content_hash), data in pending.items():
+            if self.disabled:
+                break
+            try:
+                response = self._session.put(
+                    self._entry_url(file_hash, content_hash), json=data, timeout=self.timeout
+                )
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self._record_failure(e)
+                continue
+            self._failures = 0
+            uploaded += 1
+        
+        self.uploads += uploaded
+        return uploaded
+    
+    def close(self) -> None:
+        """上传缓冲的条目并关闭HTTP会话"""
+        try:
+            self.flush()
+        finally:
+            self._session.close()
@@ -0,0 +1,304 @@
+"""服务路由模块
+
+记录每个AI服务最近的延迟和错误率，自适应路由时据此把请求优先发给当前最快的健康服务。
+统计数据可保存到缓存目录，下次构建启动时即可使用。样本超过 SAMPLE_MAX_AGE 后过期，
+被降级或没有数据的服务每隔 PROBE_INTERVAL 秒会被排到第一位接受一次探测请求，
+避免一次故障后永远被排在最后。
+"""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from .storage import atomic_write_json
+
+
+class ServiceStats:
+    """单个服务的滚动统计"""
+    
+    def __init__(self, window: int = 50):
+        """初始化服务统计
+        
+        Args:
+            window: 保留的最近请求数量
+        """
+        # 最近请求 (时间戳, 是否成功, 耗时秒数)，时间戳为 time.time()，可以跨构建比较
+        self.samples = deque(maxlen=window)
+        # 最近一次被安排探测的时间戳
+        self.last_probe = 0.0
+    
+    def add(self, success: bool, latency: float, timestamp: float) -> None:
+        """记录一次请求
+        
+        Args:
+            success: 是否成功
+            latency: 请求耗时（秒）
+            timestamp: 请求完成的时间戳
+        """
+        self.samples.append((timestamp, bool(success), latency))
+    
+    def expire(self, cutoff: float) -> None:
+        """丢弃早于 cutoff 的样本
+        
+        Args:
+            cutoff: 时间戳
+        """
+        while self.samples and self.samples[0][0] < cutoff:
+            self.samples.popleft()
+    
+    def last_used(self) -> float:
+        """最近一次请求或探测的时间戳，从未使用时为0"""
+        return max(self.samples[-1][0] if self.samples else 0.0, self.last_probe)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """计算成功请求耗时的百分位数（最近秩法）
+        
+        Args:
+            q: 百分位，0-100
+        
+        Returns:
+            float|None: 耗时秒数，没有数据时返回None
+        """
+        ordered = sorted(latency for _, success, latency in self.samples if success)
+        if not ordered:
+            return None
+        rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+    
+    def error_rate(self) -> float:
+        """计算最近请求的错误率
+        
+        Returns:
+            float: 0-1 之间的错误率，没有数据时为0
+        """
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, success, _ in self.samples if not success) / len(self.samples)
+
+
+class LatencyRouter:
+    """基于延迟和错误率的服务路由器"""
+    
+    STATS_FILE = 'routing_stats.json'
+    
+    # 错误率超过该值的服务视为不健康，排到最后
+    MAX_ERROR_RATE = 0.5
+    
+    # 少于该请求数时不判断健康状态，避免一次失败就被降级
+    MIN_SAMPLES = 3
+    
+    # 样本保留秒数，过期后服务重新视为没有数据
+    SAMPLE_MAX_AGE = 3600.0
+    
+    # 不健康或没有数据的服务超过该秒数未被使用时，安排一次探测请求
+    PROBE_INTERVAL = 60.0
+    
+    def __init__(self, window: int = 50, max_age: Optional[float] = None,
+                 probe_interval: Optional[float] = None):
+        """初始化路由器
+        
+        Args:
+            window: 每个服务保留的最近请求数量
+            max_age: 样本保留秒数，None表示使用 SAMPLE_MAX_AGE
+            probe_interval: 探测间隔秒数，None表示使用 PROBE_INTERVAL
+        """
+        self.window = window
+        self.max_age = self.SAMPLE_MAX_AGE if max_age is None else max_age
+        self.probe_interval = self.PROBE_INTERVAL if probe_interval is None else probe_interval
+        self._stats: Dict[str, ServiceStats] = {}
+        self._lock = threading.Lock()
+        # 没有数据的服务从路由器创建时开始计算探测间隔
+        self._started_at = time.time()
+    
+    def _get_stats(self, service_name: str) -> ServiceStats:
+        stats = self._stats.get(service_name)
+        if stats is None:
+            stats = self._stats.setdefault(service_name, ServiceStats(self.window))
+        return stats
+    
+    def _current_stats(self, service_name: str) -> Optional[ServiceStats]:
+        """获取服务未过期的统计（调用方需持有锁）"""
+        stats = self._stats.get(service_name)
+        if stats is not None:
+            stats.expire(time.time() - self.max_age)
+        return stats
+    
+    def record(self, service_name: str, latency: float, success: bool) -> None:
+        """记录一次请求
+        
+        Args:
+            service_name: 服务名称
+            latency: 请求耗时（秒）
+            success: 是否成功
+        """
+        now = time.time()
+        with self._lock:
+            stats = self._get_stats(service_name)
+            stats.expire(now - self.max_age)
+            stats.add(success, latency, now)
+    
+    def percentile(self, service_name: str, q: float) -> Optional[float]:
+        """获取服务耗时的百分位数
+        
+        Args:
+            service_name: 服务名称
+            q: 百分位，0-100
+        
+        Returns:
+            float|None: 耗时秒数，没有数据时返回None
+        """
+        with self._lock:
+            stats = self._current_stats(service_name)
+            return stats.percentile(q) if stats else None
+    
+    def is_healthy(self, service_name: str) -> bool:
+        """判断服务最近是否健康
+        
+        Args:
+            service_name: 服务名称
+        
+        Returns:
+            bool: 错误率未超过阈值，或样本不足时返回True
+        """
+        with self._lock:
+            return self._stats_healthy(self._current_stats(service_name))
+    
+    def _stats_healthy(self, stats: Optional[ServiceStats]) -> bool:
+        """根据统计判断服务是否健康，样本不足时视为健康"""
+        if not stats or len(stats.samples) < self.MIN_SAMPLES:
+            return True
+        return stats.error_rate() <= self.MAX_ERROR_RATE
+    
+    def order(self, preferred: str, candidates: List[str], latency_threshold: float = 0.0) -> List[str]:
+        """按延迟和健康状态排列服务
+        
+        健康服务按 p50 从快到慢排列，没有数据的服务保持原有顺序排在其后，
+        不健康的服务排在最后；首选服务健康且 p50 与最快服务相差不超过
+        latency_threshold 秒时仍排在第一位。排在第一位之后的不健康或没有数据的服务
+        超过 probe_interval 秒未被使用时，按配置顺序挑选一个排到第一位接受探测。
+        
+        Args:
+            preferred: 首选服务（ai_service）
+            candidates: 按配置顺序排列的服务列表
+            latency_threshold: 首选服务允许比最快服务慢的秒数
+        
+        Returns:
+            list: 排序后的服务列表
+        """
+        def sort_key(item):
+            index, name = item
+            p50 = self.percentile(name, 50)
+            return (not self.is_healthy(name), p50 is None, p50 or 0.0, index)
+        
+        ordered = [name for _, name in sorted(enumerate(candidates), key=sort_key)]
+        if preferred in ordered and ordered[0] != preferred:
+            fastest_p50 = self.percentile(ordered[0], 50)
+            preferred_p50 = self.percentile(preferred, 50)
+            if self.is_healthy(preferred) and (
+                preferred_p50 is None or fastest_p50 is None
+                or preferred_p50 - fastest_p50 <= latency_threshold
+            ):
+                ordered.remove(preferred)
+                ordered.insert(0, preferred)
+        
+        probe = self._claim_probe([name for name in candidates if name in ordered[1:]])
+        if probe is not None:
+            ordered.remove(probe)
+            ordered.insert(0, probe)
+        return ordered
+    
+    def _claim_probe(self, candidates: List[str]) -> Optional[str]:
+        """挑选一个需要探测的服务，并记录探测时间
+        
+        Args:
+            candidates: 按配置顺序排列、当前未排在第一位的服务
+        
+        Returns:
+            str|None: 需要探测的服务，没有时返回None
+        """
+        now = time.time()
+        with self._lock:
+            for name in candidates:
+                stats = self._current_stats(name)
+                if stats and stats.samples and self._stats_healthy(stats):
+                    continue
+                last_used = max(stats.last_used() if stats else 0.0, self._started_at)
+                if now - last_used < self.probe_interval:
+                    continue
+                self._get_stats(name).last_probe = now
+                return name
+        return None
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """获取各服务的统计摘要
+        
+        Returns:
+            dict: 服务名 -> {'p50', 'p95', 'error_rate', 'samples'}
+        """
+        with self._lock:
+            return {
+                name: {
+                    'p50': stats.percentile(50),
+                    'p95': stats.percentile(95),
+                    'error_rate': round(stats.error_rate(), 3),
+                    'samples': len(stats.samples)
+                }
+                for name, stats in self._stats.items()
+                if self._current_stats(name).samples
+            }
+    
+    def load(self, path: Path) -> bool:
+        """从文件加载统计数据，过期的样本和旧格式（没有时间戳）的统计被丢弃
+        
+        Args:
+            path: 统计文件路径
+        
+        Returns:
+            bool: 是否成功加载
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            cutoff = time.time() - self.max_age
+            services = {
+                name: [
+                    (float(timestamp), bool(success), float(latency))
+                    for timestamp, success, latency in entry.get('samples', [])
+                    if float(timestamp) >= cutoff
+                ]
+                for name, entry in data.get('services', {}).items()
+            }
+        except Exception:
+            return False
+        
+        with self._lock:
+            for name, samples in services.items():
+                if samples:
+                    self._get_stats(name).samples.extend(samples)
+        return True
+    
+    def save(self, path: Path) -> None:
+        """保存统计数据到文件
+        
+        Args:
+            path: 统计文件路径
+        """
+        with self._lock:
+            data = {
+                'services': {
+                    name: {
+                        'samples': [
+                            [round(timestamp, 3), success, round(latency, 3)]
+                            for timestamp, success, latency in stats.samples
+                        ]
+                    }
+                    for name, stats in self._stats.items()
+                    if self._current_stats(name).samples
+                }
+            }
+        
+        atomic_write_json(path, data, indent=2)
@@ -0,0 +1,100 @@
+"""相似度模块
+
+为提示词内容计算 MinHash 签名（bottom-k 变体），用于判断页面改动是否足够小，
+可以继续使用已有摘要而无需重新生成。
+
+每个字符 k-gram 只计算一次哈希，保留最小的若干个哈希值作为签名，
+两个签名即可估计内容的 Jaccard 相似度，不需要保存原文。
+"""
+
+import base64
+import hashlib
+import struct
+from typing import FrozenSet
+
+
+# 字符 k-gram 长度；按字符切分，中文和英文内容都适用
+SHINGLE_SIZE = 5
+
+# 签名保留的哈希数量，相似度在 0.9 附近时估计误差约 ±0.04
+SIGNATURE_SIZE = 64
+
+# 签名格式前缀，k-gram 长度或哈希方式变化时必须更换，旧签名随之不再比较
+SIGNATURE_PREFIX = 'm1:'
+
+
+def _shingle_hashes(text: str, shingle_size: int = SHINGLE_SIZE) -> set:
+    """计算文本所有字符 k-gram 的 32 位哈希
+    
+    Args:
+        text: 文本
+        shingle_size: k-gram 长度
+    
+    Returns:
+        set: 哈希值集合
+    """
+    # 合并空白，只有空白不同的内容视为相同
+    normalized = ' '.join(text.split())
+    if len(normalized) <= shingle_size:
+        shingles = [normalized] if normalized else []
+    else:
+        shingles = (normalized[i:i + shingle_size] for i in range(len(normalized) - shingle_size + 1))
+    
+    hashes = set()
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest()
+        hashes.add(int.from_bytes(digest, 'big'))
+    return hashes
+
+
+def minhash_signature(text: str, size: int = SIGNATURE_SIZE) -> str:
+    """计算文本的 MinHash 签名
+    
+    Args:
+        text: 文本（通常是清理并截断后的提示词内容）
+        size: 保留的哈希数量
+    
+    Returns:
+        str: 可保存在缓存条目中的签名字符串
+    """
+    smallest = sorted(_shingle_hashes(text))[:size]
+    packed = struct.pack(f'>{len(smallest)}I', *smallest)
+    return SIGNATURE_PREFIX + base64.b64encode(packed).decode('ascii')
+
+
+def _decode_signature(signature: str) -> FrozenSet[int]:
+    """解析签名字符串
+    
+    Raises:
+        ValueError: 签名格式无效或版本不同
+    """
+    if not signature.startswith(SIGNATURE_PREFIX):
+        raise ValueError("签名版本不同")
+    packed = base64.b64decode(signature[len(SIGNATURE_PREFIX):])
+    return frozenset(struct.unpack(f'>{len(packed) // 4}I', packed))
+
+
+def estimate_similarity(signature_a: str, signature_b: str) -> float:
+    """根据两个签名估计内容的 Jaccard 相似度
+    
+    Args:
+        signature_a: 签名
+        signature_b: 签名
+    
+    Returns:
+        float: 0~1 之间的相似度，签名无效或版本不同时返回0
+    """
+    try:
+        hashes_a = _decode_signature(signature_a)
+        hashes_b = _decode_signature(signature_b)
+    except (ValueError, struct.error):
+        return 0.0
+    
+    if not hashes_a or not hashes_b:
+        return 1.0 if hashes_a == hashes_b else 0.0
+    
+    # 并集中最小的 k 个哈希是并集的均匀样本，其中同时出现在两个签名里的比例即为相似度估计
+    k = min(len(hashes_a), len(hashes_b))
+    sample = sorted(hashes_a | hashes_b)[:k]
+    shared = sum(1 for value in sample if value in hashes_a and value in hashes_b)
+    return shared / k
@@ -0,0 +1,174 @@
+"""缓存目录文件操作模块
+
+提供原子写入（先写临时文件再重命名）和进程间咨询锁，
+使构建中断或多个构建同时使用同一个 .ai_cache 目录时不会留下写了一半的文件。
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# 临时文件后缀，不会被按 *.json 查找缓存条目的逻辑读取
+TEMP_SUFFIX = '.tmp'
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """原子写入文件
+    
+    先写入同目录下的临时文件并刷新到磁盘，再重命名为目标文件；
+    读取方只会看到旧文件或完整的新文件。
+    
+    Args:
+        path: 目标文件路径
+        data: 文件内容
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix=TEMP_SUFFIX)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: Path, data: Any, **dump_kwargs) -> None:
+    """原子写入JSON文件
+    
+    Args:
+        path: 目标文件路径
+        data: 要写入的数据
+        **dump_kwargs: 传递给 json.dumps 的参数
+    """
+    atomic_write_bytes(path, json.dumps(data, **dump_kwargs).encode('utf-8'))
+
+
+def remove_stale_temp_files(directory: Path, max_age: float = 3600.0) -> int:
+    """删除中断的写入留下的临时文件
+    
+    Args:
+        directory: 目录
+        max_age: 只删除早于该秒数的临时文件，避免影响正在进行的写入
+    
+    Returns:
+        int: 删除的文件数量
+    """
+    cutoff = time.time() - max_age
+    removed_count = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not (entry.name.startswith('.') and entry.name.endswith(TEMP_SUFFIX)):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed_count += 1
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return removed_count
+
+
+class FileLock:
+    """基于锁文件的进程间咨询锁
+    
+    同一进程内的线程通过线程锁排队，不同进程通过锁文件互斥；
+    可重入，同一线程嵌套加锁时只在最外层真正加锁。
+    """
+    
+    def __init__(self, path: Path, timeout: float = 30.0):
+        """初始化文件锁
+        
+        Args:
+            path: 锁文件路径
+            timeout: 等待其他进程释放锁的最长秒数
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+    
+    def acquire(self) -> bool:
+        """获取锁
+        
+        Returns:
+            bool: 是否获得了进程间锁；超时时返回False，此时仅持有线程锁
+        """
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth > 1:
+            return self._fd is not None
+        
+        try:
+            fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return False
+        
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._lock_fd(fd)
+                self._fd = fd
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    print(f"⚠️ 等待缓存锁超时 ({self.timeout:.0f}s)，继续执行")
+                    return False
+                time.sleep(0.05)
+    
+    def release(self) -> None:
+        """释放锁"""
+        self._depth -= 1
+        try:
+            if self._depth == 0 and self._fd is not None:
+                fd, self._fd = self._fd, None
+                try:
+                    self._unlock_fd(fd)
+                finally:
+                    os.close(fd)
+        finally:
+            self._thread_lock.release()
+    
+    @staticmethod
+    def _lock_fd(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    
+    @staticmethod
+    def _unlock_fd(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
@@ -41,12 +41,21 @@ setup(
             'pytest-cov>=2.0',
             'responses>=0.18.0',
         ],
+        'async': [
+            'httpx>=0.23.0',
+        ],
+        'xxhash': [
+            'xxhash>=3.0.0',
+        ],
     },
     
     entry_points={
         'mkdocs.plugins': [
             'ai-summary = mkdocs_ai_summary.plugin:AISummaryPlugin',
-        ]
+        ],
+        'console_scripts': [
+            'mkdocs-ai-summary = mkdocs_ai_summary.cli:main',
+        ],
     },
     
     classifiers=[
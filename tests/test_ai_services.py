@@ -1,10 +1,14 @@
 """Tests for AI services module"""
 
+import json
+import re
+import time
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import requests
 
-from mkdocs_ai_summary.ai_services import AIServiceManager
+from mkdocs_ai_summary.ai_services import AIServiceManager, parse_batch_response
 
 
 class TestAIServiceManager:
@@ -269,4 +273,464 @@ class TestAIServiceManager:
         """Test service configuration for unknown service"""
         config = self.manager._get_service_config('unknown')
         
-        assert config is None
\ No newline at end of file
+        assert config is None
+
+class TestHTTPSessions:
+    """Test cases for pooled per-service HTTP sessions"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, pool_size=8
+        )
+        self.manager.ai_services['glm']['api_key'] = 'test_key'
+    
+    def teardown_method(self):
+        """Clean up test fixtures"""
+        self.manager.close()
+    
+    def test_session_reused_per_service(self):
+        """Each service gets one long-lived session"""
+        first = self.manager._get_session('glm')
+        second = self.manager._get_session('glm')
+        other = self.manager._get_session('deepseek')
+        
+        assert first is second
+        assert first is not other
+        assert first.headers['Connection'] == 'keep-alive'
+    
+    def test_session_pool_size(self):
+        """The connection pool size is configurable"""
+        adapter = self.manager._get_session('glm').get_adapter('https://example.com')
+        
+        assert adapter._pool_maxsize == 8
+    
+    def test_keep_alive_disabled(self):
+        """Keep-alive can be turned off"""
+        manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, keep_alive=False
+        )
+        
+        assert manager._get_session('glm').headers['Connection'] == 'close'
+        manager.close()
+    
+    def test_api_call_uses_session(self):
+        """OpenAI compatible calls go through the service session"""
+        response = Mock()
+        response.json.return_value = {'choices': [{'message': {'content': ' Summary '}}]}
+        
+        with patch.object(requests.Session, 'post', return_value=response) as mock_post:
+            result = self.manager._try_service('glm', 'content', 'title')
+        
+        assert result == {'summary': 'Summary', 'service': 'glm'}
+        mock_post.assert_called_once()
+    
+    def test_close_releases_sessions(self):
+        """close() closes and forgets all sessions"""
+        session = self.manager._get_session('glm')
+        
+        with patch.object(session, 'close') as mock_close:
+            self.manager.close()
+        
+        mock_close.assert_called_once()
+        assert self.manager._sessions == {}
+
+
+class TestRateLimitedRequests:
+    """Test cases for rate limiting and 429 backoff"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, fallback_services=['glm', 'deepseek'],
+            rate_limits={'glm': {'rpm': 30, 'tpm': 50000}}, max_retries=2
+        )
+        for service in self.manager.ai_services.values():
+            service['api_key'] = None
+        self.manager.ai_services['glm']['api_key'] = 'glm_key'
+        self.manager.ai_services['deepseek']['api_key'] = 'deepseek_key'
+    
+    def _response(self, status_code, headers=None, text='Summary text'):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers or {})
+        response._content = (
+            b'{"choices": [{"message": {"content": "%s"}}]}' % text.encode()
+            if status_code == 200 else b'{}'
+        )
+        return response
+    
+    def test_rate_limiter_from_config(self):
+        """Limits come from rate_limits or the service entry"""
+        self.manager.ai_services['deepseek']['rpm'] = 10
+        
+        glm_limiter = self.manager._get_rate_limiter('glm')
+        assert (glm_limiter.rpm, glm_limiter.tpm) == (30, 50000)
+        assert self.manager._get_rate_limiter('deepseek').rpm == 10
+        assert self.manager._get_rate_limiter('gemini') is None
+    
+    def test_custom_service_limits(self):
+        """Custom services accept rpm/tpm keys"""
+        manager = AIServiceManager(
+            default_service='mine', model='m', max_tokens=300, temperature=0.3,
+            custom_services={'mine': {'url': 'https://example.com', 'api_key': 'k', 'rpm': 5}}
+        )
+        
+        assert manager._get_rate_limiter('mine').rpm == 5
+    
+    def test_retry_after_honored_before_fallback(self):
+        """A 429 is retried on the same service after Retry-After"""
+        responses = [self._response(429, {'Retry-After': '2'}), self._response(200)]
+        
+        with patch.object(requests.Session, 'post', side_effect=responses) as mock_post, \
+             patch('mkdocs_ai_summary.rate_limiter.time.sleep') as mock_sleep:
+            result = self.manager.generate_summary('content', 'title')
+        
+        assert result == {'summary': 'Summary text', 'service': 'glm'}
+        assert mock_post.call_count == 2
+        assert any(call.args[0] >= 1.9 for call in mock_sleep.call_args_list)
+    
+    def test_exhausted_retries_fall_back(self):
+        """After max_retries 429s the next service is used"""
+        responses = [self._response(429)] * 3 + [self._response(200, text='From deepseek')]
+        
+        with patch.object(requests.Session, 'post', side_effect=responses), \
+             patch('mkdocs_ai_summary.ai_services.backoff_delay', return_value=0.0):
+            result = self.manager.generate_summary('content', 'title')
+        
+        assert result['service'] == 'deepseek'
+    
+    def test_long_retry_after_falls_back(self):
+        """Retry-After beyond the limit skips straight to fallback"""
+        responses = [self._response(429, {'Retry-After': '3600'}), self._response(200, text='From deepseek')]
+        
+        with patch.object(requests.Session, 'post', side_effect=responses) as mock_post:
+            result = self.manager.generate_summary('content', 'title')
+        
+        assert result['service'] == 'deepseek'
+        assert mock_post.call_count == 2
+    
+    def test_non_retryable_error_falls_back(self):
+        """Other HTTP errors fall back immediately"""
+        responses = [self._response(401), self._response(200, text='From deepseek')]
+        
+        with patch.object(requests.Session, 'post', side_effect=responses) as mock_post:
+            result = self.manager.generate_summary('content', 'title')
+        
+        assert result['service'] == 'deepseek'
+        assert mock_post.call_count == 2
+    
+    def test_routing_latency_excludes_retry_wait(self):
+        """Only the successful HTTP round trip is recorded, not the 429 backoff"""
+        self.manager.rate_limits = {}
+        self.manager._rate_limiters.clear()
+        responses = [self._response(429), self._response(200)]
+        
+        with patch.object(requests.Session, 'post', side_effect=responses), \
+             patch('mkdocs_ai_summary.ai_services.backoff_delay', return_value=0.2):
+            result = self.manager.generate_summary('content', 'title')
+        
+        assert result['service'] == 'glm'
+        assert self.manager.router.percentile('glm', 50) < 0.1
+
+
+class TestCircuitBreakerFallback:
+    """Test cases for skipping services with an open circuit breaker"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, fallback_services=['glm', 'deepseek'],
+            breaker_threshold=2, breaker_cooldown=60
+        )
+        for service in self.manager.ai_services.values():
+            service['api_key'] = None
+        self.manager.ai_services['glm']['api_key'] = 'glm_key'
+        self.manager.ai_services['deepseek']['api_key'] = 'deepseek_key'
+    
+    def test_open_breaker_skips_service(self):
+        """Once tripped, a failing service is no longer called"""
+        def fake_request(service_name, config, prompt):
+            if service_name == 'glm':
+                raise requests.exceptions.Timeout('timed out')
+            return 'From deepseek'
+        
+        with patch.object(self.manager, '_request_completion', side_effect=fake_request) as mock_request:
+            results = [self.manager.generate_summary('content', 'title') for _ in range(5)]
+        
+        assert all(result['service'] == 'deepseek' for result in results)
+        called = [call.args[0] for call in mock_request.call_args_list]
+        assert called.count('glm') == 2
+        assert self.manager.get_breaker_states()['glm'] == {
+            'state': 'open', 'consecutive_failures': 2, 'trips': 1, 'skipped': 3
+        }
+    
+    def test_breaker_disabled(self):
+        """A threshold of 0 disables the breaker"""
+        self.manager.breaker_threshold = 0
+        
+        with patch.object(self.manager, '_request_completion', side_effect=Exception('down')) as mock_request:
+            for _ in range(3):
+                self.manager.generate_summary('content', 'title')
+        
+        assert mock_request.call_count == 6
+        assert self.manager.get_breaker_states() == {}
+
+
+class TestAdaptiveRouting:
+    """Test cases for latency-aware service ordering"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, fallback_services=['deepseek', 'openai'],
+            routing_mode='adaptive', routing_latency_threshold=1.0
+        )
+        for service in self.manager.ai_services.values():
+            service['api_key'] = 'key'
+    
+    def test_fixed_mode_ignores_latency(self):
+        """Fixed routing keeps the default service first"""
+        self.manager.routing_mode = 'fixed'
+        self.manager.router.record('glm', 10.0, True)
+        self.manager.router.record('openai', 1.0, True)
+        
+        assert self.manager._service_order() == ['glm', 'deepseek', 'openai']
+    
+    def test_adaptive_mode_prefers_fastest(self):
+        """Adaptive routing sends requests to the fastest service"""
+        self.manager.router.record('glm', 10.0, True)
+        self.manager.router.record('openai', 1.0, True)
+        
+        with patch.object(self.manager, '_request_completion', return_value='Summary') as mock_request:
+            result = self.manager.generate_summary('content', 'title')
+        
+        assert result['service'] == 'openai'
+        assert mock_request.call_args.args[0] == 'openai'
+    
+    def test_outcomes_are_recorded(self):
+        """Each call updates the router statistics"""
+        with patch.object(self.manager, '_request_completion', side_effect=[Exception('down'), 'Summary']):
+            self.manager.generate_summary('content', 'title')
+        
+        snapshot = self.manager.router.snapshot()
+        assert snapshot['glm']['error_rate'] == 1.0
+        assert snapshot['deepseek']['samples'] == 1
+
+
+class TestHedgedRequests:
+    """Test cases for hedging slow requests to a second service"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, fallback_services=['glm', 'deepseek', 'openai'],
+            hedging_enabled=True, hedge_delay=0.05
+        )
+        for service in self.manager.ai_services.values():
+            service['api_key'] = 'key'
+    
+    def teardown_method(self):
+        """Release the hedge executor"""
+        self.manager.close()
+    
+    def test_fast_primary_is_not_hedged(self):
+        """A primary answering within the delay is used alone"""
+        with patch.object(self.manager, '_request_completion', return_value='Summary') as mock_request:
+            result = self.manager.generate_summary('content', 'title')
+        
+        assert result == {'summary': 'Summary', 'service': 'glm'}
+        assert mock_request.call_count == 1
+    
+    def test_slow_primary_is_hedged(self):
+        """The second service answers while the primary is still waiting"""
+        def fake_request(service_name, config, prompt):
+            if service_name == 'glm':
+                time.sleep(0.5)
+                return 'From glm'
+            return 'From deepseek'
+        
+        with patch.object(self.manager, '_request_completion', side_effect=fake_request):
+            started_at = time.monotonic()
+            result = self.manager.generate_summary('content', 'title')
+            elapsed = time.monotonic() - started_at
+        
+        assert result['service'] == 'deepseek'
+        assert elapsed < 0.4
+    
+    def test_failed_primary_falls_back_in_order(self):
+        """A quick failure continues with the normal fallback chain"""
+        with patch.object(self.manager, '_request_completion',
+                          side_effect=[Exception('down'), 'From deepseek']) as mock_request:
+            result = self.manager.generate_summary('content', 'title')
+        
+        assert result['service'] == 'deepseek'
+        assert mock_request.call_count == 2
+    
+    def test_delay_follows_latency_percentile(self):
+        """The hedge delay comes from the primary's recorded latencies"""
+        assert self.manager._get_hedge_delay('glm') == 0.05
+        
+        for latency in (1.0, 2.0, 3.0, 4.0):
+            self.manager.router.record('glm', latency, True)
+        self.manager.hedge_percentile = 50
+        
+        assert self.manager._get_hedge_delay('glm') == 2.0
+
+
+class TestBatchedSummaries:
+    """Test cases for multi-page batched prompts"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, fallback_services=['glm'], breaker_threshold=0
+        )
+        self.manager.ai_services['glm']['api_key'] = 'glm_key'
+        self.pages = [
+            {'content': f'Short post number {i} about caching.', 'title': f'Post {i}', 'language': 'en'}
+            for i in range(5)
+        ]
+    
+    @staticmethod
+    def _answer(prompt, summaries=None):
+        """Answer a batch prompt with one summary per document id."""
+        documents = json.loads(re.search(r'\[\{.*\}\]', prompt).group(0))
+        summaries = summaries or {doc['id']: f"A valid summary of {doc['title']}." for doc in documents}
+        return json.dumps([{'id': i, 'summary': s} for i, s in summaries.items()])
+    
+    def test_plan_batches_respects_budget_and_language(self):
+        """Pages are packed per language up to the budget; long pages go alone"""
+        pages = self.pages + [
+            {'content': '长' * 3000, 'title': 'Long', 'language': 'en'},
+            {'content': '短文', 'title': 'Zh', 'language': 'zh'},
+        ]
+        
+        batches = self.manager.plan_batches(pages, token_budget=4000, max_pages=3)
+        
+        assert batches == [[0, 1, 2], [3, 4], [5], [6]]
+    
+    def test_one_request_per_batch(self):
+        """Five short pages are summarized with a single request"""
+        with patch.object(self.manager, '_request_completion',
+                          side_effect=lambda name, config, prompt, max_tokens=None: self._answer(prompt)) as mock_request:
+            results = self.manager.generate_summaries_batched(self.pages)
+        
+        assert mock_request.call_count == 1
+        assert mock_request.call_args.kwargs['max_tokens'] == 300 * 5
+        assert [result['summary'] for result in results] == [f'A valid summary of Post {i}.' for i in range(5)]
+        assert all(result['service'] == 'glm' for result in results)
+    
+    def test_unparseable_batch_falls_back_to_single_pages(self):
+        """Pages are retried one by one when the batch output is not JSON"""
+        def fake_request(name, config, prompt, max_tokens=None):
+            return 'Sorry, here are the summaries in prose.' if max_tokens else 'A valid single-page summary.'
+        
+        with patch.object(self.manager, '_request_completion', side_effect=fake_request) as mock_request:
+            results = self.manager.generate_summaries_batched(self.pages)
+        
+        assert mock_request.call_count == 1 + 5
+        assert all(result['summary'] == 'A valid single-page summary.' for result in results)
+    
+    def test_invalid_items_are_retried(self):
+        """Missing or invalid summaries are regenerated individually"""
+        def fake_request(name, config, prompt, max_tokens=None):
+            if max_tokens:
+                return self._answer(prompt, {0: 'A valid summary of Post 0.', 1: 'error', 3: 'A valid summary of Post 3.'})
+            return 'A valid single-page summary.'
+        
+        def validate(summary):
+            return 'error' not in summary
+        
+        with patch.object(self.manager, '_request_completion', side_effect=fake_request) as mock_request:
+            results = self.manager.generate_summaries_batched(self.pages, validate=validate)
+        
+        assert mock_request.call_count == 1 + 3
+        assert results[0]['summary'] == 'A valid summary of Post 0.'
+        assert [results[i]['summary'] for i in (1, 2, 4)] == ['A valid single-page summary.'] * 3
+    
+    def test_batch_request_body_max_tokens(self):
+        """The batch reserves a per-page summary budget capped by the provider maximum"""
+        manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=1000,
+            temperature=0.3, fallback_services=['glm'], breaker_threshold=0,
+            batch_max_output_tokens=900
+        )
+        manager.ai_services['glm']['api_key'] = 'glm_key'
+        
+        def fake_post(url, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            answer = self._answer(kwargs['json']['messages'][-1]['content'])
+            response._content = json.dumps({'choices': [{'message': {'content': answer}}]}).encode()
+            return response
+        
+        with patch.object(requests.Session, 'post', side_effect=fake_post) as mock_post:
+            results = manager.generate_summaries_batched(self.pages)
+        
+        # 900 // 300 pages fit in one request: 3 + 2 pages
+        assert [call.kwargs['json']['max_tokens'] for call in mock_post.call_args_list] == [900, 600]
+        assert all(result['service'] == 'glm' for result in results)
+    
+    def test_rejected_batch_is_not_counted_as_failure(self):
+        """A 4xx batch response neither trips the breaker nor enters routing stats"""
+        manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, fallback_services=['glm'], breaker_threshold=1
+        )
+        manager.ai_services['glm']['api_key'] = 'glm_key'
+        
+        def fake_request(name, config, prompt, max_tokens=None):
+            if max_tokens:
+                response = requests.Response()
+                response.status_code = 400
+                raise requests.HTTPError('400 Client Error', response=response)
+            return 'A valid single-page summary.'
+        
+        with patch.object(manager, '_request_completion', side_effect=fake_request):
+            results = manager.generate_summaries_batched(self.pages)
+        
+        assert all(result['summary'] == 'A valid single-page summary.' for result in results)
+        assert manager.get_breaker_states()['glm']['state'] == 'closed'
+        # only the five single-page requests are recorded
+        stats = manager.router.snapshot()['glm']
+        assert (stats['error_rate'], stats['samples']) == (0.0, 5)
+    
+    def test_rejected_batch_releases_half_open_probe(self):
+        """A 4xx batch sent as the half-open probe lets the next probe through"""
+        manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, fallback_services=['glm'], breaker_threshold=1, breaker_cooldown=0
+        )
+        manager.ai_services['glm']['api_key'] = 'glm_key'
+        manager._get_breaker('glm').record_failure()
+        
+        def fake_request(name, config, prompt, max_tokens=None):
+            if max_tokens:
+                assert manager.get_breaker_states()['glm']['state'] == 'half_open'
+                response = requests.Response()
+                response.status_code = 400
+                raise requests.HTTPError('400 Client Error', response=response)
+            return 'A valid single-page summary.'
+        
+        with patch.object(manager, '_request_completion', side_effect=fake_request) as mock_request:
+            results = manager.generate_summaries_batched(self.pages)
+        
+        assert mock_request.call_count == 1 + 5
+        assert all(result['summary'] == 'A valid single-page summary.' for result in results)
+        assert manager.get_breaker_states()['glm']['state'] == 'closed'
+    
+    def test_parse_batch_response(self):
+        """The JSON array may be wrapped in code fences or prose"""
+        text = 'Here you go:\n```json\n[{"id": 1, "summary": " B "}, {"id": "0", "summary": "A"}, {"id": 2}]\n```'
+        
+        assert parse_batch_response(text) == {0: 'A', 1: 'B'}
+        with pytest.raises(ValueError):
+            parse_batch_response('no array here [1, 2]')
@@ -0,0 +1,183 @@
+"""Tests for async AI services module"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from mkdocs_ai_summary.ai_services import AIServiceManager
+from mkdocs_ai_summary.async_ai_services import AsyncAIServiceManager
+
+
+def _completion(text):
+    return httpx.Response(200, json={'choices': [{'message': {'content': text}}]})
+
+
+class TestAsyncAIServiceManager:
+    """Test cases for AsyncAIServiceManager"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        sync_manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300,
+            temperature=0.3, fallback_services=['glm', 'deepseek']
+        )
+        for service in sync_manager.ai_services.values():
+            service['api_key'] = None
+        sync_manager.ai_services['glm']['api_key'] = 'glm_key'
+        sync_manager.ai_services['deepseek']['api_key'] = 'deepseek_key'
+        self.sync_manager = sync_manager
+        self.manager = AsyncAIServiceManager.from_manager(sync_manager, max_concurrency=3)
+    
+    def _use_transport(self, handler):
+        transport = httpx.MockTransport(handler)
+        self.manager._get_client = lambda service_name: self.manager._clients.setdefault(
+            service_name, httpx.AsyncClient(transport=transport)
+        )
+    
+    def test_shares_sync_configuration(self):
+        """Service configuration is shared with the sync manager"""
+        assert self.manager.default_service == 'glm'
+        assert self.manager.fallback_order == ['glm', 'deepseek']
+        assert self.manager.max_concurrency == 3
+        assert self.manager._breakers is self.sync_manager._breakers
+    
+    def test_generate_summary(self):
+        """The coroutine returns the same result shape as the sync manager"""
+        self._use_transport(lambda request: _completion(' Async summary '))
+        
+        result = asyncio.run(self.manager.generate_summary('content', 'title', 'zh'))
+        
+        assert result == {'summary': 'Async summary', 'service': 'glm'}
+    
+    def test_fallback_on_failure(self):
+        """Failures fall back to the next service in order"""
+        def handler(request):
+            if 'bigmodel' in str(request.url):
+                return httpx.Response(500)
+            return _completion('From deepseek')
+        self._use_transport(handler)
+        
+        result = asyncio.run(self.manager.generate_summary('content', 'title'))
+        
+        assert result['service'] == 'deepseek'
+    
+    def test_open_breaker_skips_service(self):
+        """A breaker tripped by either engine is honoured by the other"""
+        requested = []
+        def handler(request):
+            requested.append(request.url.host)
+            return _completion('From deepseek')
+        self._use_transport(handler)
+        breaker = self.manager._get_breaker('glm')
+        for _ in range(self.manager.breaker_threshold):
+            breaker.record_failure()
+        
+        result = asyncio.run(self.manager.generate_summary('content', 'title'))
+        
+        assert result['service'] == 'deepseek'
+        assert requested == ['api.deepseek.com']
+    
+    def test_generate_summaries_bounded_concurrency(self):
+        """Fan-out keeps at most max_concurrency requests in flight per service"""
+        state = {'in_flight': 0, 'peak': 0}
+        
+        async def handler(request):
+            state['in_flight'] += 1
+            state['peak'] = max(state['peak'], state['in_flight'])
+            await asyncio.sleep(0.01)
+            state['in_flight'] -= 1
+            return _completion('Summary text')
+        self._use_transport(handler)
+        
+        jobs = [{'content': f'page {i}', 'title': f'T{i}', 'language': 'en'} for i in range(10)]
+        results = asyncio.run(self.manager.generate_summaries(jobs))
+        
+        assert len(results) == 10
+        assert all(result['summary'] == 'Summary text' for result in results)
+        assert state['peak'] == 3
+        assert self.manager._clients == {}
+    
+    def test_retry_after_429(self):
+        """429 responses are retried on the same service"""
+        self.manager.max_retries = 2
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={'Retry-After': '0'})
+            return _completion('After retry')
+        self._use_transport(handler)
+        
+        result = asyncio.run(self.manager.generate_summary('content', 'title'))
+        
+        assert result == {'summary': 'After retry', 'service': 'glm'}
+        assert len(calls) == 2
+    
+    def test_routing_latency_excludes_retry_wait(self):
+        """Only the successful HTTP round trip is recorded, not the 429 backoff"""
+        self.manager.max_retries = 2
+        responses = [httpx.Response(429), _completion('After retry')]
+        self._use_transport(lambda request: responses.pop(0))
+        
+        with patch('mkdocs_ai_summary.ai_services.backoff_delay', return_value=0.2):
+            result = asyncio.run(self.manager.generate_summary('content', 'title'))
+        
+        assert result['service'] == 'glm'
+        assert self.manager.router.percentile('glm', 50) < 0.1
+    
+    def test_hedged_request_cancels_straggler(self):
+        """The slower of two hedged requests is cancelled"""
+        self.manager.hedging_enabled = True
+        self.manager.hedge_delay = 0.05
+        state = {'cancelled': False}
+        
+        async def handler(request):
+            if 'bigmodel' in str(request.url):
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    state['cancelled'] = True
+                    raise
+            return _completion('From deepseek')
+        self._use_transport(handler)
+        
+        async def run():
+            result = await self.manager.generate_summary('content', 'title')
+            # Let the cancelled task unwind before the loop shuts down
+            await asyncio.sleep(0.01)
+            return result, state['cancelled']
+        
+        result, cancelled = asyncio.run(run())
+        
+        assert result['service'] == 'deepseek'
+        assert cancelled is True
+    
+    def test_cancelled_hedge_releases_half_open_probe(self):
+        """A half-open probe that loses the hedge does not block the service"""
+        self.manager.hedging_enabled = True
+        self.manager.hedge_delay = 0.05
+        self.manager.breaker_cooldown = 0
+        breaker = self.manager._get_breaker('glm')
+        for _ in range(self.manager.breaker_threshold):
+            breaker.record_failure()
+        
+        async def handler(request):
+            if 'bigmodel' in str(request.url):
+                await asyncio.sleep(5)
+            return _completion('From deepseek')
+        self._use_transport(handler)
+        
+        async def run():
+            result = await self.manager.generate_summary('content', 'title')
+            await asyncio.sleep(0.01)
+            return result
+        
+        result = asyncio.run(run())
+        
+        assert result['service'] == 'deepseek'
+        assert breaker.state == breaker.HALF_OPEN
+        assert breaker.allow_request() is True
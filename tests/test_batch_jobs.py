@@ -0,0 +1,118 @@
+"""Tests for offline batch job module"""
+
+import json
+
+from mkdocs_ai_summary.ai_services import BATCH_ENDPOINT, AIServiceManager
+from mkdocs_ai_summary.batch_jobs import (
+    batch_custom_id,
+    main,
+    read_batch_requests,
+    read_batch_results,
+    run_local_batch,
+    split_custom_id,
+    write_batch_requests,
+)
+
+
+def make_requests(count=3, language='en'):
+    """Build batch requests the way the plugin exports them"""
+    manager = AIServiceManager(default_service='glm', model='glm-4-flash', max_tokens=300, temperature=0.3)
+    return [
+        manager.build_batch_request(
+            batch_custom_id(f'{i:032x}', f'{i + 100:032x}'),
+            f'Page {i} explains the cache layout. It also covers expiry rules. More details follow.',
+            f'Page {i}', language
+        )
+        for i in range(count)
+    ]
+
+
+class TestCustomId:
+    """Test cases for custom_id helpers"""
+    
+    def test_round_trip(self):
+        assert split_custom_id(batch_custom_id('abc', 'def')) == ('abc', 'def')
+    
+    def test_invalid(self):
+        assert split_custom_id('abc') is None
+        assert split_custom_id(':def') is None
+
+
+class TestBatchRequests:
+    """Test cases for exporting requests"""
+    
+    def test_openai_batch_format(self, tmp_path):
+        """Each line is a self-contained chat completion request"""
+        path = tmp_path / 'requests.jsonl'
+        
+        assert write_batch_requests(path, make_requests()) == 3
+        
+        lines = path.read_text(encoding='utf-8').splitlines()
+        first = json.loads(lines[0])
+        assert len(lines) == 3
+        assert first['method'] == 'POST'
+        assert first['url'] == BATCH_ENDPOINT
+        assert first['body']['model'] == 'glm-4-flash'
+        assert first['body']['max_tokens'] == 300
+        assert 'Title: Page 0' in first['body']['messages'][0]['content']
+        assert [request['custom_id'] for request in read_batch_requests(path)] == [
+            request['custom_id'] for request in make_requests()
+        ]
+
+
+class TestBatchResults:
+    """Test cases for reading results and the local stand-in"""
+    
+    def test_local_stand_in_round_trip(self, tmp_path):
+        """The local stand-in answers every request with an extractive summary"""
+        requests_path = tmp_path / 'requests.jsonl'
+        results_path = tmp_path / 'results.jsonl'
+        write_batch_requests(requests_path, make_requests(language='zh'))
+        
+        assert run_local_batch(requests_path, results_path) == 3
+        
+        results = read_batch_results(results_path)
+        assert sorted(results) == sorted(request['custom_id'] for request in make_requests())
+        assert results[batch_custom_id('0' * 32, f'{100:032x}')] == (
+            'Page 0 explains the cache layout. It also covers expiry rules. More details follow.'
+        )
+    
+    def test_failed_requests_are_skipped(self, tmp_path):
+        """Errors, non-200 responses and malformed lines are ignored"""
+        results_path = tmp_path / 'results.jsonl'
+        ok = {'custom_id': 'a:b', 'error': None, 'response': {
+            'status_code': 200, 'body': {'choices': [{'message': {'content': ' Summary text. '}}]}
+        }}
+        lines = [
+            json.dumps(ok),
+            json.dumps({'custom_id': 'c:d', 'response': None, 'error': {'code': 'rate_limited'}}),
+            json.dumps({'custom_id': 'e:f', 'error': None, 'response': {'status_code': 500, 'body': {}}}),
+            json.dumps({'custom_id': 'g:h', 'error': None, 'response': {'status_code': 200, 'body': {'choices': []}}}),
+            'not json',
+            '',
+        ]
+        results_path.write_text('\n'.join(lines), encoding='utf-8')
+        
+        assert read_batch_results(results_path) == {'a:b': 'Summary text.'}
+    
+    def test_stand_in_records_errors(self, tmp_path):
+        """A failing completion becomes an error line instead of aborting the file"""
+        requests_path = tmp_path / 'requests.jsonl'
+        results_path = tmp_path / 'results.jsonl'
+        write_batch_requests(requests_path, make_requests(2))
+        
+        def complete(batch_request):
+            if batch_request['custom_id'].startswith('0' * 32):
+                raise RuntimeError('boom')
+            return 'Generated summary text.'
+        
+        assert run_local_batch(requests_path, results_path, complete=complete) == 2
+        assert list(read_batch_results(results_path).values()) == ['Generated summary text.']
+    
+    def test_cli(self, tmp_path, capsys):
+        requests_path = tmp_path / 'requests.jsonl'
+        write_batch_requests(requests_path, make_requests(1))
+        
+        assert main([str(requests_path), str(tmp_path / 'out' / 'results.jsonl')]) == 0
+        assert len(read_batch_results(tmp_path / 'out' / 'results.jsonl')) == 1
+        assert '1' in capsys.readouterr().out
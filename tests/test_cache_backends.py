@@ -0,0 +1,234 @@
+"""Tests for cache backends module"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from mkdocs_ai_summary.cache_backends import (
+    JsonCacheBackend,
+    SQLiteCacheBackend,
+    ZLIB_ENTRY_MAGIC,
+    create_cache_backend,
+    decode_entry,
+    encode_entry,
+)
+
+
+ENTRY = {
+    'summary': '本文介绍了缓存条目的压缩格式。',
+    'service': 'glm',
+    'page_title': 'Cache',
+    'timestamp': '2026-10-01T12:00:00.000000',
+    'cache_version': '1.4.0',
+    'hash_algorithm': 'blake2b',
+    'content_hash': '0123456789abcdef0123456789abcdef',
+}
+
+
+class TestEntryCodec:
+    """Test cases for encode_entry/decode_entry"""
+    
+    def test_uncompressed_matches_indented_json(self):
+        """The default format is the same indented JSON as before"""
+        raw = encode_entry(ENTRY)
+        
+        assert raw == json.dumps(ENTRY, ensure_ascii=False, indent=2).encode('utf-8')
+        assert decode_entry(raw) == ENTRY
+    
+    def test_zlib_round_trip_is_smaller(self):
+        """Compressed entries decode transparently and are smaller"""
+        raw = encode_entry(ENTRY, 'zlib')
+        
+        assert raw.startswith(ZLIB_ENTRY_MAGIC)
+        assert len(raw) < len(encode_entry(ENTRY)) * 0.7
+        assert decode_entry(raw) == ENTRY
+    
+    def test_decodes_text(self):
+        """Text rows from older SQLite databases are still readable"""
+        assert decode_entry(json.dumps(ENTRY)) == ENTRY
+    
+    def test_corrupt_compressed_entry(self):
+        """Corrupt compressed data raises ValueError"""
+        with pytest.raises(ValueError):
+            decode_entry(ZLIB_ENTRY_MAGIC + b'garbage')
+
+
+class TestJsonCacheBackend:
+    """Test cases for JsonCacheBackend"""
+    
+    def test_set_get_delete(self, tmp_path):
+        """Entries round-trip through one JSON file each"""
+        backend = JsonCacheBackend(tmp_path)
+        backend.set('abc', {'summary': '摘要', 'content_hash': 'c1'})
+        
+        assert (tmp_path / 'abc.json').exists()
+        assert backend.get('abc')['summary'] == '摘要'
+        
+        backend.delete('abc')
+        assert backend.get('abc') is None
+    
+    def test_reserved_files_ignored(self, tmp_path):
+        """The service config file is never treated as an entry"""
+        (tmp_path / 'service_config.json').write_text('{}', encoding='utf-8')
+        backend = JsonCacheBackend(tmp_path)
+        backend.set('abc', {'summary': 's'})
+        
+        assert backend.keys() == ['abc']
+        assert backend.clear() == 1
+        assert (tmp_path / 'service_config.json').exists()
+    
+    def test_items_reports_corrupt_entries(self, tmp_path):
+        """Corrupt files are yielded with None data"""
+        (tmp_path / 'bad.json').write_text('not json', encoding='utf-8')
+        backend = JsonCacheBackend(tmp_path)
+        
+        assert list(backend.items()) == [('bad', None)]
+    
+    def test_set_leaves_no_temp_files(self, tmp_path):
+        """Entries are written through a temp file that is renamed into place"""
+        backend = JsonCacheBackend(tmp_path)
+        backend.set('abc', {'summary': 's'})
+        backend.set('abc', {'summary': 't'})
+        
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['abc.json']
+        assert backend.get('abc')['summary'] == 't'
+
+
+class TestCompressedJsonCacheBackend:
+    """Test cases for JsonCacheBackend with zlib compression"""
+    
+    def test_reads_existing_json_and_rewrites_compressed(self, tmp_path):
+        """Old .json entries stay readable and are replaced on the next write"""
+        JsonCacheBackend(tmp_path).set('abc', ENTRY)
+        backend = JsonCacheBackend(tmp_path, compression='zlib')
+        
+        assert backend.get('abc') == ENTRY
+        
+        backend.set('abc', ENTRY)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['abc.jsonz']
+        assert backend.get('abc') == ENTRY
+        assert JsonCacheBackend(tmp_path).get('abc') == ENTRY
+    
+    def test_keys_across_formats(self, tmp_path):
+        """Both file formats are listed, swept and cleared"""
+        JsonCacheBackend(tmp_path).set('old', ENTRY)
+        backend = JsonCacheBackend(tmp_path, compression='zlib')
+        backend.set('new', ENTRY)
+        (tmp_path / 'service_config.json').write_text('{}', encoding='utf-8')
+        
+        assert sorted(backend.keys()) == ['new', 'old']
+        assert backend.count() == 2
+        assert dict(backend.items()) == {'new': ENTRY, 'old': ENTRY}
+        assert sorted(backend.expired_keys(datetime.now() + timedelta(days=1))) == ['new', 'old']
+        
+        backend.delete('old')
+        assert backend.keys() == ['new']
+        assert backend.clear() == 1
+
+
+class TestSQLiteCacheBackend:
+    """Test cases for SQLiteCacheBackend"""
+    
+    def test_writes_are_batched_until_flush(self, tmp_path):
+        """Writes are visible immediately but committed on flush"""
+        backend = SQLiteCacheBackend(tmp_path)
+        backend.set('abc', {'summary': 's', 'content_hash': 'c1', 'timestamp': 't'})
+        
+        assert backend.get('abc')['summary'] == 's'
+        
+        other = SQLiteCacheBackend(tmp_path)
+        assert other.get('abc') is None
+        
+        backend.flush()
+        assert other.get('abc')['content_hash'] == 'c1'
+        
+        backend.close()
+        other.close()
+    
+    def test_uses_wal_journal(self, tmp_path):
+        """The database runs in WAL mode so parallel builds can share it"""
+        backend = SQLiteCacheBackend(tmp_path)
+        mode = backend._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        backend.close()
+        
+        assert mode == 'wal'
+    
+    def test_compressed_rows(self, tmp_path):
+        """Compressed rows are stored as blobs next to existing text rows"""
+        SQLiteCacheBackend(tmp_path).close()
+        plain = SQLiteCacheBackend(tmp_path)
+        plain.set('old', ENTRY)
+        plain.close()
+        
+        backend = SQLiteCacheBackend(tmp_path, compression='zlib')
+        backend.set('new', ENTRY)
+        backend.flush()
+        raw = backend._conn.execute("SELECT data FROM entries WHERE file_hash = 'new'").fetchone()[0]
+        
+        assert raw.startswith(ZLIB_ENTRY_MAGIC)
+        assert backend.get('new') == ENTRY
+        assert backend.get('old') == ENTRY
+        backend.close()
+    
+    def test_delete_and_count(self, tmp_path):
+        """Deletes are applied on flush and reflected in count"""
+        backend = SQLiteCacheBackend(tmp_path)
+        backend.set('a', {'summary': 's'})
+        backend.set('b', {'summary': 's'})
+        backend.flush()
+        backend.delete('a')
+        
+        assert backend.get('a') is None
+        assert backend.count() == 1
+        assert backend.keys() == ['b']
+        backend.close()
+    
+    def test_close_commits_pending_writes(self, tmp_path):
+        """Closing the backend commits buffered writes"""
+        backend = SQLiteCacheBackend(tmp_path)
+        backend.set('abc', {'summary': 's'})
+        backend.close()
+        
+        reopened = SQLiteCacheBackend(tmp_path)
+        assert reopened.get('abc') == {'summary': 's'}
+        reopened.close()
+    
+    def test_migrates_existing_json_cache(self, tmp_path):
+        """Existing JSON entries are imported once on first open"""
+        entry = {'summary': 'old', 'content_hash': 'c1', 'timestamp': '2025-01-01T00:00:00'}
+        (tmp_path / 'abc.json').write_text(json.dumps(entry), encoding='utf-8')
+        (tmp_path / 'service_config.json').write_text('{}', encoding='utf-8')
+        
+        backend = SQLiteCacheBackend(tmp_path)
+        assert backend.get('abc') == entry
+        assert backend.count() == 1
+        backend.clear()
+        backend.close()
+        
+        # The migration does not run again once recorded
+        reopened = SQLiteCacheBackend(tmp_path)
+        assert reopened.get('abc') is None
+        reopened.close()
+
+
+class TestCreateCacheBackend:
+    """Test cases for create_cache_backend"""
+    
+    def test_known_backends(self, tmp_path):
+        """Backends are created by name"""
+        assert isinstance(create_cache_backend('json', tmp_path), JsonCacheBackend)
+        backend = create_cache_backend('sqlite', tmp_path)
+        assert isinstance(backend, SQLiteCacheBackend)
+        backend.close()
+    
+    def test_compression_is_passed_through(self, tmp_path):
+        """The compression format is configured on the backend"""
+        assert create_cache_backend('json', tmp_path, compression='zlib').compression == 'zlib'
+        with pytest.raises(ValueError):
+            create_cache_backend('json', tmp_path, compression='lz4')
+    
+    def test_unknown_backend(self, tmp_path):
+        """Unknown backend names raise ValueError"""
+        with pytest.raises(ValueError):
+            create_cache_backend('redis', tmp_path)
@@ -7,7 +7,9 @@ import tempfile
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
-from mkdocs_ai_summary.cache_manager import CacheManager
+from mkdocs_ai_summary.cache_manager import (
+    CacheManager, MemoryCache, SourceIndex, CACHE_HIT, CACHE_MISS, CACHE_STALE, MANIFEST_FILE
+)
 
 
 class TestCacheManager:
@@ -308,4 +310,497 @@ class TestCacheManager:
         
         # Auto clean should not run during initialization
         # This is tested implicitly by not having expired entries cleaned
-        assert manager.auto_clean is False
\ No newline at end of file
+        assert manager.auto_clean is False
+
+class TestCacheManagerBackends:
+    """Test cases for CacheManager with pluggable backends"""
+    
+    @pytest.mark.parametrize('backend', ['json', 'sqlite'])
+    def test_save_and_read_summary(self, backend, tmp_path, monkeypatch):
+        """Summaries round-trip through every backend"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(backend=backend)
+        
+        manager.save_summary_cache('file_hash', {'summary': 'Cached', 'service': 'glm'}, 'content_hash')
+        
+        assert manager.is_content_changed('file_hash', 'content_hash') is False
+        assert manager.is_content_changed('file_hash', 'other_hash') is True
+        assert manager.get_cached_summary('file_hash')['summary'] == 'Cached'
+        assert manager.count_entries() == 1
+        manager.close()
+    
+    def test_sqlite_entries_survive_close(self, tmp_path, monkeypatch):
+        """Batched sqlite writes are committed when the manager closes"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(backend='sqlite')
+        manager.save_summary_cache('file_hash', {'summary': 'Cached', 'service': 'glm'}, 'content_hash')
+        manager.close()
+        
+        reopened = CacheManager(backend='sqlite')
+        assert reopened.get_cached_summary('file_hash')['summary'] == 'Cached'
+        reopened.close()
+    
+    def test_expired_entries_cleaned(self, tmp_path, monkeypatch):
+        """Expired entries are removed on startup"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(backend='sqlite')
+        manager.save_summary_cache('file_hash', {'summary': 'Cached', 'service': 'glm'}, 'content_hash')
+        manager.backend.set('old_hash', {
+            'summary': 'Old', 'timestamp': (datetime.now() - timedelta(days=31)).isoformat()
+        })
+        manager.close()
+        
+        reopened = CacheManager(backend='sqlite', clean_in_background=False)
+        assert reopened.backend.keys() == ['file_hash']
+        reopened.close()
+
+
+class TestLazyExpiry:
+    """Test cases for index-driven expiry sweeps"""
+    
+    def _write_expired(self, manager, keys):
+        old = (datetime.now() - timedelta(days=31)).isoformat()
+        for key in keys:
+            manager.backend.set(key, {'summary': 'Old', 'timestamp': old})
+            path = manager.cache_dir / f"{key}.json"
+            if path.exists():
+                old_mtime = (datetime.now() - timedelta(days=31)).timestamp()
+                os.utime(path, (old_mtime, old_mtime))
+        manager.backend.flush()
+    
+    @pytest.mark.parametrize('backend', ['json', 'sqlite'])
+    def test_sweep_does_not_parse_entries(self, backend, tmp_path, monkeypatch):
+        """Expired entries are found without loading them"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(backend=backend, auto_clean=False)
+        self._write_expired(manager, ['a', 'b'])
+        manager.save_summary_cache('fresh', {'summary': 'New'}, 'content_hash')
+        
+        with patch.object(manager.backend, 'get') as mock_get, \
+             patch.object(manager.backend, 'items') as mock_items:
+            manager._clean_expired_cache()
+        
+        mock_get.assert_not_called()
+        mock_items.assert_not_called()
+        assert manager.backend.keys() == ['fresh']
+        manager.close()
+    
+    @pytest.mark.parametrize('backend', ['json', 'sqlite'])
+    def test_sweep_respects_limit(self, backend, tmp_path, monkeypatch):
+        """At most clean_limit entries are removed per build"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(backend=backend, auto_clean=False, clean_limit=2)
+        self._write_expired(manager, ['a', 'b', 'c', 'd', 'e'])
+        
+        manager._clean_expired_cache()
+        
+        assert manager.count_entries() == 3
+        manager.close()
+    
+    def test_background_sweep_joined_on_close(self, tmp_path, monkeypatch):
+        """The background sweep finishes before the backend is closed"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(backend='sqlite', auto_clean=False)
+        self._write_expired(manager, ['a', 'b'])
+        manager.close()
+        
+        manager = CacheManager(backend='sqlite', clean_in_background=True)
+        manager.close()
+        
+        reopened = CacheManager(backend='sqlite', auto_clean=False)
+        assert reopened.count_entries() == 0
+        reopened.close()
+
+
+class TestCacheLookup:
+    """Test cases for CacheManager.lookup"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.manager = CacheManager()
+        self.manager.save_summary_cache('file_hash', {'summary': 'Cached', 'service': 'glm'}, 'content_hash')
+    
+    def teardown_method(self):
+        """Clean up test fixtures"""
+        self.manager.close()
+        os.chdir(self.old_cwd)
+    
+    def test_lookup_hit(self):
+        """Matching content hash returns the entry as a hit"""
+        status, entry = self.manager.lookup('file_hash', 'content_hash')
+        
+        assert status == CACHE_HIT
+        assert entry['summary'] == 'Cached'
+    
+    def test_lookup_stale(self):
+        """Changed content returns the existing entry as stale"""
+        status, entry = self.manager.lookup('file_hash', 'new_content_hash')
+        
+        assert status == CACHE_STALE
+        assert entry['summary'] == 'Cached'
+    
+    def test_lookup_miss(self):
+        """Unknown file hashes are a miss"""
+        assert self.manager.lookup('unknown', 'content_hash') == (CACHE_MISS, None)
+    
+    def test_lookup_expired_is_miss(self):
+        """Expired entries are removed and reported as a miss"""
+        self.manager.backend.set('old_hash', {
+            'summary': 'Old', 'content_hash': 'content_hash',
+            'timestamp': (datetime.now() - timedelta(days=31)).isoformat()
+        })
+        
+        assert self.manager.lookup('old_hash', 'content_hash') == (CACHE_MISS, None)
+        assert self.manager.backend.get('old_hash') is None
+    
+    def test_lookup_keeps_unreadable_entry(self):
+        """Unreadable entries are a miss but stay on disk"""
+        manager = CacheManager(auto_clean=False)
+        with patch.object(manager.backend, 'get', side_effect=OSError('busy')):
+            assert manager.lookup('file_hash', 'content_hash') == (CACHE_MISS, None)
+            assert manager.get_cached_summary('file_hash') is None
+        manager.close()
+        
+        assert self.manager.backend.get('file_hash')['summary'] == 'Cached'
+    
+    def test_lookup_reads_once(self):
+        """A lookup performs a single backend read"""
+        # A fresh manager has no manifest entries, so the lookup goes to the backend
+        manager = CacheManager(auto_clean=False)
+        with patch.object(manager.backend, 'get', wraps=manager.backend.get) as mock_get:
+            status, _ = manager.lookup('file_hash', 'content_hash')
+        manager.close()
+        
+        assert status == CACHE_HIT
+        assert mock_get.call_count == 1
+    
+    def test_lookup_disabled(self):
+        """Disabled caches always miss"""
+        self.manager.enabled = False
+        
+        assert self.manager.lookup('file_hash', 'content_hash') == (CACHE_MISS, None)
+
+
+
+class TestContentDedup:
+    """Test cases for content-addressed summary reuse"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+    
+    def teardown_method(self):
+        """Clean up test fixtures"""
+        os.chdir(self.old_cwd)
+    
+    def test_identical_content_at_other_path_is_hit(self):
+        """A page with the same content reuses the existing summary"""
+        manager = CacheManager(auto_clean=False, dedup_identity='glm/glm-4-flash/prompt-v1')
+        manager.save_summary_cache('v1_hash', {'summary': 'Shared', 'service': 'glm'}, 'content_hash')
+        
+        status, entry = manager.lookup('v2_hash', 'content_hash')
+        
+        assert status == CACHE_HIT
+        assert entry['summary'] == 'Shared'
+        assert manager.backend.get('v2_hash')['content_key'] == manager.content_key('content_hash')
+        assert manager.dedup_hits == 1
+        manager.close()
+    
+    def test_index_survives_via_manifest(self):
+        """The content index is rebuilt from the build manifest"""
+        manager = CacheManager(auto_clean=False, dedup_identity='glm/glm-4-flash/prompt-v1')
+        manager.save_summary_cache('v1_hash', {'summary': 'Shared', 'service': 'glm'}, 'content_hash')
+        manager.save_manifest()
+        manager.close()
+        
+        reopened = CacheManager(auto_clean=False, dedup_identity='glm/glm-4-flash/prompt-v1')
+        reopened.load_manifest()
+        
+        assert reopened.lookup('v2_hash', 'content_hash')[0] == CACHE_HIT
+        reopened.close()
+    
+    def test_other_model_or_disabled_is_miss(self):
+        """Summaries are only reused for the same model and prompt version"""
+        manager = CacheManager(auto_clean=False, dedup_identity='glm/glm-4-flash/prompt-v1')
+        manager.save_summary_cache('v1_hash', {'summary': 'Shared', 'service': 'glm'}, 'content_hash')
+        manager.save_manifest()
+        manager.close()
+        
+        other_model = CacheManager(auto_clean=False, dedup_identity='openai/gpt-4o/prompt-v1')
+        other_model.load_manifest()
+        assert other_model.lookup('v2_hash', 'content_hash') == (CACHE_MISS, None)
+        other_model.close()
+        
+        disabled = CacheManager(auto_clean=False)
+        disabled.load_manifest()
+        assert disabled.lookup('v2_hash', 'content_hash') == (CACHE_MISS, None)
+        disabled.close()
+    
+    def test_changed_source_entry_is_not_reused(self):
+        """An index entry whose page changed no longer matches"""
+        manager = CacheManager(auto_clean=False, dedup_identity='glm/glm-4-flash/prompt-v1')
+        manager.save_summary_cache('v1_hash', {'summary': 'Old', 'service': 'glm'}, 'content_hash')
+        manager.save_summary_cache('v1_hash', {'summary': 'New', 'service': 'glm'}, 'new_content_hash')
+        
+        assert manager.lookup('v2_hash', 'content_hash') == (CACHE_MISS, None)
+        manager.close()
+
+
+class TestMemoryCache:
+    """Test cases for the in-process LRU layer"""
+    
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first"""
+        cache = MemoryCache(max_entries=2)
+        cache.put('a', 'c', {'summary': 'A'})
+        cache.put('b', 'c', {'summary': 'B'})
+        cache.get('a', 'c')
+        cache.put('d', 'c', {'summary': 'D'})
+        
+        assert cache.get('b', 'c') is None
+        assert cache.get('a', 'c')['summary'] == 'A'
+        assert len(cache) == 2
+    
+    def test_keyed_by_content_hash(self):
+        """Entries only match the exact content hash"""
+        cache = MemoryCache()
+        cache.put('a', 'c1', {'summary': 'A'})
+        
+        assert cache.get('a', 'c2') is None
+    
+    def test_disabled_when_empty(self):
+        """A zero-sized cache stores nothing"""
+        cache = MemoryCache(max_entries=0)
+        cache.put('a', 'c', {'summary': 'A'})
+        
+        assert len(cache) == 0
+    
+    def test_lookup_served_from_memory(self, tmp_path, monkeypatch):
+        """Rebuilds read unchanged pages without touching the backend"""
+        monkeypatch.chdir(tmp_path)
+        memory_cache = MemoryCache()
+        manager = CacheManager(memory_cache=memory_cache)
+        manager.save_summary_cache('file_hash', {'summary': 'Cached', 'service': 'glm'}, 'content_hash')
+        
+        # A new manager for the next build shares the memory layer
+        rebuilt = CacheManager(memory_cache=memory_cache)
+        with patch.object(rebuilt.backend, 'get') as mock_get:
+            status, entry = rebuilt.lookup('file_hash', 'content_hash')
+        
+        assert status == CACHE_HIT
+        assert entry['summary'] == 'Cached'
+        mock_get.assert_not_called()
+    
+    def test_disk_hit_populates_memory(self, tmp_path, monkeypatch):
+        """Entries read from disk are kept in memory for the next lookup"""
+        monkeypatch.chdir(tmp_path)
+        CacheManager().save_summary_cache('file_hash', {'summary': 'Cached'}, 'content_hash')
+        
+        memory_cache = MemoryCache()
+        manager = CacheManager(memory_cache=memory_cache)
+        manager.lookup('file_hash', 'content_hash')
+        
+        assert memory_cache.get('file_hash', 'content_hash')['summary'] == 'Cached'
+    
+    def test_clear_all_cache_clears_memory(self, tmp_path, monkeypatch):
+        """Clearing the cache also drops the memory layer"""
+        monkeypatch.chdir(tmp_path)
+        memory_cache = MemoryCache()
+        manager = CacheManager(memory_cache=memory_cache)
+        manager.save_summary_cache('file_hash', {'summary': 'Cached'}, 'content_hash')
+        
+        manager.clear_all_cache()
+        
+        assert len(memory_cache) == 0
+
+
+class TestSourceIndex:
+    """Test cases for the source file stat index"""
+    
+    def test_unchanged_file_reuses_hashes(self, tmp_path):
+        """A file with the same mtime and size returns the recorded hashes"""
+        page = tmp_path / 'page.md'
+        page.write_text('# Page', encoding='utf-8')
+        index = SourceIndex()
+        stat = SourceIndex.stat(str(page))
+        index.put(str(page), stat, 'file_hash', 'content_hash', 'zh')
+        
+        assert index.get(str(page), SourceIndex.stat(str(page))) == ('file_hash', 'content_hash', 'zh')
+    
+    def test_changed_file_misses(self, tmp_path):
+        """Changing the file invalidates its record"""
+        page = tmp_path / 'page.md'
+        page.write_text('# Page', encoding='utf-8')
+        index = SourceIndex()
+        index.put(str(page), SourceIndex.stat(str(page)), 'file_hash', 'content_hash', 'zh')
+        
+        page.write_text('# Page, edited', encoding='utf-8')
+        
+        assert index.get(str(page), SourceIndex.stat(str(page))) is None
+    
+    def test_missing_file(self, tmp_path):
+        """Missing files have no stat and are never recorded"""
+        index = SourceIndex()
+        missing = str(tmp_path / 'missing.md')
+        
+        assert SourceIndex.stat(missing) is None
+        index.put(missing, None, 'file_hash', 'content_hash', 'zh')
+        assert len(index) == 0
+    
+    def test_round_trip(self, tmp_path):
+        """Records confirmed in this build survive a save and load"""
+        page = tmp_path / 'page.md'
+        page.write_text('# Page', encoding='utf-8')
+        index = SourceIndex(('zh', 'blake2b'))
+        index.put('page.md', SourceIndex.stat(str(page)), 'file_hash', 'content_hash', 'zh')
+        
+        restored = SourceIndex(('zh', 'blake2b'))
+        
+        assert restored.load(json.loads(json.dumps(index.to_dict())))
+        assert restored.get('page.md', SourceIndex.stat(str(page))) == ('file_hash', 'content_hash', 'zh')
+    
+    def test_saves_paths_relative_to_docs_dir(self, tmp_path):
+        """Saved keys are relative to docs_dir and restore under another checkout"""
+        page = tmp_path / 'docs' / 'guide' / 'page.md'
+        page.parent.mkdir(parents=True)
+        page.write_text('# Page', encoding='utf-8')
+        index = SourceIndex(('zh', 'md5'))
+        index.put(str(page), SourceIndex.stat(str(page)), 'file_hash', 'content_hash', 'zh')
+        index.put(str(tmp_path / 'outside.md'), (1, 2), 'other_hash', 'other_content', 'zh')
+        
+        data = index.to_dict(base=str(tmp_path / 'docs'))
+        restored = SourceIndex(('zh', 'md5'))
+        restored.load(data, base=os.path.join('/checkout', 'docs'))
+        
+        assert list(data['files']) == ['guide/page.md']
+        restored_key = os.path.normpath(os.path.join('/checkout', 'docs', 'guide', 'page.md'))
+        assert restored.get(restored_key, SourceIndex.stat(str(page))) == ('file_hash', 'content_hash', 'zh')
+    
+    def test_load_rejects_other_fingerprint(self):
+        """Records saved under another configuration are ignored"""
+        index = SourceIndex(('zh', 'md5'))
+        index.put('page.md', (1, 2), 'file_hash', 'content_hash', 'zh')
+        
+        assert SourceIndex(('en', 'md5')).load(index.to_dict()) is False
+    
+    def test_verified_only_within_build(self):
+        """Records are trusted without a stat only after being checked in the current build"""
+        index = SourceIndex()
+        index.put('page.md', (1, 2), 'file_hash', 'content_hash', 'zh')
+        assert index.get_verified('page.md') == ('file_hash', 'content_hash', 'zh')
+        
+        index.begin_build()
+        
+        assert index.get_verified('page.md') is None
+        assert index.get('page.md', (1, 2)) is not None
+        assert index.get_verified('page.md') is not None
+
+
+class TestBuildManifest:
+    """Test cases for the build-wide cache manifest"""
+    
+    def test_manifest_stores_pointers_only(self, tmp_path, monkeypatch):
+        """The manifest records hashes that point to entries, not the entries themselves"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(auto_clean=False, dedup_identity='glm/glm-4-flash/prompt-v1')
+        manager.save_summary_cache('file_hash', {'summary': 'Cached summary', 'service': 'glm',
+                                                 'minhash': 'm1:signature'}, 'content_hash')
+        manager.save_manifest()
+        
+        text = (tmp_path / '.ai_cache' / MANIFEST_FILE).read_text(encoding='utf-8')
+        assert 'Cached summary' not in text and 'm1:signature' not in text
+        assert json.loads(text)['scopes']['']['entries'] == {
+            'file_hash': ['content_hash', manager.content_key('content_hash')]
+        }
+        
+        rebuilt = CacheManager(auto_clean=False)
+        rebuilt.load_manifest()
+        assert rebuilt.lookup('file_hash', 'content_hash')[1]['summary'] == 'Cached summary'
+    
+    def test_scopes_do_not_overwrite_each_other(self, tmp_path, monkeypatch):
+        """Builds of different docs_dirs keep their own manifest section"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'site-a' / 'docs').mkdir(parents=True)
+        (tmp_path / 'site-b' / 'docs').mkdir(parents=True)
+        site_a = CacheManager(auto_clean=False)
+        site_a.load_manifest(scope=site_a.manifest_scope(str(tmp_path / 'site-a' / 'docs')))
+        site_b = CacheManager(auto_clean=False)
+        site_b.load_manifest(scope=site_b.manifest_scope(str(tmp_path / 'site-b' / 'docs')))
+        
+        site_a.save_summary_cache('a_hash', {'summary': 'A'}, 'c1')
+        site_a.save_manifest({'fingerprint': [], 'files': {'a.md': []}})
+        site_b.save_summary_cache('b_hash', {'summary': 'B'}, 'c2')
+        site_b.save_manifest({'fingerprint': [], 'files': {'b.md': []}})
+        
+        assert CacheManager(auto_clean=False).load_manifest(scope='site-a/docs')['files'] == {'a.md': []}
+        assert CacheManager(auto_clean=False).load_manifest(scope='site-b/docs')['files'] == {'b.md': []}
+    
+    def test_stale_and_absolute_scopes_are_dropped(self, tmp_path, monkeypatch):
+        """Saving drops scopes whose docs_dir is gone and old absolute-path scopes"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'docs').mkdir()
+        (tmp_path / 'old-docs').mkdir()
+        old = CacheManager(auto_clean=False)
+        old.load_manifest(scope='old-docs')
+        old.save_summary_cache('old_hash', {'summary': 'Old'}, 'c1')
+        old.save_manifest({'fingerprint': [], 'files': {}})
+        data = json.loads(old.manifest_file.read_text(encoding='utf-8'))
+        data['scopes'][str(tmp_path / 'docs')] = {'entries': {}, 'sources': {}}
+        old.manifest_file.write_text(json.dumps(data), encoding='utf-8')
+        (tmp_path / 'old-docs').rmdir()
+        
+        manager = CacheManager(auto_clean=False)
+        manager.load_manifest(scope=manager.manifest_scope('docs'))
+        manager.save_summary_cache('file_hash', {'summary': 'New'}, 'c2')
+        manager.save_manifest({'fingerprint': [], 'files': {}})
+        
+        data = json.loads(manager.manifest_file.read_text(encoding='utf-8'))
+        assert list(data['scopes']) == ['docs']
+    
+    def test_unchanged_build_does_not_rewrite(self, tmp_path, monkeypatch):
+        """A build that hits every entry leaves the manifest untouched"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(auto_clean=False)
+        manager.save_summary_cache('file_hash', {'summary': 'Cached'}, 'content_hash')
+        manager.save_manifest({'fingerprint': [], 'files': {}})
+        
+        rebuilt = CacheManager(auto_clean=False)
+        sources = rebuilt.load_manifest()
+        rebuilt.lookup('file_hash', 'content_hash')
+        with patch('mkdocs_ai_summary.cache_manager.json.dump') as mock_dump:
+            rebuilt.save_manifest(sources)
+        
+        mock_dump.assert_not_called()
+    
+    def test_unused_entries_dropped(self, tmp_path, monkeypatch):
+        """Entries not used in a build are left out of the next manifest"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(auto_clean=False)
+        manager.save_summary_cache('kept', {'summary': 'Kept'}, 'c1')
+        manager.save_summary_cache('removed', {'summary': 'Removed'}, 'c2')
+        manager.save_manifest()
+        
+        rebuilt = CacheManager(auto_clean=False)
+        rebuilt.load_manifest()
+        rebuilt.lookup('kept', 'c1')
+        rebuilt.save_manifest()
+        
+        with open(tmp_path / '.ai_cache' / MANIFEST_FILE, encoding='utf-8') as f:
+            assert list(json.load(f)['scopes']['']['entries']) == ['kept']
+    
+    def test_other_hash_algorithm_ignored(self, tmp_path, monkeypatch):
+        """A manifest written with another hash algorithm is not used"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(auto_clean=False, hash_algorithm='md5')
+        manager.save_summary_cache('file_hash', {'summary': 'Cached'}, 'content_hash')
+        manager.save_manifest({'fingerprint': ['zh', 'md5'], 'files': {}})
+        
+        rebuilt = CacheManager(auto_clean=False, hash_algorithm='blake2b')
+        
+        assert rebuilt.load_manifest() == {}
+
@@ -0,0 +1,49 @@
+"""Tests for the reference remote cache server"""
+
+import threading
+
+import pytest
+import requests
+
+from mkdocs_ai_summary.cache_server import create_server
+
+
+ENTRY_PATH = '/' + 'aa' * 16 + '/' + 'bb' * 16
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Start a token-protected server on a random port"""
+    server = create_server('127.0.0.1', 0, tmp_path, token='secret')
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestCacheServer:
+    """Test cases for the reference cache server"""
+    
+    def test_round_trip_with_token(self, server):
+        """Entries can be stored and read back with the token"""
+        headers = {'Authorization': 'Bearer secret'}
+        
+        assert requests.get(server + ENTRY_PATH, headers=headers).status_code == 404
+        put = requests.put(server + ENTRY_PATH, json={'summary': 's'}, headers=headers)
+        assert put.status_code == 204
+        assert requests.get(server + ENTRY_PATH, headers=headers).json() == {'summary': 's'}
+    
+    def test_requires_token(self, server):
+        """Requests without the token are rejected"""
+        assert requests.get(server + ENTRY_PATH).status_code == 401
+        assert requests.put(server + ENTRY_PATH, json={'summary': 's'}).status_code == 401
+    
+    def test_rejects_invalid_paths_and_bodies(self, server, tmp_path):
+        """Only hex keys and summary entries are accepted"""
+        headers = {'Authorization': 'Bearer secret'}
+        
+        assert requests.get(server + '/../etc/passwd', headers=headers).status_code == 400
+        assert requests.put(server + ENTRY_PATH, json=['x'], headers=headers).status_code == 400
+        assert requests.put(server + ENTRY_PATH, data=b'not json', headers=headers).status_code == 400
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,75 @@
+"""Tests for circuit breaker module"""
+
+from unittest.mock import patch
+
+from mkdocs_ai_summary.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker"""
+    
+    def test_trips_after_consecutive_failures(self):
+        """The breaker opens once the threshold is reached"""
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+        
+        assert breaker.record_failure() is False
+        assert breaker.record_failure() is False
+        assert breaker.record_failure() is True
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+        assert breaker.snapshot() == {
+            'state': 'open', 'consecutive_failures': 3, 'trips': 1, 'skipped': 1
+        }
+    
+    def test_success_resets_failure_count(self):
+        """Failures must be consecutive to trip the breaker"""
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request() is True
+    
+    def test_half_open_allows_single_probe(self):
+        """After the cooldown only one probe is let through"""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+        with patch('mkdocs_ai_summary.circuit_breaker.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        
+        with patch('mkdocs_ai_summary.circuit_breaker.time.monotonic', return_value=111.0):
+            assert breaker.allow_request() is True
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow_request() is False
+        
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_failed_probe_reopens(self):
+        """A failed probe opens the breaker for another cooldown"""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+        with patch('mkdocs_ai_summary.circuit_breaker.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        
+        with patch('mkdocs_ai_summary.circuit_breaker.time.monotonic', return_value=111.0):
+            assert breaker.allow_request() is True
+            assert breaker.record_failure() is True
+            assert breaker.allow_request() is False
+        
+        assert breaker.snapshot()['trips'] == 2
+    
+    def test_released_probe_lets_next_probe_through(self):
+        """Releasing the probe neither closes nor reopens the breaker"""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+        with patch('mkdocs_ai_summary.circuit_breaker.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        
+        with patch('mkdocs_ai_summary.circuit_breaker.time.monotonic', return_value=111.0):
+            assert breaker.allow_request() is True
+            breaker.release_probe()
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow_request() is True
+            assert breaker.allow_request() is False
+        
+        assert breaker.snapshot()['trips'] == 1
@@ -0,0 +1,99 @@
+"""Tests for the command line interface"""
+
+from importlib.metadata import EntryPoint
+from unittest.mock import patch
+
+import pytest
+from mkdocs.config.defaults import MkDocsConfig
+
+from mkdocs_ai_summary.ai_services import AIServiceManager
+from mkdocs_ai_summary.cli import main
+from mkdocs_ai_summary.plugin import AISummaryPlugin
+
+
+SUMMARY = 'A valid summary generated for the warm-up test.'
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Create a small MkDocs project and register the plugin entry point"""
+    (tmp_path / 'docs' / 'blog').mkdir(parents=True)
+    for name in ('one', 'two', 'three'):
+        (tmp_path / 'docs' / 'blog' / f'{name}.md').write_text(f'# {name}\n\nPost {name} content.', encoding='utf-8')
+    (tmp_path / 'docs' / 'about.md').write_text('# About\n\nNot in an enabled folder.', encoding='utf-8')
+    (tmp_path / 'mkdocs.yml').write_text(
+        "site_name: test\n"
+        "plugins:\n"
+        "  - ai-summary:\n"
+        "      ai_service: glm\n"
+        "      fallback_services: []\n"
+        "      enabled_folders: ['blog/']\n"
+        "      exclude_files: []\n"
+        "      ci_cache_only: true\n",
+        encoding='utf-8'
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GLM_API_KEY', 'key')
+    
+    # The plugin entry point only exists once the package is installed; MkDocs also reuses
+    # plugin instances (and their in-memory summary cache) across loads, so start each test fresh
+    entry_point = EntryPoint('ai-summary', 'mkdocs_ai_summary.plugin:AISummaryPlugin', 'mkdocs.plugins')
+    with patch.dict(MkDocsConfig.plugins.installed_plugins, {'ai-summary': entry_point}), \
+         patch.dict(MkDocsConfig.plugins.plugin_cache, clear=True):
+        yield tmp_path
+
+
+class TestWarmCommand:
+    """Test cases for `mkdocs-ai-summary warm`"""
+    
+    def test_dry_run_makes_no_requests(self, project, capsys):
+        with patch.object(AIServiceManager, '_request_completion') as mock_request:
+            assert main(['warm', '--dry-run']) == 0
+        
+        mock_request.assert_not_called()
+        assert '3 个需要生成' in capsys.readouterr().out
+    
+    def test_warm_fills_cache_and_resumes(self, project, capsys):
+        """Failed pages are retried by the next run; cached pages are skipped"""
+        calls = []
+        
+        def fake_request(name, config, prompt, max_tokens=None):
+            calls.append(prompt)
+            if len(calls) == 2:
+                raise RuntimeError('service down')
+            return SUMMARY
+        
+        with patch.object(AIServiceManager, '_request_completion', side_effect=fake_request):
+            assert main(['warm', '-j', '2', '--checkpoint', '2']) == 1
+            assert len(calls) == 3
+            
+            assert main(['warm']) == 0
+            assert len(calls) == 4
+            
+            assert main(['warm']) == 0
+            assert len(calls) == 4
+        
+        output = capsys.readouterr().out
+        assert '[3/3]' in output
+        assert '0 个需要生成' in output
+        assert (project / '.ai_cache').is_dir()
+    
+    def test_interrupt_keeps_finished_pages(self, project, capsys):
+        """Ctrl-C reports what was saved and the next run generates only the rest"""
+        def interrupted(plugin, jobs):
+            yield jobs[0], {'summary': SUMMARY, 'service': 'glm'}
+            raise KeyboardInterrupt
+        
+        with patch.object(AISummaryPlugin, '_generate_jobs', interrupted):
+            assert main(['warm']) == 130
+        assert '已保存 1 个摘要，2 个页面未完成' in capsys.readouterr().out
+        
+        with patch.object(AIServiceManager, '_request_completion', return_value=SUMMARY) as mock_request:
+            assert main(['warm']) == 0
+        assert mock_request.call_count == 2
+    
+    def test_missing_plugin(self, project, capsys):
+        (project / 'mkdocs.yml').write_text('site_name: test\n', encoding='utf-8')
+        
+        assert main(['warm']) == 1
+        assert 'ai-summary' in capsys.readouterr().out
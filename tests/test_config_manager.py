@@ -130,6 +130,15 @@ class TestConfigManager(unittest.TestCase):
         manager = ConfigManager(config)
         self.assertFalse(manager.should_generate_new_summary())
 
+    def test_should_generate_new_summary_batch_export(self):
+        """Test should_generate_new_summary while exporting batch requests."""
+        config = self.config.copy()
+        config['batch_job_export'] = 'requests.jsonl'
+        
+        with patch.dict(os.environ, {}, clear=True):
+            manager = ConfigManager(config)
+            self.assertFalse(manager.should_generate_new_summary())
+
     def test_log_environment_status_local(self):
         """Test log_environment_status in local environment."""
         with patch.dict(os.environ, {}, clear=True):
@@ -338,4 +338,174 @@ More content here.
         # Test exact folder match
         mock_page.file.src_path = 'blog/post.md'
         result = self.processor.should_generate_summary(mock_page)
-        assert result is True
\ No newline at end of file
+        assert result is True
+
+class TestCleanContentEquivalence:
+    """The optimized cleaner must match the legacy regex chain byte for byte"""
+    
+    CASES = [
+        '',
+        'plain text',
+        '---\ntitle: Post\n---\n\n# Title\n\nBody',
+        'No front matter --- here ---',
+        '# Doc\n\n!!! info "📖 阅读信息"\n    约 3 分钟\n\nBody\n\n!!! abstract "🤖 AI摘要"\n    old\n# Next',
+        'Text\n\n```python\nprint("x")\n```\n\nMore `inline` code',
+        'Unclosed ```fence\nstill open',
+        '````four\nticks````',
+        '`a```b```',
+        '[![Badge](https://img.shields.io/b.svg)](https://pypi.org/)',
+        'See [`Client`](#client) and [docs](https://example.com).',
+        '<!-- ![Preview](https://example.com/p.png) -->\n<div align="center">\n<b>bold</b>\n</div>',
+        'Trailing spaces  \n\n\n\n  \n\nnext',
+    ]
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.processor = ContentProcessor(
+            enabled_folders=[], exclude_patterns=[], exclude_files=[], summary_language='zh'
+        )
+    
+    @pytest.mark.parametrize('markdown', CASES)
+    def test_known_cases(self, markdown):
+        """Hand-picked documents produce identical output"""
+        assert self.processor.clean_content_for_ai(markdown) == self.processor._clean_content_legacy(markdown)
+    
+    def test_random_documents(self):
+        """Random mixes of markup tokens produce identical output"""
+        import random
+        
+        tokens = ['`', '```', '```py\nx\n```', '[', ']', '(', ')', '![', '](', '<', '>', '!',
+                  '\n', '\n\n', ' ', '\t', 'word', '# H', '---\n', '[l](u)', '![i](s)',
+                  '<b>', '!!! info "📖 阅读信息"', '!!! abstract "🤖 AI摘要"']
+        rng = random.Random(12)
+        for _ in range(3000):
+            markdown = ''.join(rng.choice(tokens) for _ in range(rng.randint(0, 40)))
+            assert self.processor.clean_content_for_ai(markdown) == self.processor._clean_content_legacy(markdown), markdown
+    
+    def test_fenced_code_pattern_matches_lazy_form(self):
+        """The unrolled fence pattern finds the same spans as ```.*?``` with DOTALL"""
+        import re
+        from mkdocs_ai_summary.content_processor import FENCED_CODE_PATTERN
+        
+        lazy = re.compile(r'```.*?```', re.DOTALL)
+        for text in ['```a```', '``` a\n`` b ``` c ```', '`````', '``````', '```x````y```', '``` ` `` ```']:
+            assert [m.span() for m in FENCED_CODE_PATTERN.finditer(text)] == [m.span() for m in lazy.finditer(text)]
+
+
+class TestBudgetCleaning:
+    """Budget-aware cleaning stops once the prompt has enough text"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.processor = ContentProcessor(
+            enabled_folders=[], exclude_patterns=[], exclude_files=[], summary_language='zh'
+        )
+    
+    def _long_page(self, sections=400):
+        parts = ['---\ntitle: API\n---\n']
+        for i in range(sections):
+            parts.append(f'## Section {i}\n\nSee [docs](https://example.com/{i}) and `call_{i}()`.  \n\n'
+                         f'```python\n\nprint({i})\n\n```\n\n<div>Paragraph {i} text.</div>')
+        return '\n\n'.join(parts)
+    
+    def test_budget_output_is_prefix_of_full_output(self):
+        """The budgeted result starts the same way as a full clean"""
+        markdown = self._long_page()
+        full = self.processor.clean_content_for_ai(markdown)
+        partial = self.processor.clean_content_for_ai(markdown, budget=2000)
+        
+        assert 2000 < len(partial) < len(full)
+        assert full.startswith(partial)
+        assert self.processor.truncate_content(partial) == self.processor.truncate_content(full)
+    
+    def test_short_page_is_cleaned_completely(self):
+        """Pages shorter than the budget produce the full result"""
+        markdown = self._long_page(sections=3)
+        
+        assert self.processor.clean_content_for_ai(markdown, budget=2000) == \
+            self.processor.clean_content_for_ai(markdown)
+    
+    def test_stops_after_budget(self):
+        """Blocks after the budget is reached are never cleaned"""
+        markdown = self._long_page(sections=2000)
+        cleaned_blocks = []
+        original = self.processor._clean_block
+        self.processor._clean_block = lambda block: cleaned_blocks.append(block) or original(block)
+        
+        self.processor.clean_content_for_ai(markdown, budget=2000)
+        
+        assert sum(len(block) for block in cleaned_blocks) < len(markdown) / 10
+    
+    def test_comment_spanning_blank_lines_is_removed(self):
+        """A multi-paragraph HTML comment across a block boundary does not leak"""
+        markdown = 'Intro sentence `code` here. ' * 72 + '\n<!-- note\n\nSECRET\n\n-->\n\n' + 'Tail text. ' * 300
+        
+        partial = self.processor.clean_content_for_ai(markdown, budget=2000)
+        
+        assert 'SECRET' not in partial
+        assert self.processor.truncate_content(partial) == \
+            self.processor.truncate_content(self.processor.clean_content_for_ai(markdown))
+    
+    def test_random_documents_match_full_clean(self):
+        """Budgeted and full cleaning give the same prompt for random pages"""
+        import random
+        
+        tokens = ['Some words here. ', 'More prose follows。', '\n\n', '\n', '`', '``', '```', '```py\n\nx\n\n```',
+                  '`a\n\nb`', '[', ']', '(', ')', '](', '![i](s)', '[l](u)', '[multi\n\nline](https://x.org)',
+                  '[a](b\n\nc)', '[`Code`](#x)', '<', '>', '<!-- note', '-->', '<div\n\nclass="x">', '</div>', '# H',
+                  '!!! abstract "🤖 AI摘要"', 'SECRET']
+        rng = random.Random(13)
+        for _ in range(300):
+            markdown = ''.join(rng.choice(tokens) for _ in range(rng.randint(100, 600)))
+            full = self.processor.truncate_content(self.processor.clean_content_for_ai(markdown))
+            partial = self.processor.truncate_content(self.processor.clean_content_for_ai(markdown, budget=2000))
+            assert partial == full, markdown
+    
+    def test_stops_early_on_reference_pages(self):
+        """Links that leave brackets behind (code titles, badges) do not force a full clean"""
+        sections = [
+            f'## `call_{i}`\n\nSee [`Client.call_{i}`](#call-{i}) and '
+            f'[![Badge](https://img.shields.io/b{i}.svg)](https://pypi.org/).'
+            for i in range(2000)
+        ]
+        markdown = '\n\n'.join(sections)
+        cleaned_blocks = []
+        original = self.processor._clean_block
+        self.processor._clean_block = lambda block: cleaned_blocks.append(block) or original(block)
+        
+        partial = self.processor.clean_content_for_ai(markdown, budget=2000)
+        
+        assert sum(len(block) for block in cleaned_blocks) < len(markdown) / 10
+        self.processor._clean_block = original
+        assert self.processor.truncate_content(partial) == \
+            self.processor.truncate_content(self.processor.clean_content_for_ai(markdown))
+    
+    def test_blocks_do_not_split_fenced_code(self):
+        """Block boundaries never fall inside a fenced code block"""
+        markdown = self._long_page(sections=50)
+        
+        for block in self.processor._iter_raw_blocks(markdown, 100):
+            assert block.count('```') % 2 == 0
+
+
+class TestRegenerationOverride:
+    """The ai_summary_regenerate front matter flag"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.processor = ContentProcessor(
+            enabled_folders=[], exclude_patterns=[], exclude_files=[], summary_language='zh'
+        )
+    
+    def test_flag_enabled(self):
+        page = Mock()
+        page.meta = {'ai_summary_regenerate': True}
+        
+        assert self.processor.is_regeneration_forced(page) is True
+    
+    def test_flag_missing_or_not_true(self):
+        """Only an explicit boolean true forces regeneration"""
+        for meta in ({}, None, {'ai_summary_regenerate': 'yes'}, {'ai_summary_regenerate': False}):
+            page = Mock()
+            page.meta = meta
+            assert self.processor.is_regeneration_forced(page) is False
@@ -0,0 +1,54 @@
+"""Tests for hashing module"""
+
+import hashlib
+
+import pytest
+
+from mkdocs_ai_summary import hashing
+from mkdocs_ai_summary.hashing import hash_text, resolve_hash_algorithm
+
+
+class TestHashText:
+    """Test cases for hash_text"""
+    
+    def test_md5_matches_joined_string(self):
+        """md5 digests equal the old f-string based hashes"""
+        expected = hashlib.md5('blog/post.md_zh'.encode('utf-8')).hexdigest()
+        
+        assert hash_text('blog/post.md', 'zh', algorithm='md5') == expected
+    
+    def test_blake2b_digest_length(self):
+        """blake2b keys keep the 32-character file name length"""
+        digest = hash_text('blog/post.md', 'zh', algorithm='blake2b')
+        
+        assert len(digest) == 32
+        assert digest == hashlib.blake2b(b'blog/post.md_zh', digest_size=16).hexdigest()
+    
+    def test_algorithms_differ(self):
+        """Different algorithms produce different keys for the same page"""
+        assert hash_text('a', 'zh', algorithm='md5') != hash_text('a', 'zh', algorithm='blake2b')
+    
+    def test_xxhash(self):
+        """xxhash is used when installed"""
+        pytest.importorskip('xxhash')
+        
+        assert len(hash_text('blog/post.md', 'zh', algorithm='xxhash')) == 32
+
+
+class TestResolveHashAlgorithm:
+    """Test cases for resolve_hash_algorithm"""
+    
+    def test_known_algorithm(self):
+        """Available algorithms are used as configured"""
+        assert resolve_hash_algorithm('md5') == 'md5'
+        assert resolve_hash_algorithm('blake2b') == 'blake2b'
+    
+    def test_missing_xxhash_falls_back(self, monkeypatch):
+        """xxhash falls back to blake2b when the package is missing"""
+        monkeypatch.setattr(hashing, 'xxhash', None)
+        
+        assert resolve_hash_algorithm('xxhash') == 'blake2b'
+    
+    def test_unknown_algorithm(self):
+        """Unknown names fall back to the default"""
+        assert resolve_hash_algorithm('sha1') == 'blake2b'
@@ -2,6 +2,7 @@
 
 import os
 import tempfile
+import time
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 
@@ -191,5 +192,554 @@ class TestAISummaryPlugin(unittest.TestCase):
             self.fail(f"on_post_build raised an exception: {e}")
 
 
+class TestSummaryPrefetch(unittest.TestCase):
+    """Test cases for the concurrent prefetch stage."""
+
+    def setUp(self):
+        """Set up a docs tree and a plugin with mocked services."""
+        from mkdocs_ai_summary.content_processor import ContentProcessor
+
+        self.docs_dir = tempfile.mkdtemp()
+        self.site_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.docs_dir, 'blog'))
+        pages = {
+            'blog/one.md': '# One\n\nFirst post content.',
+            'blog/two.md': '---\ntitle: Second\n---\n\nSecond post content.',
+            'about.md': '# About\n\nNot in an enabled folder.',
+        }
+        for path, text in pages.items():
+            with open(os.path.join(self.docs_dir, path), 'w', encoding='utf-8') as f:
+                f.write(text)
+
+        from mkdocs.structure.files import Files
+        self.files = Files([
+            File(path, self.docs_dir, self.site_dir, False) for path in pages
+        ])
+
+        self.plugin = AISummaryPlugin()
+        self.plugin.config = {
+            'debug': False,
+            'prefetch_enabled': True,
+            'prefetch_workers': 2,
+            'prefetch_engine': 'thread',
+            'prefetch_max_concurrency': 8,
+            'batch_enabled': False,
+            'batch_token_budget': 4000,
+            'batch_max_pages': 10,
+            'batch_max_output_tokens': 4096,
+            'batch_job_export': '',
+            'batch_job_import': '',
+            'ai_service': 'glm',
+            'budget_clean': True,
+            'similarity_reuse': False,
+        }
+        self.plugin._prefetched_summaries = {}
+        self.plugin._service_available = True
+        self.plugin.source_index = None
+        self.plugin.config_manager = Mock()
+        self.plugin.config_manager.should_run.return_value = True
+        self.plugin.config_manager.should_generate_new_summary.return_value = True
+        self.plugin.cache_manager = Mock()
+        self.plugin.cache_manager.lookup.return_value = ('miss', None)
+        self.plugin.ai_service_manager = Mock()
+        self.plugin.ai_service_manager.generate_summary.side_effect = (
+            lambda content, title, language, debug=False: {
+                'summary': f'A valid summary for {title}.', 'service': 'glm'
+            }
+        )
+        self.plugin.content_processor = ContentProcessor(
+            enabled_folders=['blog/'], exclude_patterns=[], exclude_files=[],
+            summary_language='zh'
+        )
+
+    def test_prefetch_generates_eligible_pages(self):
+        """Only eligible cache misses are sent to the AI service."""
+        self.plugin.on_files(self.files, Mock())
+
+        titles = sorted(
+            call.args[1] for call in self.plugin.ai_service_manager.generate_summary.call_args_list
+        )
+        self.assertEqual(titles, ['One', 'Second'])
+        self.assertEqual(len(self.plugin._prefetched_summaries), 2)
+        self.assertEqual(self.plugin.cache_manager.save_summary_cache.call_count, 2)
+
+    def test_prefetch_generates_identical_pages_once(self):
+        """Pages with identical content share one generation."""
+        from mkdocs.structure.files import Files
+
+        os.makedirs(os.path.join(self.docs_dir, 'blog', 'v2'))
+        with open(os.path.join(self.docs_dir, 'blog', 'v2', 'one.md'), 'w', encoding='utf-8') as f:
+            f.write('# One\n\nFirst post content.')
+        files = Files(list(self.files) + [File('blog/v2/one.md', self.docs_dir, self.site_dir, False)])
+
+        self.plugin.on_files(files, Mock())
+
+        self.assertEqual(self.plugin.ai_service_manager.generate_summary.call_count, 2)
+        self.assertEqual(len(self.plugin._prefetched_summaries), 3)
+        self.assertEqual(self.plugin.cache_manager.save_summary_cache.call_count, 3)
+
+    def test_prefetch_skips_cached_pages(self):
+        """Pages with a valid cache entry are not regenerated."""
+        self.plugin.cache_manager.lookup.return_value = (
+            'hit', {'summary': 'Cached summary text.', 'service': 'glm'}
+        )
+
+        self.plugin.on_files(self.files, Mock())
+
+        self.plugin.ai_service_manager.generate_summary.assert_not_called()
+
+    def test_prefetch_disabled_in_cache_only_mode(self):
+        """No requests are made when new summaries are not allowed."""
+        self.plugin.config_manager.should_generate_new_summary.return_value = False
+
+        self.plugin.on_files(self.files, Mock())
+
+        self.plugin.ai_service_manager.generate_summary.assert_not_called()
+
+    def test_prefetch_async_engine(self):
+        """The asyncio engine generates all jobs in one fan-out."""
+        self.plugin.config['prefetch_engine'] = 'async'
+        async_manager = Mock()
+        async_manager.max_concurrency = 8
+
+        async def generate_summaries(jobs, debug=False):
+            return [{'summary': f'Async summary for {job["title"]}.', 'service': 'glm'} for job in jobs]
+        async_manager.generate_summaries = generate_summaries
+
+        with patch('mkdocs_ai_summary.async_ai_services.AsyncAIServiceManager.from_manager',
+                   return_value=async_manager):
+            self.plugin.on_files(self.files, Mock())
+
+        self.plugin.ai_service_manager.generate_summary.assert_not_called()
+        summaries = sorted(result['summary'] for _, result in self.plugin._prefetched_summaries.values())
+        self.assertEqual(summaries, ['Async summary for One.', 'Async summary for Second.'])
+
+    def test_prefetch_interrupt_saves_finished_pages(self):
+        """Ctrl-C cancels queued pages and keeps the ones that already finished."""
+        import threading
+        from mkdocs.structure.files import Files
+
+        with open(os.path.join(self.docs_dir, 'blog', 'three.md'), 'w', encoding='utf-8') as f:
+            f.write('# Third\n\nThird post content.')
+        files = Files(list(self.files) + [File('blog/three.md', self.docs_dir, self.site_dir, False)])
+        self.plugin.config['prefetch_workers'] = 1
+        second_started = threading.Event()
+        release = threading.Event()
+
+        def generate_summary(content, title, language, debug=False):
+            if title == 'Second':
+                second_started.set()
+                release.wait(5)
+            return {'summary': f'A valid summary for {title}.', 'service': 'glm'}
+        self.plugin.ai_service_manager.generate_summary.side_effect = generate_summary
+
+        def interrupted(futures):
+            # 'One' has finished and 'Second' is in flight when Ctrl-C arrives
+            second_started.wait(5)
+            raise KeyboardInterrupt
+            yield
+
+        started = time.monotonic()
+        try:
+            with patch('mkdocs_ai_summary.plugin.as_completed', side_effect=interrupted):
+                with self.assertRaises(KeyboardInterrupt):
+                    self.plugin.on_files(files, Mock())
+            # the in-flight request is not waited for
+            self.assertLess(time.monotonic() - started, 2)
+        finally:
+            release.set()
+
+        titles = [call.args[1] for call in self.plugin.ai_service_manager.generate_summary.call_args_list]
+        self.assertEqual(titles, ['One', 'Second'])
+        self.assertEqual(self.plugin.cache_manager.save_summary_cache.call_count, 1)
+        self.plugin.cache_manager.flush.assert_called_once()
+
+    def test_prefetch_batches_short_pages(self):
+        """Batch mode sends all short pages through one batched call."""
+        self.plugin.config['batch_enabled'] = True
+        self.plugin.ai_service_manager.generate_summaries_batched.side_effect = (
+            lambda requests_batch, **kwargs: [
+                {'summary': f'Batched summary for {request["title"]}.', 'service': 'glm'}
+                for request in requests_batch
+            ]
+        )
+
+        self.plugin.on_files(self.files, Mock())
+
+        self.plugin.ai_service_manager.generate_summary.assert_not_called()
+        self.assertEqual(self.plugin.ai_service_manager.generate_summaries_batched.call_count, 1)
+        kwargs = self.plugin.ai_service_manager.generate_summaries_batched.call_args.kwargs
+        self.assertEqual((kwargs['token_budget'], kwargs['max_pages']), (4000, 10))
+        summaries = sorted(result['summary'] for _, result in self.plugin._prefetched_summaries.values())
+        self.assertEqual(summaries, ['Batched summary for One.', 'Batched summary for Second.'])
+
+    def test_batch_job_export_and_import(self):
+        """Cache misses are exported without calling services, then imported into the cache."""
+        from mkdocs_ai_summary.ai_services import AIServiceManager
+        from mkdocs_ai_summary.batch_jobs import read_batch_requests, run_local_batch
+
+        requests_path = os.path.join(self.docs_dir, 'requests.jsonl')
+        results_path = os.path.join(self.docs_dir, 'results.jsonl')
+        self.plugin.ai_service_manager.build_batch_request.side_effect = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300, temperature=0.3
+        ).build_batch_request
+        self.plugin.config['batch_job_export'] = requests_path
+        self.plugin.config_manager.should_generate_new_summary.return_value = False
+        cache = {}
+        self.plugin.cache_manager.save_summary_cache.side_effect = (
+            lambda file_hash, data, content_hash: cache.__setitem__(file_hash, dict(data, content_hash=content_hash))
+        )
+        self.plugin.cache_manager.lookup.side_effect = (
+            lambda file_hash, content_hash: ('hit', cache[file_hash]) if file_hash in cache else ('miss', None)
+        )
+
+        self.plugin.on_files(self.files, Mock())
+
+        self.plugin.ai_service_manager.generate_summary.assert_not_called()
+        self.plugin.cache_manager.save_summary_cache.assert_not_called()
+        self.assertEqual(len(read_batch_requests(requests_path)), 2)
+
+        run_local_batch(requests_path, results_path, complete=lambda request: 'Offline batch summary text.')
+        self.plugin.config['batch_job_export'] = ''
+        self.plugin.config['batch_job_import'] = results_path
+        self.plugin.config_manager.should_generate_new_summary.return_value = True
+
+        self.plugin.on_files(self.files, Mock())
+
+        self.plugin.ai_service_manager.generate_summary.assert_not_called()
+        self.assertEqual(self.plugin.cache_manager.save_summary_cache.call_count, 2)
+        saved = self.plugin.cache_manager.save_summary_cache.call_args_list[0].args[1]
+        self.assertEqual(saved['summary'], 'Offline batch summary text.')
+        self.assertEqual(saved['service'], 'glm')
+
+    def test_page_markdown_uses_prefetched_result(self):
+        """on_page_markdown reads the prefetched summary instead of calling the service."""
+        self.plugin.on_files(self.files, Mock())
+        self.plugin.ai_service_manager.generate_summary.reset_mock()
+
+        page = Mock()
+        page.file = self.files.get_file_from_path('blog/one.md')
+        page.meta = {}
+        page.title = 'One'
+
+        result = self.plugin.on_page_markdown('# One\n\nFirst post content.', page, Mock(), self.files)
+
+        self.plugin.ai_service_manager.generate_summary.assert_not_called()
+        self.assertIn('A valid summary for One.', result)
+
+    def test_prefetch_skips_reading_unchanged_files(self):
+        """Files whose stat matches the index are not read again."""
+        from mkdocs_ai_summary.cache_manager import SourceIndex
+
+        self.plugin.source_index = SourceIndex()
+        self.plugin.on_files(self.files, Mock())
+        self.assertEqual(len(self.plugin.source_index), 2)
+        self.plugin.cache_manager.lookup.return_value = (
+            'hit', {'summary': 'Cached summary text.', 'service': 'glm'}
+        )
+
+        with patch('mkdocs.utils.meta.get_data') as mock_get_data:
+            self.plugin.on_files(self.files, Mock())
+
+        mock_get_data.assert_not_called()
+
+    def test_index_separates_docs_dirs(self):
+        """Pages with the same relative path in another docs_dir are hashed again."""
+        from mkdocs_ai_summary.cache_manager import SourceIndex
+
+        self.plugin.source_index = SourceIndex()
+        self.plugin.on_files(self.files, Mock())
+
+        other_docs_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(other_docs_dir, 'blog'))
+        other_path = os.path.join(other_docs_dir, 'blog', 'one.md')
+        with open(other_path, 'w', encoding='utf-8') as f:
+            f.write('# One\n\nOther post content.')
+        # Same relative path, size and mtime as the already indexed page
+        original_stat = os.stat(os.path.join(self.docs_dir, 'blog', 'one.md'))
+        os.utime(other_path, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+        other_file = File('blog/one.md', other_docs_dir, self.site_dir, False)
+
+        job = self.plugin._build_prefetch_job(other_file)
+
+        indexed = self.plugin.source_index.get(
+            os.path.join(self.docs_dir, 'blog', 'one.md'), SourceIndex.stat(os.path.join(self.docs_dir, 'blog', 'one.md'))
+        )
+        self.assertNotEqual(job['content_hash'], indexed[1])
+        self.assertIn('Other post content.', job['cleaned_content'])
+
+    def test_page_markdown_reuses_indexed_hashes(self):
+        """Unchanged pages skip hashing their content."""
+        from mkdocs_ai_summary.cache_manager import SourceIndex
+
+        self.plugin.source_index = SourceIndex()
+        self.plugin.cache_manager.lookup.return_value = (
+            'hit', {'summary': 'Cached summary text.', 'service': 'glm'}
+        )
+        page = Mock()
+        page.file = self.files.get_file_from_path('blog/one.md')
+        page.meta = {}
+        page.title = 'One'
+        self.plugin.on_page_markdown('# One\n\nFirst post content.', page, Mock(), self.files)
+
+        with patch.object(self.plugin, '_compute_hashes') as mock_compute:
+            result = self.plugin.on_page_markdown('# One\n\nFirst post content.', page, Mock(), self.files)
+
+        mock_compute.assert_not_called()
+        self.assertIn('Cached summary text.', result)
+
+    def test_page_markdown_skips_stat_after_prefetch(self):
+        """Files checked during prefetch are not stat'ed again when rendering."""
+        from mkdocs_ai_summary.cache_manager import SourceIndex
+
+        self.plugin.source_index = SourceIndex()
+        self.plugin.on_files(self.files, Mock())
+        page = Mock()
+        page.file = self.files.get_file_from_path('blog/one.md')
+        page.meta = {}
+        page.title = 'One'
+
+        with patch.object(SourceIndex, 'stat') as mock_stat:
+            result = self.plugin.on_page_markdown('# One\n\nFirst post content.', page, Mock(), self.files)
+
+        mock_stat.assert_not_called()
+        self.assertIn('A valid summary for One.', result)
+
+
+class TestMemoryCacheLifetime(unittest.TestCase):
+    """Test cases for reusing the memory cache across serve rebuilds."""
+
+    def test_memory_cache_reused(self):
+        """The same memory cache is returned for every rebuild."""
+        plugin = AISummaryPlugin()
+        plugin.config = {'cache_memory_entries': 10}
+        plugin.on_startup(command='serve', dirty=False)
+
+        first = plugin._get_memory_cache()
+        second = plugin._get_memory_cache()
+
+        self.assertIs(first, second)
+        self.assertEqual(first.max_entries, 10)
+
+    def test_memory_cache_disabled(self):
+        """A size of zero disables the memory cache."""
+        plugin = AISummaryPlugin()
+        plugin.config = {'cache_memory_entries': 0}
+
+        self.assertIsNone(plugin._get_memory_cache())
+
+
+class TestRoutingStatsPersistence(unittest.TestCase):
+    """Test cases for saving service latency stats between builds."""
+
+    def test_stats_saved_to_cache_dir(self):
+        """Stats gathered during a build are written to the cache dir."""
+        from pathlib import Path
+        from mkdocs_ai_summary.ai_services import AIServiceManager
+        from mkdocs_ai_summary.routing import LatencyRouter
+
+        cache_dir = Path(tempfile.mkdtemp())
+        plugin = AISummaryPlugin()
+        plugin.config = {'debug': False}
+        plugin.config_manager = Mock()
+        plugin.config_manager.should_run.return_value = True
+        plugin.cache_manager = Mock(enabled=True, cache_dir=cache_dir)
+        plugin.ai_service_manager = AIServiceManager(
+            default_service='glm', model='glm-4-flash', max_tokens=300, temperature=0.3
+        )
+        plugin.ai_service_manager.router.record('glm', 1.5, True)
+
+        plugin.on_post_build(Mock())
+
+        restored = LatencyRouter()
+        self.assertTrue(restored.load(cache_dir / LatencyRouter.STATS_FILE))
+        self.assertEqual(restored.percentile('glm', 50), 1.5)
+
+    def test_no_stats_path_without_cache(self):
+        """Stats are not persisted when the cache is disabled."""
+        plugin = AISummaryPlugin()
+        plugin.cache_manager = Mock(enabled=False)
+
+        self.assertIsNone(plugin._routing_stats_path())
+
+
+class TestContentHashing(unittest.TestCase):
+    """Test cases for hashing raw page content and migrating old cache entries."""
+
+    def setUp(self):
+        """Set up a plugin with a real cache in a temp dir."""
+        from mkdocs_ai_summary.cache_manager import CacheManager
+        from mkdocs_ai_summary.content_processor import ContentProcessor
+
+        self.old_cwd = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        self.plugin = AISummaryPlugin()
+        self.plugin.config = {
+            'debug': False, 'budget_clean': True,
+            'similarity_reuse': False, 'similarity_threshold': 0.9,
+            'similarity_max_reuses': 5,
+        }
+        self.plugin.cache_manager = CacheManager(auto_clean=False)
+        self.plugin.content_processor = ContentProcessor(
+            enabled_folders=['blog/'], exclude_patterns=[], exclude_files=[],
+            summary_language='zh'
+        )
+        self.markdown = '# Post\n\nBody text.\n\n```python\nprint(1)\n```'
+
+    def tearDown(self):
+        """Restore the working directory."""
+        os.chdir(self.old_cwd)
+
+    def test_content_hash_uses_raw_source(self):
+        """Edits that cleaning would drop still change the content hash."""
+        _, before = self.plugin._compute_hashes('blog/post.md', self.markdown, 'zh')
+        _, after = self.plugin._compute_hashes('blog/post.md', self.markdown.replace('print(1)', 'print(2)'), 'zh')
+
+        self.assertNotEqual(before, after)
+
+    def _legacy_entry(self, content_hash, **extra):
+        """Write an entry the way an older version would have."""
+        from datetime import datetime
+
+        entry = {
+            'summary': 'Cached summary text.', 'service': 'glm', 'page_title': 'Post',
+            'timestamp': datetime.now().isoformat(), 'cache_version': '1.2.2',
+            'content_hash': content_hash
+        }
+        entry.update(extra)
+        return entry
+
+    def test_legacy_md5_entry_migrated(self):
+        """MD5 entries hashed from the cleaned content are reused under the new key."""
+        from mkdocs_ai_summary.cache_manager import CACHE_HIT
+        from mkdocs_ai_summary.hashing import hash_text
+
+        cleaned = self.plugin.content_processor.clean_content_for_ai(self.markdown)
+        legacy_key = hash_text('blog/post.md', 'zh', algorithm='md5')
+        self.plugin.cache_manager.backend.set(
+            legacy_key, self._legacy_entry(hash_text(cleaned, 'zh', algorithm='md5'))
+        )
+        file_hash, content_hash = self.plugin._compute_hashes('blog/post.md', self.markdown, 'zh')
+
+        status, entry = self.plugin._lookup_cache('blog/post.md', file_hash, content_hash, self.markdown, 'zh')
+
+        self.assertEqual(status, CACHE_HIT)
+        self.assertEqual(entry['summary'], 'Cached summary text.')
+        self.assertEqual(self.plugin.cache_manager.lookup(file_hash, content_hash)[0], CACHE_HIT)
+        self.assertEqual(self.plugin.cache_manager.backend.get(file_hash)['hash_algorithm'], 'blake2b')
+        self.assertIsNone(self.plugin.cache_manager.backend.get(legacy_key))
+
+    def test_entry_from_other_algorithm_read(self):
+        """Entries written with another configured algorithm are read transparently."""
+        from mkdocs_ai_summary.cache_manager import CACHE_HIT
+        from mkdocs_ai_summary.hashing import hash_text
+
+        md5_key = hash_text('blog/post.md', 'zh', algorithm='md5')
+        self.plugin.cache_manager.backend.set(md5_key, self._legacy_entry(
+            hash_text(self.markdown, 'zh', algorithm='md5'), hash_algorithm='md5'
+        ))
+        file_hash, content_hash = self.plugin._compute_hashes('blog/post.md', self.markdown, 'zh')
+
+        status, _ = self.plugin._lookup_cache('blog/post.md', file_hash, content_hash, self.markdown, 'zh')
+
+        self.assertEqual(status, CACHE_HIT)
+
+    def test_changed_content_not_reused(self):
+        """Old entries for content that really changed are not reused."""
+        from mkdocs_ai_summary.cache_manager import CACHE_HIT
+        from mkdocs_ai_summary.hashing import hash_text
+
+        md5_key = hash_text('blog/post.md', 'zh', algorithm='md5')
+        self.plugin.cache_manager.backend.set(md5_key, self._legacy_entry('outdated'))
+        file_hash, content_hash = self.plugin._compute_hashes('blog/post.md', self.markdown, 'zh')
+
+        status, _ = self.plugin._lookup_cache('blog/post.md', file_hash, content_hash, self.markdown, 'zh')
+
+        self.assertNotEqual(status, CACHE_HIT)
+        self.assertIsNotNone(self.plugin.cache_manager.backend.get(md5_key))
+
+    def _save_generated(self, markdown):
+        """Save a summary the way a fresh generation would."""
+        file_hash, content_hash = self.plugin._compute_hashes('blog/post.md', markdown, 'zh')
+        entry = self.plugin._new_cache_entry(
+            {'summary': 'Generated summary text.', 'service': 'glm'}, 'Post',
+            self.plugin._clean_content(markdown)
+        )
+        self.plugin.cache_manager.save_summary_cache(file_hash, entry, content_hash)
+        return entry
+
+    def test_small_edit_keeps_summary_when_similarity_enabled(self):
+        """A one-line change below the threshold reuses the existing summary."""
+        from mkdocs_ai_summary.cache_manager import CACHE_HIT, CACHE_STALE
+
+        self.plugin.config['similarity_reuse'] = True
+        lines = [f'- Fixed issue number {i} in the release notes parser.' for i in range(60)]
+        original = '# Changelog\n\n' + '\n'.join(lines)
+        generated = self._save_generated(original)
+        edited = original + '\n- Fixed issue number 60 in the release notes parser.'
+        file_hash, content_hash = self.plugin._compute_hashes('blog/post.md', edited, 'zh')
+
+        status, entry = self.plugin._lookup_cache('blog/post.md', file_hash, content_hash, edited, 'zh')
+
+        self.assertEqual(status, CACHE_HIT)
+        self.assertEqual(entry['summary'], 'Generated summary text.')
+        # The signature from generation time is kept, so edits cannot drift indefinitely
+        self.assertEqual(self.plugin.cache_manager.backend.get(file_hash)['minhash'], generated['minhash'])
+
+        self.plugin.config['similarity_reuse'] = False
+        rewritten = edited + '\nMore text.'
+        _, content_hash = self.plugin._compute_hashes('blog/post.md', rewritten, 'zh')
+        status, _ = self.plugin._lookup_cache('blog/post.md', file_hash, content_hash, rewritten, 'zh')
+        self.assertEqual(status, CACHE_STALE)
+
+    def _changelog(self, entries):
+        lines = [f'- Fixed issue number {i} in the release notes parser.' for i in range(entries)]
+        return '# Changelog\n\n' + '\n'.join(lines)
+
+    def test_small_edits_regenerate_after_limit(self):
+        """Only similarity_max_reuses consecutive small edits keep the summary."""
+        from mkdocs_ai_summary.cache_manager import CACHE_HIT, CACHE_STALE
+
+        self.plugin.config.update({'similarity_reuse': True, 'similarity_max_reuses': 2})
+        self._save_generated(self._changelog(60))
+
+        statuses = []
+        for entries in (61, 62, 63):
+            markdown = self._changelog(entries)
+            file_hash, content_hash = self.plugin._compute_hashes('blog/post.md', markdown, 'zh')
+            statuses.append(self.plugin._lookup_cache('blog/post.md', file_hash, content_hash, markdown, 'zh')[0])
+
+        self.assertEqual(statuses, [CACHE_HIT, CACHE_HIT, CACHE_STALE])
+        self.assertEqual(self.plugin.cache_manager.backend.get(file_hash)['reuse_count'], 2)
+
+    def test_front_matter_forces_regeneration(self):
+        """ai_summary_regenerate bypasses the small-change gate."""
+        from mkdocs_ai_summary.cache_manager import CACHE_STALE
+
+        self.plugin.config['similarity_reuse'] = True
+        self._save_generated(self._changelog(60))
+        markdown = self._changelog(61)
+        file_hash, content_hash = self.plugin._compute_hashes('blog/post.md', markdown, 'zh')
+
+        status, _ = self.plugin._lookup_cache(
+            'blog/post.md', file_hash, content_hash, markdown, 'zh', force_regenerate=True
+        )
+
+        self.assertEqual(status, CACHE_STALE)
+
+    def test_large_edit_regenerates(self):
+        """Changes above the threshold are still reported as stale."""
+        from mkdocs_ai_summary.cache_manager import CACHE_STALE
+
+        self.plugin.config['similarity_reuse'] = True
+        self._save_generated(self.markdown)
+        rewritten = '# Post\n\nAn entirely different article about deployment pipelines.'
+        file_hash, content_hash = self.plugin._compute_hashes('blog/post.md', rewritten, 'zh')
+
+        status, _ = self.plugin._lookup_cache('blog/post.md', file_hash, content_hash, rewritten, 'zh')
+
+        self.assertEqual(status, CACHE_STALE)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
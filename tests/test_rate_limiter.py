@@ -0,0 +1,108 @@
+"""Tests for rate limiter module"""
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from mkdocs_ai_summary.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    backoff_delay,
+    estimate_tokens,
+    parse_retry_after,
+)
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket"""
+    
+    def test_burst_then_wait(self):
+        """The bucket allows a full minute of quota then spaces requests out"""
+        bucket = TokenBucket(60)
+        
+        waits = [bucket.reserve(1, now=bucket.updated_at) for _ in range(61)]
+        
+        assert waits[:60] == [0.0] * 60
+        assert abs(waits[60] - 1.0) < 1e-6
+    
+    def test_refill(self):
+        """Tokens refill at the per-minute rate"""
+        bucket = TokenBucket(60)
+        start = bucket.updated_at
+        bucket.reserve(60, now=start)
+        
+        assert bucket.reserve(1, now=start + 1.0) == 0.0
+    
+    def test_oversized_request_capped(self):
+        """A single request larger than the bucket never waits forever"""
+        bucket = TokenBucket(100)
+        
+        assert bucket.reserve(1000, now=bucket.updated_at) == 0.0
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter"""
+    
+    def test_unlimited(self):
+        """No limits means no waiting"""
+        limiter = RateLimiter()
+        
+        assert all(limiter.reserve(10000) == 0.0 for _ in range(100))
+    
+    def test_tokens_per_minute(self):
+        """Token budgets are enforced independently of request counts"""
+        limiter = RateLimiter(rpm=1000, tpm=1000)
+        
+        assert limiter.reserve(600) == 0.0
+        assert limiter.reserve(600) > 0.0
+    
+    def test_pause_delays_all_requests(self):
+        """A 429 pause applies to every later request"""
+        limiter = RateLimiter(rpm=1000)
+        limiter.pause(5)
+        
+        assert limiter.reserve() > 4.0
+    
+    def test_acquire_sleeps(self):
+        """acquire() blocks for the reserved wait"""
+        limiter = RateLimiter(rpm=1)
+        limiter.acquire()
+        
+        with patch('mkdocs_ai_summary.rate_limiter.time.sleep') as mock_sleep:
+            limiter.acquire()
+        
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args.args[0] > 50
+
+
+class TestRetryHelpers:
+    """Test cases for retry helper functions"""
+    
+    def test_parse_retry_after_seconds(self):
+        """Numeric Retry-After values are seconds"""
+        assert parse_retry_after('7') == 7.0
+        assert parse_retry_after(' 1.5 ') == 1.5
+    
+    def test_parse_retry_after_date(self):
+        """HTTP-date Retry-After values are converted to a delay"""
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        
+        delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+        
+        assert 25 <= delay <= 31
+    
+    def test_parse_retry_after_invalid(self):
+        """Missing or invalid values return None"""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('soon') is None
+    
+    def test_backoff_delay_bounds(self):
+        """Backoff uses full jitter below the exponential cap"""
+        for attempt in range(8):
+            delay = backoff_delay(attempt, base=1.0, cap=10.0)
+            assert 0 <= delay <= min(10.0, 2 ** attempt)
+    
+    def test_estimate_tokens(self):
+        """CJK characters count as one token each"""
+        assert estimate_tokens('中文摘要') == 4
+        assert estimate_tokens('abcdefgh') == 2
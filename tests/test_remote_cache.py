@@ -0,0 +1,142 @@
+"""Tests for remote cache module"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from mkdocs_ai_summary.cache_manager import CacheManager, CACHE_HIT, CACHE_MISS
+from mkdocs_ai_summary.cache_server import create_server
+from mkdocs_ai_summary.remote_cache import RemoteCache
+
+
+FILE_HASH = 'aa' * 16
+CONTENT_HASH = 'bb' * 16
+
+
+def make_entry(content_hash=CONTENT_HASH, **overrides):
+    entry = {
+        'summary': 'Shared summary',
+        'service': 'glm',
+        'page_title': 'Page',
+        'timestamp': datetime.now().isoformat(),
+        'content_hash': content_hash,
+    }
+    entry.update(overrides)
+    return entry
+
+
+@pytest.fixture
+def server_url(tmp_path):
+    """Start the reference server on a random port"""
+    server = create_server('127.0.0.1', 0, tmp_path / 'remote')
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/cache"
+    server.shutdown()
+    server.server_close()
+
+
+class TestRemoteCache:
+    """Test cases for RemoteCache"""
+    
+    def test_put_is_buffered_until_flush(self, server_url):
+        """Writes are uploaded on flush and readable afterwards"""
+        remote = RemoteCache(server_url)
+        remote.put(FILE_HASH, CONTENT_HASH, make_entry())
+        
+        assert remote.get(FILE_HASH, CONTENT_HASH) is None
+        assert remote.flush() == 1
+        assert remote.get(FILE_HASH, CONTENT_HASH)['summary'] == 'Shared summary'
+        assert (remote.hits, remote.misses, remote.uploads) == (1, 1, 1)
+        remote.close()
+    
+    def test_read_only(self, server_url):
+        """Read-only clients never upload"""
+        remote = RemoteCache(server_url, write=False)
+        remote.put(FILE_HASH, CONTENT_HASH, make_entry())
+        
+        assert remote.flush() == 0
+        remote.close()
+    
+    def test_rejects_entry_for_other_content(self, server_url):
+        """Entries whose content hash does not match the request are ignored"""
+        writer = RemoteCache(server_url)
+        writer.put(FILE_HASH, CONTENT_HASH, make_entry(content_hash='cc' * 16))
+        writer.close()
+        
+        remote = RemoteCache(server_url)
+        assert remote.get(FILE_HASH, CONTENT_HASH) is None
+        remote.close()
+    
+    def test_disabled_after_repeated_failures(self):
+        """An unreachable server is skipped after max_failures errors"""
+        remote = RemoteCache('http://127.0.0.1:9', timeout=0.5, max_failures=2)
+        
+        assert remote.get(FILE_HASH, CONTENT_HASH) is None
+        assert remote.disabled is False
+        assert remote.get(FILE_HASH, CONTENT_HASH) is None
+        assert remote.disabled is True
+        remote.close()
+
+
+class TestCacheManagerRemoteTier:
+    """Test cases for CacheManager with a remote tier"""
+    
+    def test_read_through_populates_local_cache(self, server_url, tmp_path, monkeypatch):
+        """A remote hit is saved locally so the next build needs no request"""
+        seed = RemoteCache(server_url)
+        seed.put(FILE_HASH, CONTENT_HASH, make_entry())
+        seed.close()
+        
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(auto_clean=False, remote=RemoteCache(server_url))
+        status, entry = manager.lookup(FILE_HASH, CONTENT_HASH)
+        manager.close()
+        
+        assert status == CACHE_HIT
+        assert entry['summary'] == 'Shared summary'
+        
+        local = CacheManager(auto_clean=False)
+        assert local.lookup(FILE_HASH, CONTENT_HASH)[0] == CACHE_HIT
+        local.close()
+    
+    def test_stale_local_entry_uses_remote(self, server_url, tmp_path, monkeypatch):
+        """A stale local entry is replaced by a matching remote entry"""
+        seed = RemoteCache(server_url)
+        seed.put(FILE_HASH, CONTENT_HASH, make_entry(summary='New summary'))
+        seed.close()
+        
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(auto_clean=False, remote=RemoteCache(server_url))
+        manager.save_summary_cache(FILE_HASH, {'summary': 'Old summary'}, 'cc' * 16)
+        status, entry = manager.lookup(FILE_HASH, CONTENT_HASH)
+        manager.close()
+        
+        assert status == CACHE_HIT
+        assert entry['summary'] == 'New summary'
+    
+    def test_expired_remote_entry_is_miss(self, server_url, tmp_path, monkeypatch):
+        """Remote entries past the expiry are ignored"""
+        seed = RemoteCache(server_url)
+        seed.put(FILE_HASH, CONTENT_HASH, make_entry(
+            timestamp=(datetime.now() - timedelta(days=31)).isoformat()
+        ))
+        seed.close()
+        
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(auto_clean=False, remote=RemoteCache(server_url))
+        
+        assert manager.lookup(FILE_HASH, CONTENT_HASH) == (CACHE_MISS, None)
+        manager.close()
+    
+    def test_new_summaries_uploaded_on_close(self, server_url, tmp_path, monkeypatch):
+        """Saved summaries are written back when the manager closes"""
+        monkeypatch.chdir(tmp_path)
+        manager = CacheManager(auto_clean=False, remote=RemoteCache(server_url))
+        manager.save_summary_cache(FILE_HASH, {'summary': 'Generated', 'service': 'glm'}, CONTENT_HASH)
+        manager.close()
+        
+        remote = RemoteCache(server_url)
+        assert remote.get(FILE_HASH, CONTENT_HASH)['summary'] == 'Generated'
+        remote.close()
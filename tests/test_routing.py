@@ -0,0 +1,167 @@
+"""Tests for routing module"""
+
+import json
+from unittest.mock import patch
+
+from mkdocs_ai_summary.routing import LatencyRouter, ServiceStats
+
+
+def _warm(router, service_name, latencies, failures=0):
+    for latency in latencies:
+        router.record(service_name, latency, True)
+    for _ in range(failures):
+        router.record(service_name, 0.0, False)
+
+
+class TestServiceStats:
+    """Test cases for ServiceStats"""
+    
+    def test_percentiles_and_error_rate(self):
+        """Percentiles use nearest rank over successful requests"""
+        stats = ServiceStats(window=10)
+        for latency in [1.0, 2.0, 3.0, 4.0]:
+            stats.add(True, latency, 100.0)
+        stats.add(False, 30.0, 100.0)
+        
+        assert stats.percentile(50) == 2.0
+        assert stats.percentile(95) == 4.0
+        assert abs(stats.error_rate() - 0.2) < 1e-9
+    
+    def test_rolling_window(self):
+        """Only the most recent requests are kept"""
+        stats = ServiceStats(window=2)
+        for latency in [10.0, 1.0, 2.0]:
+            stats.add(True, latency, 100.0)
+        
+        assert [latency for _, _, latency in stats.samples] == [1.0, 2.0]
+    
+    def test_expire(self):
+        """Samples older than the cutoff are dropped"""
+        stats = ServiceStats()
+        stats.add(False, 1.0, 100.0)
+        stats.add(True, 2.0, 200.0)
+        
+        stats.expire(150.0)
+        
+        assert stats.error_rate() == 0.0
+        assert stats.percentile(50) == 2.0
+
+
+class TestLatencyRouter:
+    """Test cases for LatencyRouter"""
+    
+    def test_no_data_keeps_configured_order(self):
+        """A cold router leaves the fixed order unchanged"""
+        router = LatencyRouter()
+        
+        assert router.order('glm', ['glm', 'openai', 'deepseek']) == ['glm', 'openai', 'deepseek']
+    
+    def test_fastest_healthy_service_first(self):
+        """A preferred service far slower than the fastest is demoted"""
+        router = LatencyRouter()
+        _warm(router, 'glm', [8.0, 9.0, 10.0])
+        _warm(router, 'openai', [1.0, 1.5, 2.0])
+        
+        assert router.order('glm', ['glm', 'openai', 'deepseek'], 2.0) == ['openai', 'glm', 'deepseek']
+    
+    def test_preferred_within_threshold(self):
+        """The preferred service stays first when it is nearly as fast"""
+        router = LatencyRouter()
+        _warm(router, 'glm', [2.0, 2.5, 3.0])
+        _warm(router, 'openai', [1.0, 1.5, 2.0])
+        
+        assert router.order('glm', ['glm', 'openai'], 2.0) == ['glm', 'openai']
+    
+    def test_unhealthy_services_last(self):
+        """Services with a high error rate are tried last"""
+        router = LatencyRouter()
+        _warm(router, 'glm', [0.5], failures=3)
+        _warm(router, 'openai', [2.0, 2.0, 2.0])
+        
+        assert not router.is_healthy('glm')
+        assert router.order('glm', ['glm', 'openai', 'deepseek']) == ['openai', 'deepseek', 'glm']
+    
+    def test_save_and_load(self, tmp_path):
+        """Stats survive a round trip through the stats file"""
+        router = LatencyRouter()
+        _warm(router, 'glm', [1.0, 2.0], failures=1)
+        path = tmp_path / LatencyRouter.STATS_FILE
+        router.save(path)
+        
+        restored = LatencyRouter()
+        assert restored.load(path) is True
+        assert restored.snapshot() == router.snapshot()
+    
+    def test_load_missing_file(self, tmp_path):
+        """A missing or corrupt stats file is ignored"""
+        router = LatencyRouter()
+        (tmp_path / 'bad.json').write_text('not json', encoding='utf-8')
+        
+        assert router.load(tmp_path / 'missing.json') is False
+        assert router.load(tmp_path / 'bad.json') is False
+        assert router.snapshot() == {}
+
+
+class TestRouterRecovery:
+    """Old samples expire and demoted services are probed again"""
+    
+    def setup_method(self):
+        """Set up a router with a controllable clock"""
+        self.now = 1000.0
+        self.clock = patch('mkdocs_ai_summary.routing.time.time', side_effect=lambda: self.now)
+        self.clock.start()
+        self.router = LatencyRouter(max_age=600.0, probe_interval=60.0)
+        self.candidates = ['glm', 'openai', 'deepseek']
+    
+    def teardown_method(self):
+        self.clock.stop()
+    
+    def test_failed_service_is_probed_and_recovers(self):
+        """Three failures do not demote a service forever"""
+        _warm(self.router, 'glm', [], failures=3)
+        _warm(self.router, 'deepseek', [1.0] * 1000)
+        assert self.router.order('glm', self.candidates) == ['deepseek', 'openai', 'glm']
+        
+        # after the probe interval the demoted services get one request each, in configured order
+        self.now += 60.0
+        assert self.router.order('glm', self.candidates) == ['glm', 'deepseek', 'openai']
+        assert self.router.order('glm', self.candidates) == ['openai', 'deepseek', 'glm']
+        assert self.router.order('glm', self.candidates) == ['deepseek', 'openai', 'glm']
+        
+        # once the failures expire the preferred service is first again (after openai's next probe)
+        self.now += 600.0
+        _warm(self.router, 'deepseek', [1.0])
+        assert self.router.is_healthy('glm')
+        assert self.router.order('glm', self.candidates) == ['openai', 'glm', 'deepseek']
+        assert self.router.order('glm', self.candidates) == ['glm', 'deepseek', 'openai']
+    
+    def test_probe_waits_for_recent_use(self):
+        """A service that was just tried is not probed again"""
+        _warm(self.router, 'glm', [], failures=3)
+        _warm(self.router, 'openai', [1.0] * 3)
+        self.now += 30.0
+        _warm(self.router, 'glm', [], failures=1)
+        
+        self.now += 40.0
+        assert self.router.order('glm', ['glm', 'openai']) == ['openai', 'glm']
+        self.now += 20.0
+        assert self.router.order('glm', ['glm', 'openai']) == ['glm', 'openai']
+    
+    def test_load_drops_stale_samples(self, tmp_path):
+        """Expired samples and the old untimestamped format are ignored on load"""
+        _warm(self.router, 'glm', [], failures=3)
+        self.now += 500.0
+        _warm(self.router, 'openai', [1.0])
+        path = tmp_path / LatencyRouter.STATS_FILE
+        self.router.save(path)
+        
+        self.now += 200.0
+        restored = LatencyRouter(max_age=600.0)
+        assert restored.load(path) is True
+        assert set(restored.snapshot()) == {'openai'}
+        
+        path.write_text(json.dumps({'services': {'glm': {'latencies': [1.0], 'outcomes': [0, 0, 0]}}}),
+                        encoding='utf-8')
+        legacy = LatencyRouter()
+        assert legacy.load(path) is True
+        assert legacy.snapshot() == {}
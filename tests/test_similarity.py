@@ -0,0 +1,51 @@
+"""Tests for similarity module"""
+
+from mkdocs_ai_summary.similarity import (
+    SIGNATURE_PREFIX,
+    SIGNATURE_SIZE,
+    estimate_similarity,
+    minhash_signature,
+)
+
+
+PAGE = '\n'.join(f'版本 1.{i}.0 修复了缓存读取在 Windows 上的问题，并改进了日志输出。' for i in range(40))
+
+
+class TestMinhashSignature:
+    """Test cases for minhash_signature"""
+    
+    def test_deterministic_and_compact(self):
+        """Signatures are stable across calls and bounded in size"""
+        signature = minhash_signature(PAGE)
+        
+        assert signature == minhash_signature(PAGE)
+        assert signature.startswith(SIGNATURE_PREFIX)
+        assert len(signature) < SIGNATURE_SIZE * 6
+    
+    def test_whitespace_is_ignored(self):
+        """Only whitespace differences give identical signatures"""
+        assert minhash_signature(PAGE) == minhash_signature(PAGE.replace('\n', '\n\n  '))
+
+
+class TestEstimateSimilarity:
+    """Test cases for estimate_similarity"""
+    
+    def test_identical(self):
+        assert estimate_similarity(minhash_signature(PAGE), minhash_signature(PAGE)) == 1.0
+    
+    def test_one_line_change_is_similar(self):
+        """Appending one line keeps the estimate high"""
+        edited = PAGE + '\n版本 1.40.0 修复了缓存读取在 Windows 上的问题，并改进了日志输出。'
+        
+        assert estimate_similarity(minhash_signature(PAGE), minhash_signature(edited)) >= 0.9
+    
+    def test_unrelated_text_is_dissimilar(self):
+        other = 'Deploy the site with GitHub Actions and configure the API keys as secrets.' * 10
+        
+        assert estimate_similarity(minhash_signature(PAGE), minhash_signature(other)) < 0.2
+    
+    def test_invalid_or_empty_signatures(self):
+        """Unknown formats never count as similar"""
+        assert estimate_similarity('x1:abc', minhash_signature(PAGE)) == 0.0
+        assert estimate_similarity(minhash_signature(''), minhash_signature(PAGE)) == 0.0
+        assert estimate_similarity(minhash_signature(''), minhash_signature('')) == 1.0
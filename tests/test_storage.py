@@ -0,0 +1,83 @@
+"""Tests for storage module"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from mkdocs_ai_summary.storage import FileLock, atomic_write_json, remove_stale_temp_files
+
+
+class TestAtomicWriteJson:
+    """Test cases for atomic_write_json"""
+    
+    def test_writes_file_without_temp_leftovers(self, tmp_path):
+        """The target holds the data and no temp file remains"""
+        target = tmp_path / 'entry.json'
+        atomic_write_json(target, {'summary': '摘要'}, ensure_ascii=False)
+        
+        assert json.loads(target.read_text(encoding='utf-8')) == {'summary': '摘要'}
+        assert [p.name for p in tmp_path.iterdir()] == ['entry.json']
+    
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        """A write that fails midway leaves the old content intact"""
+        target = tmp_path / 'entry.json'
+        atomic_write_json(target, {'summary': 'old'})
+        
+        with pytest.raises(TypeError):
+            atomic_write_json(target, {'summary': object()})
+        
+        assert json.loads(target.read_text(encoding='utf-8')) == {'summary': 'old'}
+        assert [p.name for p in tmp_path.iterdir()] == ['entry.json']
+
+
+class TestRemoveStaleTempFiles:
+    """Test cases for remove_stale_temp_files"""
+    
+    def test_removes_only_old_temp_files(self, tmp_path):
+        """Old temp files are removed; fresh ones and entries are kept"""
+        old = tmp_path / '.abc.json.x1.tmp'
+        fresh = tmp_path / '.def.json.x2.tmp'
+        entry = tmp_path / 'abc.json'
+        for path in (old, fresh, entry):
+            path.write_text('{}', encoding='utf-8')
+        past = time.time() - 7200
+        os.utime(old, (past, past))
+        os.utime(entry, (past, past))
+        
+        assert remove_stale_temp_files(tmp_path) == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['.def.json.x2.tmp', 'abc.json']
+
+
+class TestFileLock:
+    """Test cases for FileLock"""
+    
+    def test_reentrant(self, tmp_path):
+        """The same thread can nest the lock"""
+        lock = FileLock(tmp_path / '.lock')
+        with lock:
+            with lock:
+                assert lock._fd is not None
+            assert lock._fd is not None
+        assert lock._fd is None
+    
+    def test_excludes_other_lock_instances(self, tmp_path):
+        """A second lock on the same file waits and times out while held"""
+        holder = FileLock(tmp_path / '.lock')
+        waiter = FileLock(tmp_path / '.lock', timeout=0.2)
+        results = []
+        
+        def try_lock():
+            results.append(waiter.acquire())
+            waiter.release()
+        
+        with holder:
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+        
+        assert results == [False]
+        assert waiter.acquire() is True
+        waiter.release()